@@ -4,40 +4,15 @@ Task 2: 날짜 형식 통일 및 데이터 정제
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
+from date_parsing import normalize_date_column
+from data_store import save_table
 import warnings
 warnings.filterwarnings('ignore')
 
 # 데이터 경로 설정
 DATA_DIR = Path("data/processed")
 
-def convert_date_to_datetime(date_value):
-    """
-    다양한 날짜 형식을 datetime으로 변환
-    YYYYMMDD (int/str) -> datetime
-    YYYY-MM-DD (str) -> datetime
-    """
-    if pd.isna(date_value):
-        return pd.NaT
-    
-    # int64 또는 숫자 형태의 YYYYMMDD
-    if isinstance(date_value, (int, np.integer)):
-        return pd.to_datetime(str(date_value), format='%Y%m%d')
-    
-    # 문자열 형태
-    date_str = str(date_value)
-    
-    # YYYYMMDD 형식 (8자리)
-    if len(date_str) == 8 and date_str.isdigit():
-        return pd.to_datetime(date_str, format='%Y%m%d')
-    
-    # 기타 형식은 pandas가 자동 파싱
-    try:
-        return pd.to_datetime(date_str)
-    except:
-        return pd.NaT
-
 def clean_and_standardize_data():
     """모든 CSV 파일을 로드하고 날짜 형식 통일 및 결측치 처리"""
     
@@ -51,7 +26,7 @@ def clean_and_standardize_data():
     print(f"  원본 shape: {df_news.shape}")
     
     # 날짜 변환
-    df_news['date'] = df_news['date'].apply(convert_date_to_datetime)
+    normalize_date_column(df_news, 'date')
     print(f"  ✅ date 컬럼 datetime 변환 완료")
     print(f"  결측치: date={df_news['date'].isna().sum()}, v2_themes={df_news['v2_themes'].isna().sum()}")
     
@@ -60,7 +35,7 @@ def clean_and_standardize_data():
     df_features = pd.read_csv(DATA_DIR / "features_daily.csv")
     print(f"  원본 shape: {df_features.shape}")
     
-    df_features['date'] = df_features['date'].apply(convert_date_to_datetime)
+    normalize_date_column(df_features, 'date')
     print(f"  ✅ date 컬럼 datetime 변환 완료")
     print(f"  결측치: {df_features.isna().sum().sum()}개 (모든 컬럼)")
     
@@ -69,8 +44,8 @@ def clean_and_standardize_data():
     df_gdelt = pd.read_csv(DATA_DIR / "gdelt_articles_modified_0.csv")
     print(f"  원본 shape: {df_gdelt.shape}")
     
-    df_gdelt['date'] = df_gdelt['date'].apply(convert_date_to_datetime)
-    df_gdelt['published_at_utc_dt'] = pd.to_datetime(df_gdelt['published_at_utc_dt'])
+    normalize_date_column(df_gdelt, 'date')
+    normalize_date_column(df_gdelt, 'published_at_utc_dt')
     print(f"  ✅ 날짜 컬럼 datetime 변환 완료")
     print(f"  결측치: date={df_gdelt['date'].isna().sum()}, title={df_gdelt['title'].isna().sum()}")
     
@@ -80,8 +55,7 @@ def clean_and_standardize_data():
     print(f"  원본 shape: {df_daily.shape}")
     
     # 날짜 변환
-    df_daily['Date'] = df_daily['Date'].apply(convert_date_to_datetime)
-    df_daily = df_daily.rename(columns={'Date': 'date'})  # 컬럼명 통일
+    normalize_date_column(df_daily, 'Date', new_name='date')  # 컬럼명 통일
     
     print(f"\n  [결측치 처리 전]")
     for col in df_daily.columns:
@@ -117,8 +91,7 @@ def clean_and_standardize_data():
     df_m2 = pd.read_csv(DATA_DIR / "merged_정형데이터" / "merged_m2_inflation.csv")
     print(f"  원본 shape: {df_m2.shape}")
     
-    df_m2['Date'] = df_m2['Date'].apply(convert_date_to_datetime)
-    df_m2 = df_m2.rename(columns={'Date': 'date'})
+    normalize_date_column(df_m2, 'Date', new_name='date')
     
     print(f"  결측치 처리 전: M2SL={df_m2['M2SL'].isna().sum()}")
     
@@ -145,9 +118,8 @@ def clean_and_standardize_data():
     df_sns = pd.read_csv(DATA_DIR / "SNS_Youtube_data" / "FINAL_SNS_YOUTUBE.csv")
     print(f"  원본 shape: {df_sns.shape}")
     
-    df_sns['STD_DATE'] = df_sns['STD_DATE'].apply(convert_date_to_datetime)
-    df_sns = df_sns.rename(columns={'STD_DATE': 'date'})
-    df_sns['original_date'] = pd.to_datetime(df_sns['original_date'], utc=True, errors='coerce')
+    normalize_date_column(df_sns, 'STD_DATE', new_name='date')
+    normalize_date_column(df_sns, 'original_date', utc=True)
     
     print(f"  ✅ 날짜 컬럼 datetime 변환 완료")
     print(f"  결측치: url={df_sns['url'].isna().sum()}")
@@ -157,26 +129,19 @@ def clean_and_standardize_data():
     print("정제된 데이터 저장 중...")
     print("=" * 80)
     
-    output_dir = Path("data/processed/cleaned")
-    output_dir.mkdir(exist_ok=True)
-    
-    df_news.to_csv(output_dir / "bitcoin_news_cleaned.csv", index=False)
-    print(f"  ✅ bitcoin_news_cleaned.csv 저장")
-    
-    df_features.to_csv(output_dir / "features_daily_cleaned.csv", index=False)
-    print(f"  ✅ features_daily_cleaned.csv 저장")
-    
-    df_gdelt.to_csv(output_dir / "gdelt_articles_cleaned.csv", index=False)
-    print(f"  ✅ gdelt_articles_cleaned.csv 저장")
-    
-    df_daily.to_csv(output_dir / "daily_data_cleaned.csv", index=False)
-    print(f"  ✅ daily_data_cleaned.csv 저장")
-    
-    df_m2.to_csv(output_dir / "m2_inflation_daily_expanded.csv", index=False)
-    print(f"  ✅ m2_inflation_daily_expanded.csv 저장")
+    tables = {
+        'bitcoin_news_cleaned': df_news,
+        'features_daily_cleaned': df_features,
+        'gdelt_articles_cleaned': df_gdelt,
+        'daily_data_cleaned': df_daily,
+        'm2_inflation_daily_expanded': df_m2,
+        'sns_youtube_cleaned': df_sns
+    }
     
-    df_sns.to_csv(output_dir / "sns_youtube_cleaned.csv", index=False)
-    print(f"  ✅ sns_youtube_cleaned.csv 저장")
+    # Parquet(타입 보존) + CSV 사본 저장
+    for table_name, table_df in tables.items():
+        saved_path = save_table(table_df, table_name)
+        print(f"  ✅ {saved_path.name} 저장")
     
     # ===== 최종 검증 =====
     print("\n" + "=" * 80)
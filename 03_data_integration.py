@@ -3,43 +3,80 @@ Task 3: 전체 데이터 통합 (Master DataFrame 생성)
 날짜를 기준으로 모든 정제된 데이터를 하나의 DataFrame으로 병합
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
+from data_store import load_table, save_table
+from feature_store import materialize
+from intraday_store import daily_intraday_features, load_bars
 import warnings
 warnings.filterwarnings('ignore')
 
-# 정제된 데이터 경로
-CLEANED_DIR = Path("data/processed/cleaned")
+# 통합 데이터 경로
 OUTPUT_DIR = Path("data/processed/integrated")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def aggregate_sns_daily(df_sns):
-    """SNS/YouTube 데이터를 일별로 집계"""
+# 일별 건수로 집계할 SNS 구분: 출력 컬럼명 -> (원본 컬럼, 해당 값 목록)
+# 예) 'sns_reddit_count': ('platform', ['Reddit']),
+#     'sns_twitter_count': ('platform', ['X (Twitter)']),
+#     'sns_comment_count': ('type', ['comment', 'Comment'])
+SNS_BREAKDOWNS = {
+    'sns_youtube_count': ('platform', ['YouTube']),  # YouTube 게시물 수
+    'sns_video_count': ('type', ['video']),  # 비디오 수
+}
+
+def aggregate_sns_daily(df_sns, breakdowns=SNS_BREAKDOWNS):
+    """
+    SNS/YouTube 데이터를 일별로 집계.
+    구분별 건수는 불리언 지표 컬럼으로 미리 만든 뒤 groupby 한 번에 합산 (lambda 없음)
+
+    Args:
+        df_sns: 정제된 SNS/YouTube 데이터
+        breakdowns: {출력 컬럼명: (원본 컬럼, 값 목록)} 일별 건수로 집계할 구분
+
+    Returns:
+        pd.DataFrame: 일별 집계 데이터
+    """
     print("  📊 SNS/YouTube 데이터 일별 집계 중...")
     
-    # 일별 집계
-    daily_agg = df_sns.groupby('date').agg({
-        'engagement': ['sum', 'mean', 'max'],
-        'content': 'count',
-        'platform': lambda x: (x == 'YouTube').sum(),  # YouTube 게시물 수
-        'type': lambda x: (x == 'video').sum()  # 비디오 수
-    }).reset_index()
-    
-    # 컬럼명 평탄화
-    daily_agg.columns = [
-        'date',
-        'sns_engagement_total',
-        'sns_engagement_mean',
-        'sns_engagement_max',
-        'sns_post_count',
-        'sns_youtube_count',
-        'sns_video_count'
-    ]
+    # 구분별 지표 컬럼 (벡터화된 isin)
+    indicators = {name: df_sns[col].isin(values).astype(np.int64)
+                  for name, (col, values) in breakdowns.items()}
+    frame = df_sns[['date', 'engagement', 'content']].assign(**indicators)
+    
+    # 일별 집계 (모든 집계가 내장 함수라 한 번의 groupby로 처리)
+    daily_agg = frame.groupby('date').agg(
+        sns_engagement_total=('engagement', 'sum'),
+        sns_engagement_mean=('engagement', 'mean'),
+        sns_engagement_max=('engagement', 'max'),
+        sns_post_count=('content', 'count'),
+        **{name: (name, 'sum') for name in breakdowns}
+    ).reset_index()
     
     print(f"  ✅ SNS 데이터 집계 완료: {len(daily_agg)}일")
     return daily_agg
 
+# 장중 BTC 피처에 사용할 봉 간격 (저장소에 있는 것 중 앞쪽 우선)
+INTRADAY_INTERVALS = ['1m', '1h']
+
+def load_intraday_features(start, end, intervals=INTRADAY_INTERVALS):
+    """
+    intraday_store에 저장된 장중 봉으로 일별 변동성 피처 계산.
+
+    Args:
+        start: 시작 날짜
+        end: 종료 날짜
+        intervals: 시도할 봉 간격 목록
+
+    Returns:
+        pd.DataFrame: date + btc_intraday_* 컬럼 (저장된 봉이 없으면 None)
+    """
+    for interval in intervals:
+        bars = load_bars(start, end, interval)
+        if not bars.empty:
+            print(f"  📊 장중 봉 {interval} {len(bars):,}개로 일별 피처 계산")
+            return daily_intraday_features(bars)
+    return None
+
 def integrate_all_data():
     """모든 정제된 데이터를 하나의 Master DataFrame으로 통합"""
     
@@ -49,29 +86,25 @@ def integrate_all_data():
     
     # ===== 1. Features Daily 로드 (뉴스 테마 데이터) =====
     print("\n[1/4] Features Daily 데이터 로드 중...")
-    df_features = pd.read_csv(CLEANED_DIR / "features_daily_cleaned.csv")
-    df_features['date'] = pd.to_datetime(df_features['date'])
+    df_features = load_table('features_daily_cleaned')
     print(f"  Shape: {df_features.shape}")
     print(f"  날짜 범위: {df_features['date'].min()} ~ {df_features['date'].max()}")
     
     # ===== 2. Daily Data 로드 (가격 + 거시경제 지표) =====
     print("\n[2/4] Daily Data 로드 중...")
-    df_daily = pd.read_csv(CLEANED_DIR / "daily_data_cleaned.csv")
-    df_daily['date'] = pd.to_datetime(df_daily['date'])
+    df_daily = load_table('daily_data_cleaned')
     print(f"  Shape: {df_daily.shape}")
     print(f"  날짜 범위: {df_daily['date'].min()} ~ {df_daily['date'].max()}")
     
     # ===== 3. M2 & Inflation 로드 =====
     print("\n[3/4] M2 & Inflation 데이터 로드 중...")
-    df_m2 = pd.read_csv(CLEANED_DIR / "m2_inflation_daily_expanded.csv")
-    df_m2['date'] = pd.to_datetime(df_m2['date'])
+    df_m2 = load_table('m2_inflation_daily_expanded')
     print(f"  Shape: {df_m2.shape}")
     print(f"  날짜 범위: {df_m2['date'].min()} ~ {df_m2['date'].max()}")
     
     # ===== 4. SNS/YouTube 로드 및 집계 =====
     print("\n[4/4] SNS/YouTube 데이터 로드 및 집계 중...")
-    df_sns = pd.read_csv(CLEANED_DIR / "sns_youtube_cleaned.csv")
-    df_sns['date'] = pd.to_datetime(df_sns['date'])
+    df_sns = load_table('sns_youtube_cleaned')
     print(f"  원본 Shape: {df_sns.shape}")
     print(f"  날짜 범위: {df_sns['date'].min()} ~ {df_sns['date'].max()}")
     
@@ -100,6 +133,16 @@ def integrate_all_data():
     print(f"  병합 후 Shape: {df_master.shape}")
     print(f"  결측치: {df_master.isna().sum().sum()}개")
     
+    # Step 4: + 장중 BTC 피처 (intraday_store.py로 수집한 봉이 있을 때만)
+    print("\n[Step 4] + 장중 BTC 피처 병합...")
+    df_intraday = load_intraday_features(df_master['date'].min(), df_master['date'].max())
+    if df_intraday is None:
+        print("  ⏭️  저장된 장중 봉 없음 (python intraday_store.py --interval 1h 로 수집)")
+    else:
+        df_master = df_master.merge(df_intraday, on='date', how='left')
+        print(f"  병합 후 Shape: {df_master.shape}")
+        print(f"  결측치: {df_master.isna().sum().sum()}개")
+    
     # ===== 날짜 순 정렬 =====
     df_master = df_master.sort_values('date').reset_index(drop=True)
     
@@ -125,6 +168,7 @@ def integrate_all_data():
     print(f"   - 가격 데이터: {len([c for c in df_master.columns if 'Price' in c or 'Open_Interest' in c])}개")
     print(f"   - 거시경제: {len([c for c in df_master.columns if any(x in c for x in ['Yield', 'USD', 'M2', 'CPI'])])}개")
     print(f"   - SNS: {len(sns_cols)}개")
+    print(f"   - 장중 BTC: {len([c for c in df_master.columns if c.startswith('btc_intraday_')])}개")
     
     # 결측치가 있는 컬럼 확인
     missing_cols = df_master.columns[df_master.isna().any()].tolist()
@@ -142,10 +186,13 @@ def integrate_all_data():
     print("💾 데이터 저장 중...")
     print("=" * 80)
     
-    # CSV 저장
-    output_csv = OUTPUT_DIR / "master_data_integrated.csv"
-    df_master.to_csv(output_csv, index=False)
-    print(f"  ✅ {output_csv}")
+    # Parquet + CSV 저장
+    output_path = save_table(df_master, 'master_data_integrated')
+    print(f"  ✅ {output_path}")
+    
+    # 파생 피처(feature_store)를 미리 계산해 저장 (이후 스크립트는 저장된 피처를 읽기만 함)
+    features = materialize('master_data_integrated')
+    print(f"  ✅ 파생 피처 {len(features)}개: {', '.join(features)}")
     
     # 요약 통계 저장
     summary_file = OUTPUT_DIR / "master_data_summary.txt"
@@ -187,7 +234,7 @@ def integrate_all_data():
     print("\n" + "=" * 80)
     print("Task 3 완료! ✅")
     print("=" * 80)
-    print(f"\n✅ 통합 데이터가 {output_csv}에 저장되었습니다.")
+    print(f"\n✅ 통합 데이터가 {output_path}에 저장되었습니다.")
     
     return df_master
 
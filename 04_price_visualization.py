@@ -8,6 +8,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from feature_store import load_features
+from figure_renderer import cached_figure, save_figure, show_figure
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
@@ -17,40 +19,58 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def plot_btc_price_timeseries(df):
-    """비트코인 가격 시계열 그래프"""
+def price_summary(df):
+    """
+    급락일(10/10) 가격과 기간 최고가/최저가.
+
+    Returns:
+        dict: crash_date, crash_price (급락일이 없으면 None), max_price, max_date, min_price, min_date
+    """
+    crash_date = pd.to_datetime('2025-10-10')
+    crash_data = df[df['date'] == crash_date]
+    max_price = df['BTC_Price'].max()
+    min_price = df['BTC_Price'].min()
+    return {
+        'crash_date': crash_date,
+        'crash_price': crash_data['BTC_Price'].values[0] if len(crash_data) > 0 else None,
+        'max_price': max_price,
+        'max_date': df[df['BTC_Price'] == max_price]['date'].values[0],
+        'min_price': min_price,
+        'min_date': df[df['BTC_Price'] == min_price]['date'].values[0],
+    }
+
+def report_price_summary(df):
+    """가격 통계 출력 (그래프 캐시와 무관하게 매번 출력)"""
     
     print("\n" + "=" * 80)
-    print("📈 비트코인 가격 시계열 그래프 생성")
+    print("📈 비트코인 가격 시계열 분석")
     print("=" * 80)
     
-    # 10월 10일 찾기
-    crash_date = pd.to_datetime('2025-10-10')
-    crash_data = df[df['date'] == crash_date]
-    
-    if len(crash_data) > 0:
-        crash_price = crash_data['BTC_Price'].values[0]
+    summary = price_summary(df)
+    if summary['crash_price'] is not None:
         print(f"\n⚠️  급락 시점 감지:")
-        print(f"   날짜: {crash_date.date()}")
-        print(f"   가격: ${crash_price:,.2f}")
-    
-    # 가격 변화율 계산
-    df['price_change_pct'] = df['BTC_Price'].pct_change() * 100
-    
-    # 최고가, 최저가 찾기
-    max_price = df['BTC_Price'].max()
-    min_price = df['BTC_Price'].min()
-    max_date = df[df['BTC_Price'] == max_price]['date'].values[0]
-    min_date = df[df['BTC_Price'] == min_price]['date'].values[0]
+        print(f"   날짜: {summary['crash_date'].date()}")
+        print(f"   가격: ${summary['crash_price']:,.2f}")
     
+    max_price, min_price = summary['max_price'], summary['min_price']
     print(f"\n📊 가격 통계:")
-    print(f"   최고가: ${max_price:,.2f} ({pd.to_datetime(max_date).date()})")
-    print(f"   최저가: ${min_price:,.2f} ({pd.to_datetime(min_date).date()})")
+    print(f"   최고가: ${max_price:,.2f} ({pd.to_datetime(summary['max_date']).date()})")
+    print(f"   최저가: ${min_price:,.2f} ({pd.to_datetime(summary['min_date']).date()})")
     print(f"   변동폭: ${max_price - min_price:,.2f} ({(max_price - min_price) / min_price * 100:.2f}%)")
+    return summary
+
+@cached_figure(OUTPUT_DIR / "01_btc_price_timeseries.png")
+def plot_btc_price_timeseries(df):
+    """비트코인 가격 시계열 그래프 (df는 price_change_pct, MA7 피처 포함, 통계 출력은 report_price_summary)"""
+    
+    summary = price_summary(df)
+    crash_date, crash_price = summary['crash_date'], summary['crash_price']
+    crash_data = df[df['date'] == crash_date]
+    max_price, max_date = summary['max_price'], summary['max_date']
+    min_price, min_date = summary['min_price'], summary['min_date']
     
     # Figure 생성
     fig, axes = plt.subplots(2, 1, figsize=(16, 10))
@@ -64,8 +84,7 @@ def plot_btc_price_timeseries(df):
     ax1.plot(df['date'], df['BTC_Price'], linewidth=2.5, color='#2E86AB', 
              label='BTC Price', marker='o', markersize=4, alpha=0.8)
     
-    # 이동평균선 추가
-    df['MA7'] = df['BTC_Price'].rolling(window=7).mean()
+    # 이동평균선 추가 (MA7: feature_store 파생 피처)
     ax1.plot(df['date'], df['MA7'], linewidth=2, color='#F77F00', 
              linestyle='--', label='7일 이동평균', alpha=0.7)
     
@@ -128,13 +147,14 @@ def plot_btc_price_timeseries(df):
     
     # 저장
     output_file = OUTPUT_DIR / "01_btc_price_timeseries.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return fig
 
+@cached_figure(OUTPUT_DIR / "02_btc_price_vs_sns.png")
 def plot_price_with_volume(df):
     """가격과 SNS 활동량 함께 표시"""
     
@@ -179,10 +199,10 @@ def plot_price_with_volume(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "02_btc_price_vs_sns.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return fig
 
@@ -193,10 +213,12 @@ def main():
     
     # 데이터 로드
     print("\n📂 데이터 로드 중...")
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_features('master_data_integrated', ['price_change_pct', 'MA7'])
     print(f"✅ 데이터 로드 완료: {df.shape}")
     
+    # 가격 통계 (그래프가 캐시로 생략돼도 출력)
+    report_price_summary(df)
+    
     # 그래프 1: 가격 시계열
     fig1 = plot_btc_price_timeseries(df)
     
@@ -3,11 +3,13 @@ Task 5: 상관관계 히트맵 생성
 모든 수치형 변수 간의 피어슨 상관계수를 계산하고 히트맵으로 시각화
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from data_store import load_table
+from figure_renderer import cached_figure, save_figure, show_figure
+from correlation_service import CorrelationService, top_pairs
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,23 +18,56 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def create_correlation_heatmap_full(df):
-    """전체 변수 상관관계 히트맵"""
+# 주요 변수 히트맵에 사용할 변수
+KEY_VARS = [
+    'BTC_Price',
+    'Open_Interest',
+    'tone_mean',
+    'tone_neg_share',
+    'tone_pos_share',
+    'n_articles',
+    'Yield_10Y',
+    'Gold_Price_YF',
+    'USD_Index',
+    'M2SL',
+    'CPI_YoY_Inflation_Rate',
+    'sns_post_count',
+    'sns_engagement_total',
+    'theme_cnt__EPU_POLICY',
+    'theme_cnt__LEADER',
+    'theme_cnt__GENERAL_GOVERNMENT',
+    'theme_cnt__ECON_BITCOIN'
+]
+
+def report_variables(df):
+    """히트맵에 쓰는 변수 목록 출력 (그래프 캐시와 무관하게 매번 출력)"""
     
     print("\n" + "=" * 80)
-    print("🔥 전체 변수 상관관계 히트맵 생성")
+    print("🔥 상관관계 분석 대상 변수")
     print("=" * 80)
     
-    # 수치형 컬럼만 선택 (date 제외)
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     print(f"\n📊 수치형 변수: {len(numeric_cols)}개")
     
+    available_vars = [v for v in KEY_VARS if v in df.columns]
+    print(f"\n📌 주요 변수: {len(available_vars)}개")
+    for var in available_vars:
+        print(f"   - {var}")
+
+@cached_figure(OUTPUT_DIR / "03_correlation_heatmap_full.png", ignore=('service',))
+def create_correlation_heatmap_full(df, service=None):
+    """전체 변수 상관관계 히트맵"""
+    
+    # 수치형 컬럼만 선택 (date 제외)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    
     # 상관계수 계산
-    corr_matrix = df[numeric_cols].corr()
+    if service is None:
+        service = CorrelationService(df)
+    corr_matrix = service.corr(numeric_cols)
     
     # 히트맵 생성
     fig, ax = plt.subplots(figsize=(20, 18))
@@ -61,49 +96,24 @@ def create_correlation_heatmap_full(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "03_correlation_heatmap_full.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"✅ 전체 히트맵 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return corr_matrix
 
-def create_correlation_heatmap_key_vars(df):
+@cached_figure(OUTPUT_DIR / "04_correlation_heatmap_key_vars.png", ignore=('service',))
+def create_correlation_heatmap_key_vars(df, service=None):
     """주요 변수 상관관계 히트맵 (가독성 향상)"""
     
-    print("\n" + "=" * 80)
-    print("🎯 주요 변수 상관관계 히트맵 생성")
-    print("=" * 80)
-    
-    # 주요 변수 선택
-    key_vars = [
-        'BTC_Price',
-        'Open_Interest',
-        'tone_mean',
-        'tone_neg_share',
-        'tone_pos_share',
-        'n_articles',
-        'Yield_10Y',
-        'Gold_Price_YF',
-        'USD_Index',
-        'M2SL',
-        'CPI_YoY_Inflation_Rate',
-        'sns_post_count',
-        'sns_engagement_total',
-        'theme_cnt__EPU_POLICY',
-        'theme_cnt__LEADER',
-        'theme_cnt__GENERAL_GOVERNMENT',
-        'theme_cnt__ECON_BITCOIN'
-    ]
-    
     # 데이터프레임에 존재하는 변수만 선택
-    available_vars = [v for v in key_vars if v in df.columns]
-    print(f"\n📌 선택된 변수: {len(available_vars)}개")
-    for var in available_vars:
-        print(f"   - {var}")
+    available_vars = [v for v in KEY_VARS if v in df.columns]
     
     # 상관계수 계산
-    corr_matrix = df[available_vars].corr()
+    if service is None:
+        service = CorrelationService(df)
+    corr_matrix = service.corr(available_vars)
     
     # 히트맵 생성
     fig, ax = plt.subplots(figsize=(14, 12))
@@ -128,10 +138,10 @@ def create_correlation_heatmap_key_vars(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "04_correlation_heatmap_key_vars.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"✅ 주요 변수 히트맵 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return corr_matrix
 
@@ -142,24 +152,11 @@ def find_high_correlations(corr_matrix, threshold=0.7):
     print(f"🔍 높은 상관관계 변수 쌍 탐색 (|r| > {threshold})")
     print("=" * 80)
     
-    # 상관관계 쌍 추출
-    high_corr_pairs = []
-    
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i+1, len(corr_matrix.columns)):
-            corr_val = corr_matrix.iloc[i, j]
-            if abs(corr_val) > threshold:
-                high_corr_pairs.append({
-                    'var1': corr_matrix.columns[i],
-                    'var2': corr_matrix.columns[j],
-                    'correlation': corr_val
-                })
-    
-    if high_corr_pairs:
-        # 데이터프레임으로 변환 및 정렬
-        df_high_corr = pd.DataFrame(high_corr_pairs)
-        df_high_corr = df_high_corr.sort_values('correlation', key=abs, ascending=False)
-        
+    # 상관관계 쌍 추출 (상삼각, |r| 내림차순)
+    df_high_corr = top_pairs(corr_matrix, n=None, threshold=threshold).rename(
+        columns={'Variable 1': 'var1', 'Variable 2': 'var2', 'Correlation': 'correlation'})
+    
+    if len(df_high_corr) > 0:
         print(f"\n✅ 발견된 높은 상관관계: {len(df_high_corr)}쌍\n")
         print(df_high_corr.to_string(index=False))
         
@@ -173,19 +170,35 @@ def find_high_correlations(corr_matrix, threshold=0.7):
         print(f"\n⚠️  임계값({threshold})을 넘는 상관관계가 발견되지 않았습니다.")
         return None
 
-def create_btc_correlation_bar_chart(df):
-    """비트코인 가격과 다른 변수들의 상관관계 막대 그래프"""
+def btc_correlations(df, service=None):
+    """BTC_Price와 다른 수치형 변수들의 상관계수 (|r| 오름차순 Series)"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_cols = [col for col in numeric_cols if col != 'BTC_Price']
+    
+    if service is None:
+        service = CorrelationService(df)
+    correlations = service.corr(numeric_cols + ['BTC_Price'])['BTC_Price'].drop('BTC_Price')
+    return correlations.sort_values(key=abs, ascending=True)
+
+def report_btc_correlations(df, service=None):
+    """BTC 가격과 상관관계가 가장 높은/낮은 변수 출력 (그래프 캐시와 무관하게 매번 출력)"""
     
     print("\n" + "=" * 80)
-    print("📊 BTC 가격 상관관계 막대 그래프 생성")
+    print("📊 BTC 가격 상관관계")
     print("=" * 80)
     
-    # BTC_Price와 다른 변수들의 상관계수 계산
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    numeric_cols = [col for col in numeric_cols if col != 'BTC_Price']
+    correlations = btc_correlations(df, service)
+    print(f"\n🏆 BTC 가격과 가장 높은 상관관계를 보이는 변수:")
+    print(f"   1. {correlations.abs().idxmax()}: {correlations.abs().max():.3f}")
+    print(f"\n📉 BTC 가격과 가장 낮은 상관관계를 보이는 변수:")
+    print(f"   1. {correlations.idxmin()}: {correlations.min():.3f}")
+    return correlations
+
+@cached_figure(OUTPUT_DIR / "05_btc_correlation_bar.png", ignore=('service',))
+def create_btc_correlation_bar_chart(df, service=None):
+    """비트코인 가격과 다른 변수들의 상관관계 막대 그래프"""
     
-    correlations = df[numeric_cols + ['BTC_Price']].corr()['BTC_Price'].drop('BTC_Price')
-    correlations = correlations.sort_values(key=abs, ascending=True)
+    correlations = btc_correlations(df, service)
     
     # 상위 20개만 선택
     top_corr = correlations.tail(20)
@@ -210,15 +223,10 @@ def create_btc_correlation_bar_chart(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "05_btc_correlation_bar.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"✅ 막대 그래프 저장: {output_file}")
     
-    plt.show()
-    
-    print(f"\n🏆 BTC 가격과 가장 높은 상관관계를 보이는 변수:")
-    print(f"   1. {correlations.abs().idxmax()}: {correlations.abs().max():.3f}")
-    print(f"\n📉 BTC 가격과 가장 낮은 상관관계를 보이는 변수:")
-    print(f"   1. {correlations.idxmin()}: {correlations.min():.3f}")
+    show_figure()
 
 def main():
     print("=" * 80)
@@ -227,21 +235,26 @@ def main():
     
     # 데이터 로드
     print("\n📂 데이터 로드 중...")
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_table('master_data_integrated')
     print(f"✅ 데이터 로드 완료: {df.shape}")
     
+    # 상관 행렬 서비스 (여러 그래프가 겹치는 컬럼 집합을 공유)
+    service = CorrelationService(df)
+    report_variables(df)
+    
     # 1. 전체 변수 히트맵
-    corr_full = create_correlation_heatmap_full(df)
+    create_correlation_heatmap_full(df, service)
     
     # 2. 주요 변수 히트맵
-    corr_key = create_correlation_heatmap_key_vars(df)
+    create_correlation_heatmap_key_vars(df, service)
     
-    # 3. 높은 상관관계 쌍 찾기
+    # 3. 높은 상관관계 쌍 찾기 (그래프가 캐시로 생략돼도 계산되도록 서비스에서 직접 조회)
+    corr_key = service.corr([v for v in KEY_VARS if v in df.columns])
     high_corr_df = find_high_correlations(corr_key, threshold=0.7)
     
-    # 4. BTC 가격 상관관계 막대 그래프
-    create_btc_correlation_bar_chart(df)
+    # 4. BTC 가격 상관관계 막대 그래프 (순위 출력은 그래프 캐시와 별도)
+    report_btc_correlations(df, service)
+    create_btc_correlation_bar_chart(df, service)
     
     print("\n" + "=" * 80)
     print("Task 5 완료! ✅")
@@ -1,13 +1,24 @@
 """
 Task 6: 정치 테마 시계열 분석
 EPU_POLICY, LEADER, GOVERNMENT 테마와 비트코인 가격 변동의 시간적 관계 탐색
+
+실행 방법:
+  python 06_political_themes_analysis.py                          # 기본 정치 테마 4종
+  python 06_political_themes_analysis.py --themes "EPU_*" LEADER  # 임의 테마/접두어 그룹
 """
 
+import argparse
+import fnmatch
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from data_store import load_table
+from feature_store import FEATURES, POLITICAL_THEMES, THEME_PREFIX, add_features, theme_total_feature
+from figure_renderer import cached_figure, save_figure, show_figure
+from theme_matrix import load_theme_index
+from lag_correlation import lag_correlation_matrix
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
@@ -17,31 +28,101 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def plot_political_themes_timeseries(df):
-    """정치 관련 테마의 시계열 분석"""
+# 개별 테마 추이 그래프에 표시할 최대 테마 수
+MAX_PLOT_THEMES = 8
+
+def attach_theme_counts(df, themes=POLITICAL_THEMES):
+    """
+    분석할 테마의 일별 건수를 theme_cnt__ 컬럼으로 붙임 (합계는 add_theme_features).
+    마스터 데이터에 없는 테마나 패턴(EPU_* 등)은 테마 인덱스(theme_matrix)에서 계산.
+
+    Args:
+        df: 마스터 데이터 (제자리에서 컬럼 추가)
+        themes: 테마 이름 또는 glob 패턴 목록
+
+    Returns:
+        list: 분석 대상 theme_cnt__ 컬럼 목록
+    """
+    lookup = [t for t in themes
+              if any(ch in t for ch in '*?[') or f"{THEME_PREFIX}{t}" not in df.columns]
+
+    if lookup:
+        try:
+            counts = load_theme_index().daily_counts(lookup)
+        except FileNotFoundError as e:
+            print(f"  ⚠️  테마 인덱스를 사용할 수 없음 ({e}), 마스터 데이터 컬럼만 사용")
+        else:
+            counts = counts.add_prefix(THEME_PREFIX)
+            counts = counts[[c for c in counts.columns if c not in df.columns]]
+            aligned = counts.reindex(df['date']).fillna(0)
+            for col in aligned.columns:
+                df[col] = aligned[col].to_numpy()
+
+    return theme_columns(df, themes)
+
+def theme_columns(df, themes=POLITICAL_THEMES):
+    """df에 있는 theme_cnt__ 컬럼 중 테마 이름/패턴과 일치하는 컬럼 목록"""
+    return [c for c in df.columns if c.startswith(THEME_PREFIX) and
+            any(fnmatch.fnmatchcase(c[len(THEME_PREFIX):], t) for t in themes)]
+
+def add_theme_features(df, themes=POLITICAL_THEMES):
+    """
+    political_themes_total(분석 테마 합계)과 price_change_pct 피처를 붙인 DataFrame (feature_store).
+
+    Args:
+        df: attach_theme_counts를 거친 마스터 데이터
+        themes: 합계에 넣을 테마 이름 또는 glob 패턴 목록
+
+    Returns:
+        pd.DataFrame: 피처가 추가된 새 DataFrame
+    """
+    features = {**FEATURES, 'political_themes_total': theme_total_feature(themes)}
+    return add_features(df, ['political_themes_total', 'price_change_pct'], features)
+
+def theme_price_fit(df):
+    """
+    정치 테마 총량 vs 가격 변화율 회귀선과 상관계수.
+
+    Returns:
+        dict: x, y (결측 제거), slope, intercept, corr, pval (데이터가 없으면 None)
+    """
+    mask = ~(df['political_themes_total'].isna() | df['price_change_pct'].isna())
+    if mask.sum() == 0:
+        return None
+    x = df.loc[mask, 'political_themes_total']
+    y = df.loc[mask, 'price_change_pct']
+    slope, intercept = np.polyfit(x, y, 1)
+    corr, pval = stats.pearsonr(x, y)
+    return {'x': x, 'y': y, 'slope': slope, 'intercept': intercept, 'corr': corr, 'pval': pval}
+
+def report_political_themes(df, themes=POLITICAL_THEMES):
+    """분석 테마 목록과 테마 총량-가격 변화율 상관관계 출력 (그래프 캐시와 무관하게 매번 출력)"""
     
     print("\n" + "=" * 80)
     print("🏛️  정치 테마 시계열 분석")
     print("=" * 80)
     
-    # 정치 관련 테마 컬럼
-    political_themes = [
-        'theme_cnt__EPU_POLICY',
-        'theme_cnt__LEADER', 
-        'theme_cnt__GENERAL_GOVERNMENT',
-        'theme_cnt__EPU_POLICY_GOVERNMENT'
-    ]
-    
-    # 존재하는 컬럼만 선택
-    available_themes = [t for t in political_themes if t in df.columns]
+    available_themes = theme_columns(df, themes)
     print(f"\n📊 분석할 정치 테마: {len(available_themes)}개")
     for theme in available_themes:
         print(f"   - {theme}")
     
+    fit = theme_price_fit(df)
+    if fit is not None:
+        print(f"\n📈 정치 테마 총량 vs 가격 변화율:")
+        print(f"   상관계수: {fit['corr']:.4f}")
+        print(f"   p-value: {fit['pval']:.4f} {'(유의함)' if fit['pval'] < 0.05 else '(유의하지 않음)'}")
+    return fit
+
+@cached_figure(OUTPUT_DIR / "06_political_themes_timeseries.png")
+def plot_political_themes_timeseries(df, themes=POLITICAL_THEMES):
+    """정치 관련 테마의 시계열 그래프 (df는 attach_theme_counts, add_theme_features를 거친 데이터)"""
+    
+    available_themes = theme_columns(df, themes)
+    
     # 10월 10일 찾기
     crash_date = pd.to_datetime('2025-10-10')
     
@@ -63,8 +144,6 @@ def plot_political_themes_timeseries(df):
     ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
     # 정치 테마 합계 (오른쪽 축)
-    df['political_themes_total'] = df[available_themes].sum(axis=1)
-    
     ax2 = ax1.twinx()
     color2 = '#DC143C'
     ax2.set_ylabel('정치 테마 언급 수 (합계)', color=color2, fontsize=11, fontweight='bold')
@@ -89,7 +168,9 @@ def plot_political_themes_timeseries(df):
     ax3 = axes[1]
     
     colors = ['#DC143C', '#FF6347', '#FF8C00', '#FFD700']
-    for i, theme in enumerate(available_themes):
+    # 패턴 그룹이 넓을 때는 언급량 상위 테마만 표시
+    plot_themes = df[available_themes].sum().nlargest(MAX_PLOT_THEMES).index
+    for i, theme in enumerate(plot_themes):
         theme_name = theme.replace('theme_cnt__', '').replace('_', ' ')
         ax3.plot(df['date'], df[theme], label=theme_name, 
                 linewidth=2, marker='o', markersize=3, color=colors[i % len(colors)])
@@ -107,28 +188,16 @@ def plot_political_themes_timeseries(df):
     # ===== 그래프 3: 가격 변화율과 정치 테마의 관계 =====
     ax4 = axes[2]
     
-    # 가격 변화율 계산
-    df['price_change_pct'] = df['BTC_Price'].pct_change() * 100
-    
     # Scatter plot
     scatter = ax4.scatter(df['political_themes_total'], df['price_change_pct'], 
                          c=df['date'].astype('int64'), cmap='viridis',
                          alpha=0.6, s=100, edgecolors='black', linewidth=0.5)
     
-    # 회귀선 추가
-    mask = ~(df['political_themes_total'].isna() | df['price_change_pct'].isna())
-    if mask.sum() > 0:
-        x = df.loc[mask, 'political_themes_total']
-        y = df.loc[mask, 'price_change_pct']
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
-        ax4.plot(x, p(x), "r--", linewidth=2, label=f'회귀선 (기울기: {z[0]:.4f})')
-        
-        # 상관계수 계산
-        corr, pval = stats.pearsonr(x, y)
-        print(f"\n📈 정치 테마 총량 vs 가격 변화율:")
-        print(f"   상관계수: {corr:.4f}")
-        print(f"   p-value: {pval:.4f} {'(유의함)' if pval < 0.05 else '(유의하지 않음)'}")
+    # 회귀선 추가 (상관계수 출력은 report_political_themes)
+    fit = theme_price_fit(df)
+    if fit is not None:
+        ax4.plot(fit['x'], fit['slope'] * fit['x'] + fit['intercept'], "r--", linewidth=2,
+                 label=f"회귀선 (기울기: {fit['slope']:.4f})")
     
     ax4.axhline(0, color='black', linestyle='-', linewidth=1, alpha=0.5)
     ax4.set_xlabel('정치 테마 총 언급 수', fontsize=11, fontweight='bold')
@@ -144,10 +213,10 @@ def plot_political_themes_timeseries(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "06_political_themes_timeseries.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return fig
 
@@ -158,16 +227,6 @@ def analyze_theme_peaks(df):
     print("🔍 정치 테마 급증 시점 분석")
     print("=" * 80)
     
-    # 정치 테마 합계
-    political_themes = [
-        'theme_cnt__EPU_POLICY',
-        'theme_cnt__LEADER', 
-        'theme_cnt__GENERAL_GOVERNMENT',
-        'theme_cnt__EPU_POLICY_GOVERNMENT'
-    ]
-    available_themes = [t for t in political_themes if t in df.columns]
-    df['political_themes_total'] = df[available_themes].sum(axis=1)
-    
     # 상위 10% 임계값
     threshold = df['political_themes_total'].quantile(0.9)
     peak_days = df[df['political_themes_total'] >= threshold].copy()
@@ -202,41 +261,52 @@ def analyze_theme_peaks(df):
             print(f"\n📉 급락 직전 3일 평균 정치 테마: {avg_before:.1f}")
             print(f"   전체 평균 대비: {(avg_before / df['political_themes_total'].mean() - 1) * 100:+.1f}%")
 
-def create_lag_correlation_analysis(df):
-    """시차 상관관계 분석 (정치 테마가 가격에 선행/후행하는지)"""
+def theme_lag_correlations(df, max_lag=5):
+    """
+    정치 테마 총량과 BTC 가격의 시차별 상관계수.
+
+    Returns:
+        pd.Series: 시차(일, 음수: 테마 선행) -> 상관계수
+    """
+    # 그래프 규약(음수: 테마 선행)은 엔진 규약(양수: 변수 선행)과 부호가 반대이므로 -lag로 조회
+    lags = list(range(-max_lag, max_lag + 1))
+    lag_corr = lag_correlation_matrix(df, 'BTC_Price', ['political_themes_total'],
+                                      lags=[-lag for lag in lags])
+    return pd.Series(lag_corr['political_themes_total'].to_numpy(), index=lags, name='correlation')
+
+def report_lag_correlation(df):
+    """시차 상관관계 표와 최대 상관 시차 출력 (그래프 캐시와 무관하게 매번 출력)"""
     
     print("\n" + "=" * 80)
     print("⏱️  시차 상관관계 분석")
     print("=" * 80)
     
-    # 정치 테마 합계
-    political_themes = [
-        'theme_cnt__EPU_POLICY',
-        'theme_cnt__LEADER', 
-        'theme_cnt__GENERAL_GOVERNMENT',
-        'theme_cnt__EPU_POLICY_GOVERNMENT'
-    ]
-    available_themes = [t for t in political_themes if t in df.columns]
-    df['political_themes_total'] = df[available_themes].sum(axis=1)
-    
-    # 시차별 상관계수 계산 (-5일 ~ +5일)
-    lags = range(-5, 6)
-    correlations = []
-    
-    for lag in lags:
-        if lag < 0:
-            # 정치 테마가 선행 (테마 → 가격)
-            shifted_theme = df['political_themes_total'].shift(-lag)
-            corr = df['BTC_Price'].corr(shifted_theme)
-        elif lag > 0:
-            # 가격이 선행 (가격 → 테마)
-            shifted_price = df['BTC_Price'].shift(-lag)
-            corr = shifted_price.corr(df['political_themes_total'])
-        else:
-            # 동시
-            corr = df['BTC_Price'].corr(df['political_themes_total'])
-        
-        correlations.append(corr)
+    correlations = theme_lag_correlations(df)
+    print(f"\n   시차(일) | 상관계수")
+    print("-" * 80)
+    print("\n".join(f"   {lag:+8d} | {corr:+.4f}" for lag, corr in correlations.items()))
+    
+    max_lag = correlations.abs().idxmax()
+    max_corr = correlations[max_lag]
+    print(f"\n📊 시차 상관관계 분석 결과:")
+    print(f"   최대 상관계수: {max_corr:.4f} (시차: {max_lag}일)")
+    
+    if max_lag < 0:
+        print(f"   ➡️  정치 테마가 가격보다 {abs(max_lag)}일 선행하는 경향")
+    elif max_lag > 0:
+        print(f"   ⬅️  가격이 정치 테마보다 {max_lag}일 선행하는 경향")
+    else:
+        print(f"   🔄 정치 테마와 가격이 동시에 움직이는 경향")
+    return correlations
+
+@cached_figure(OUTPUT_DIR / "07_political_themes_lag_correlation.png")
+def create_lag_correlation_analysis(df):
+    """시차 상관관계 그래프 (정치 테마가 가격에 선행/후행하는지, 결과 출력은 report_lag_correlation)"""
+    
+    # 시차별 상관계수 (-5일 ~ +5일)
+    lag_series = theme_lag_correlations(df)
+    lags = list(lag_series.index)
+    correlations = lag_series.tolist()
     
     # 그래프 생성
     fig, ax = plt.subplots(figsize=(12, 6))
@@ -270,39 +340,38 @@ def create_lag_correlation_analysis(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "07_political_themes_lag_correlation.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 시차 상관관계 그래프 저장: {output_file}")
     
-    plt.show()
-    
-    print(f"\n📊 시차 상관관계 분석 결과:")
-    print(f"   최대 상관계수: {max_corr:.4f} (시차: {max_lag}일)")
-    
-    if max_lag < 0:
-        print(f"   ➡️  정치 테마가 가격보다 {abs(max_lag)}일 선행하는 경향")
-    elif max_lag > 0:
-        print(f"   ⬅️  가격이 정치 테마보다 {max_lag}일 선행하는 경향")
-    else:
-        print(f"   🔄 정치 테마와 가격이 동시에 움직이는 경향")
+    show_figure()
 
 def main():
+    parser = argparse.ArgumentParser(description="정치 테마 시계열 분석")
+    parser.add_argument('--themes', nargs='+', default=POLITICAL_THEMES,
+                        help="분석할 테마 이름 또는 glob 패턴 (예: 'EPU_*')")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("Task 6: 정치 테마 시계열 분석")
     print("=" * 80)
     
     # 데이터 로드
     print("\n📂 데이터 로드 중...")
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_table('master_data_integrated')
     print(f"✅ 데이터 로드 완료: {df.shape}")
     
-    # 1. 정치 테마 시계열 시각화
-    plot_political_themes_timeseries(df)
+    attach_theme_counts(df, args.themes)
+    df = add_theme_features(df, args.themes)
+    
+    # 1. 정치 테마 시계열 분석 및 시각화
+    report_political_themes(df, args.themes)
+    plot_political_themes_timeseries(df, args.themes)
     
     # 2. 테마 급증 시점 분석
     analyze_theme_peaks(df)
     
     # 3. 시차 상관관계 분석
+    report_lag_correlation(df)
     create_lag_correlation_analysis(df)
     
     print("\n" + "=" * 80)
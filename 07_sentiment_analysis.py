@@ -8,7 +8,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from feature_store import load_features
+from figure_renderer import cached_figure, save_figure, show_figure
 from collections import Counter
+from scipy import stats
+from keyword_analysis import summarize_keywords
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -18,7 +22,6 @@ plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
 COMMUNITY_DIR = Path("data/Community_data")
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -119,12 +122,10 @@ def classify_sentiment_periods(daily_sentiment, price_df):
     daily_sentiment['date'] = pd.to_datetime(daily_sentiment['date'])
     price_df['date'] = pd.to_datetime(price_df['date'])
     
-    merged = pd.merge(daily_sentiment, price_df[['date', 'BTC_Price']], 
+    # 가격 변화율은 마스터 데이터 기준 전일 대비 (feature_store, 감성 데이터가 없는 날이 있어도 일별 변화율)
+    merged = pd.merge(daily_sentiment, price_df[['date', 'BTC_Price', 'price_change_pct']], 
                      on='date', how='left')
     
-    # 가격 변화율 계산
-    merged['price_change_pct'] = merged['BTC_Price'].pct_change() * 100
-    
     # 감성 구간 분류
     # Panic Selling: 매우 부정적 감성 (sentiment < -0.3)
     # Fear: 부정적 감성 (-0.3 <= sentiment < 0)
@@ -152,8 +153,35 @@ def classify_sentiment_periods(daily_sentiment, price_df):
     
     return merged
 
+def sentiment_price_fit(merged_df):
+    """
+    일별 감성 점수 vs 가격 변화율 단순 회귀.
+
+    Returns:
+        dict: x, y (결측 제거), slope, intercept, r_value, p_value (관측치가 2개 미만이면 None)
+    """
+    mask = ~(merged_df['sentiment_mean'].isna() | merged_df['price_change_pct'].isna())
+    if mask.sum() <= 1:
+        return None
+    x = merged_df.loc[mask, 'sentiment_mean']
+    y = merged_df.loc[mask, 'price_change_pct']
+    result = stats.linregress(x, y)
+    return {'x': x, 'y': y, 'slope': result.slope, 'intercept': result.intercept,
+            'r_value': result.rvalue, 'p_value': result.pvalue}
+
+def report_sentiment_price_fit(merged_df):
+    """감성-가격 변화 상관관계 출력 (그래프 캐시와 무관하게 매번 출력)"""
+    fit = sentiment_price_fit(merged_df)
+    if fit is not None:
+        print(f"\n📈 감성-가격 변화 상관관계:")
+        print(f"   상관계수: {fit['r_value']:.4f}")
+        print(f"   p-value: {fit['p_value']:.4f} {'(유의함)' if fit['p_value'] < 0.05 else '(유의하지 않음)'}")
+        print(f"   기울기: {fit['slope']:.4f}")
+    return fit
+
+@cached_figure(OUTPUT_DIR / "08_sentiment_analysis.png")
 def plot_sentiment_timeseries(merged_df):
-    """감성 시계열 시각화"""
+    """감성 시계열 시각화 (회귀 결과 출력은 report_sentiment_price_fit)"""
     
     print("\n" + "=" * 80)
     print("📈 감성 시계열 시각화")
@@ -264,21 +292,12 @@ def plot_sentiment_timeseries(merged_df):
                          s=100, alpha=0.7, edgecolors='black', linewidth=0.5)
     
     # 회귀선
-    mask = ~(merged_df['sentiment_mean'].isna() | merged_df['price_change_pct'].isna())
-    if mask.sum() > 1:
-        x = merged_df.loc[mask, 'sentiment_mean']
-        y = merged_df.loc[mask, 'price_change_pct']
-        from scipy import stats
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        line_x = np.array([x.min(), x.max()])
-        line_y = slope * line_x + intercept
+    fit = sentiment_price_fit(merged_df)
+    if fit is not None:
+        line_x = np.array([fit['x'].min(), fit['x'].max()])
+        line_y = fit['slope'] * line_x + fit['intercept']
         ax6.plot(line_x, line_y, 'r--', linewidth=2, 
-                label=f'회귀선 (r={r_value:.3f}, p={p_value:.3f})')
-        
-        print(f"\n📈 감성-가격 변화 상관관계:")
-        print(f"   상관계수: {r_value:.4f}")
-        print(f"   p-value: {p_value:.4f} {'(유의함)' if p_value < 0.05 else '(유의하지 않음)'}")
-        print(f"   기울기: {slope:.4f}")
+                label=f"회귀선 (r={fit['r_value']:.3f}, p={fit['p_value']:.3f})")
     
     ax6.axhline(0, color='black', linestyle='-', linewidth=1, alpha=0.5)
     ax6.axvline(0, color='black', linestyle='-', linewidth=1, alpha=0.5)
@@ -295,10 +314,10 @@ def plot_sentiment_timeseries(merged_df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "08_sentiment_analysis.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
 def analyze_keyword_sentiment(df):
     """키워드별 감성 분석"""
@@ -307,30 +326,13 @@ def analyze_keyword_sentiment(df):
     print("🔑 키워드별 감성 분석")
     print("=" * 80)
     
-    # 키워드 추출 및 감성 집계
-    keyword_sentiment = []
-    
-    for idx, row in df.iterrows():
-        if pd.notna(row['keywords']):
-            keywords = [k.strip() for k in str(row['keywords']).split(',')]
-            for keyword in keywords:
-                keyword_sentiment.append({
-                    'keyword': keyword,
-                    'sentiment_score': row['sentiment_score'],
-                    'engagement': row['engagement_score']
-                })
-    
-    keyword_df = pd.DataFrame(keyword_sentiment)
-    
-    # 키워드별 평균 감성 계산
-    keyword_summary = keyword_df.groupby('keyword').agg({
-        'sentiment_score': ['mean', 'count'],
-        'engagement': 'mean'
-    }).reset_index()
-    
-    keyword_summary.columns = ['keyword', 'avg_sentiment', 'count', 'avg_engagement']
-    keyword_summary = keyword_summary[keyword_summary['count'] >= 10]  # 최소 10회 이상 등장
-    keyword_summary = keyword_summary.sort_values('count', ascending=False)
+    # 키워드 추출 및 키워드별 평균 감성 계산 (최소 10회 이상 등장)
+    keyword_summary = summarize_keywords(
+        df,
+        values={'avg_sentiment': 'sentiment_score', 'avg_engagement': 'engagement_score'},
+        min_count=10,
+        count_column='sentiment_score'
+    )[['keyword', 'avg_sentiment', 'count', 'avg_engagement']]
     
     print(f"\n📊 Top 20 키워드 (최소 10회 이상):")
     print("-" * 80)
@@ -368,10 +370,10 @@ def analyze_keyword_sentiment(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "09_keyword_sentiment.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 키워드 감성 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return keyword_summary
 
@@ -388,15 +390,15 @@ def main():
     
     # 3. 가격 데이터 로드
     print("\n📂 가격 데이터 로드 중...")
-    price_df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    price_df['date'] = pd.to_datetime(price_df['date'])
+    price_df = load_features('master_data_integrated', ['price_change_pct'], columns=['date', 'BTC_Price'])
     print(f"✅ 가격 데이터 로드 완료: {price_df.shape}")
     
     # 4. 감성 구간 분류
     merged_df = classify_sentiment_periods(daily_sentiment, price_df)
     
-    # 5. 감성 시계열 시각화
+    # 5. 감성 시계열 시각화 (상관관계 출력은 그래프 캐시와 별도)
     plot_sentiment_timeseries(merged_df)
+    report_sentiment_price_fit(merged_df)
     
     # 6. 키워드별 감성 분석
     keyword_summary = analyze_keyword_sentiment(community_df)
@@ -8,6 +8,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from data_store import load_table
+from figure_renderer import cached_figure, save_figure, show_figure
+from regression_screener import screen_single
+from rolling_regression import rolling_ols
+from walk_forward import print_forecast_metrics, walk_forward
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 from sklearn.preprocessing import StandardScaler
@@ -20,10 +25,16 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# 이동 구간 회귀 길이 (관측일 수)
+ROLLING_WINDOW = 20
+
+# Walk-forward 백테스트: 최대 예측 시차 (일), 최소 학습 관측일 수
+FORECAST_HORIZON = 5
+MIN_TRAIN = 20
+
 def load_and_prepare_data():
     """데이터 로드 및 준비"""
     
@@ -32,8 +43,7 @@ def load_and_prepare_data():
     print("=" * 80)
     
     # 통합 데이터 로드
-    master_df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    master_df['date'] = pd.to_datetime(master_df['date'])
+    master_df = load_table('master_data_integrated')
     
     # 감성 분석 결과 로드
     sentiment_df = pd.read_csv(OUTPUT_DIR / "sentiment_daily_analysis.csv")
@@ -75,49 +85,25 @@ def perform_simple_regression(df):
     independent_vars = ['tone_mean', 'tone_pos_share', 'tone_neg_share', 
                        'sentiment_mean', 'sentiment_median', 'sentiment_std']
     
-    results = []
+    available_vars = [var for var in independent_vars
+                      if var in df.columns and not df[var].isna().all()]
+    
+    # 모든 변수의 단순 회귀를 한 번에 계산 (Gram 행렬 기반, linregress와 같은 결과)
+    screened = screen_single(df, 'BTC_Price', available_vars).set_index('variable')
     
-    for var in independent_vars:
-        if var not in df.columns or df[var].isna().all():
+    for var in available_vars:
+        if var not in screened.index:
             continue
-        
-        # 데이터 준비
-        X = df[[var]].values
-        y = df['BTC_Price'].values
-        
-        # 회귀 모델
-        model = LinearRegression()
-        model.fit(X, y)
-        y_pred = model.predict(X)
-        
-        # 평가 지표
-        r2 = r2_score(y, y_pred)
-        mae = mean_absolute_error(y, y_pred)
-        rmse = np.sqrt(mean_squared_error(y, y_pred))
-        
-        # 통계적 유의성 검정
-        slope, intercept, r_value, p_value, std_err = stats.linregress(X.flatten(), y)
-        
-        results.append({
-            'variable': var,
-            'coefficient': model.coef_[0],
-            'intercept': model.intercept_,
-            'r2': r2,
-            'r_value': r_value,
-            'p_value': p_value,
-            'mae': mae,
-            'rmse': rmse
-        })
+        row = screened.loc[var]
         
         print(f"\n🔹 {var}:")
-        print(f"   계수: {model.coef_[0]:+.2f}")
-        print(f"   R²: {r2:.4f}")
-        print(f"   p-value: {p_value:.4f} {'✅ 유의함' if p_value < 0.05 else '⚠️  유의하지 않음'}")
-        print(f"   MAE: ${mae:,.2f}")
-        print(f"   RMSE: ${rmse:,.2f}")
+        print(f"   계수: {row['coefficient']:+.2f}")
+        print(f"   R²: {row['r2']:.4f}")
+        print(f"   p-value: {row['p_value']:.4f} {'✅ 유의함' if row['p_value'] < 0.05 else '⚠️  유의하지 않음'}")
+        print(f"   MAE: ${row['mae']:,.2f}")
+        print(f"   RMSE: ${row['rmse']:,.2f}")
     
-    results_df = pd.DataFrame(results)
-    results_df = results_df.sort_values('r2', ascending=False)
+    results_df = screened.reset_index().drop(columns=['std_err', 'nobs'])
     
     return results_df
 
@@ -179,6 +165,54 @@ def perform_multiple_regression(df):
     
     return model, scaler, available_features, y_pred
 
+def perform_rolling_regression(df, features, scaler, window=ROLLING_WINDOW):
+    """이동 구간 다중 회귀 (감성 계수가 기간에 따라 유지되는지 확인)"""
+    
+    print("\n" + "=" * 80)
+    print(f"📊 이동 구간 회귀 분석 ({window}일 구간)")
+    print("=" * 80)
+    
+    X_scaled = pd.DataFrame(scaler.transform(df[features].values), columns=features, index=df.index)
+    rolling = rolling_ols(X_scaled, df['BTC_Price'], window=window)
+    
+    rolling_df = pd.DataFrame({'date': df['date'], 'r2': rolling['r2'], 'nobs': rolling['nobs']})
+    for feature in features:
+        rolling_df[f'coef_{feature}'] = rolling['coef'][feature]
+        rolling_df[f'p_{feature}'] = rolling['p_value'][feature]
+    rolling_df = rolling_df.dropna(subset=['r2'])
+    
+    if rolling_df.empty:
+        print("\n⚠️  데이터가 부족하여 이동 구간 회귀를 수행할 수 없습니다.")
+        return rolling_df
+    
+    print(f"\n📈 구간별 R²: {rolling_df['r2'].min():.4f} ~ {rolling_df['r2'].max():.4f} "
+          f"(구간 {len(rolling_df)}개)")
+    print(f"\n📊 표준화 계수 범위와 유의한 구간 비율 (p < 0.05):")
+    for feature in features:
+        coefs = rolling_df[f'coef_{feature}']
+        significant = (rolling_df[f'p_{feature}'] < 0.05).mean()
+        print(f"   {feature:18s}: {coefs.min():+10,.2f} ~ {coefs.max():+10,.2f} "
+              f"(유의 {significant*100:.0f}%)")
+    
+    return rolling_df
+
+def perform_walk_forward(df, features, horizons=FORECAST_HORIZON):
+    """Walk-forward 백테스트 (각 시점까지의 데이터로만 다시 적합해 1..N일 뒤 가격 예측)"""
+    
+    print("\n" + "=" * 80)
+    print(f"📊 Walk-forward 백테스트 (확장 구간, 1~{horizons}일 뒤 예측)")
+    print("=" * 80)
+    
+    # 다중 회귀와 같은 모델 (표준화 + LinearRegression), 최소 학습 MIN_TRAIN쌍
+    # 달력에 재색인해 결측으로 빠진 날짜를 건너뛰어도 horizon이 실제 일수가 되도록 함
+    result = walk_forward(df, features, 'BTC_Price', horizons=horizons, min_train=MIN_TRAIN,
+                          freq='D')
+    metrics = result['metrics']
+    print_forecast_metrics(metrics)
+    
+    return metrics
+
+@cached_figure(OUTPUT_DIR / "10_sentiment_price_regression.png")
 def plot_regression_results(df, simple_results, y_pred):
     """회귀 분석 결과 시각화"""
     
@@ -290,10 +324,10 @@ def plot_regression_results(df, simple_results, y_pred):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "10_sentiment_price_regression.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
 def plot_residuals(df, y_pred):
     """잔차 분석"""
@@ -340,10 +374,10 @@ def plot_residuals(df, y_pred):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "11_regression_residuals.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 잔차 분석 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     # 정규성 검정 (Shapiro-Wilk)
     if len(residuals) < 5000:
@@ -385,6 +419,16 @@ def main():
     coef_df.to_csv(OUTPUT_DIR / "regression_multiple_coefficients.csv", 
                   index=False, encoding='utf-8-sig')
     
+    # 7. 이동 구간 회귀 (계수 경로)
+    rolling_df = perform_rolling_regression(df, features, scaler)
+    rolling_df.to_csv(OUTPUT_DIR / "regression_rolling_coefficients.csv", 
+                     index=False, encoding='utf-8-sig')
+    
+    # 8. Walk-forward 백테스트 (표본 외 예측 오차)
+    forecast_df = perform_walk_forward(df, features)
+    forecast_df.to_csv(OUTPUT_DIR / "regression_walk_forward_metrics.csv", 
+                      index=False, encoding='utf-8-sig')
+    
     print("\n" + "=" * 80)
     print("Task 8 완료! ✅")
     print("=" * 80)
@@ -393,6 +437,8 @@ def main():
     print(f"   2. {OUTPUT_DIR / '11_regression_residuals.png'}")
     print(f"   3. {OUTPUT_DIR / 'regression_simple_results.csv'}")
     print(f"   4. {OUTPUT_DIR / 'regression_multiple_coefficients.csv'}")
+    print(f"   5. {OUTPUT_DIR / 'regression_rolling_coefficients.csv'}")
+    print(f"   6. {OUTPUT_DIR / 'regression_walk_forward_metrics.csv'}")
 
 if __name__ == "__main__":
     main()
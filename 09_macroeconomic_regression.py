@@ -8,6 +8,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from collinearity import VIF_THRESHOLD, diagnose, rolling_diagnostics
+from data_store import load_table
+from figure_renderer import cached_figure, save_figure, show_figure
+from regression_screener import screen_single
+from rolling_regression import rolling_ols
+from walk_forward import print_forecast_metrics, walk_forward
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 from sklearn.preprocessing import StandardScaler
@@ -20,10 +26,16 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# 이동 구간 회귀 길이 (일)
+ROLLING_WINDOW = 20
+
+# Walk-forward 백테스트: 최대 예측 시차 (일), 최소 학습 관측일 수
+FORECAST_HORIZON = 5
+MIN_TRAIN = 20
+
 def load_data():
     """데이터 로드"""
     
@@ -31,8 +43,7 @@ def load_data():
     print("📂 데이터 로드")
     print("=" * 80)
     
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_table('master_data_integrated')
     
     print(f"✅ 데이터 로드 완료: {df.shape}")
     print(f"   기간: {df['date'].min().date()} ~ {df['date'].max().date()}")
@@ -81,54 +92,25 @@ def perform_individual_regression(df, macro_vars):
     print("📊 단순 회귀 분석 (개별 변수)")
     print("=" * 80)
     
-    results = []
+    # 모든 변수의 단순 회귀를 한 번에 계산 (변수별 결측치 제거, 유효 관측치 3개 미만은 제외)
+    screened = screen_single(df, 'BTC_Price', macro_vars, min_obs=3).set_index('variable')
     
     for var in macro_vars:
-        # 결측치 제거
-        mask = ~(df[var].isna() | df['BTC_Price'].isna())
-        X = df.loc[mask, var].values.reshape(-1, 1)
-        y = df.loc[mask, 'BTC_Price'].values
-        
-        if len(X) < 3:
+        if var not in screened.index:
             print(f"\n⚠️  {var}: 데이터 부족")
             continue
-        
-        # 회귀 모델
-        model = LinearRegression()
-        model.fit(X, y)
-        y_pred = model.predict(X)
-        
-        # 평가 지표
-        r2 = r2_score(y, y_pred)
-        mae = mean_absolute_error(y, y_pred)
-        rmse = np.sqrt(mean_squared_error(y, y_pred))
-        
-        # 통계적 유의성
-        slope, intercept, r_value, p_value, std_err = stats.linregress(X.flatten(), y)
-        
-        results.append({
-            'variable': var,
-            'coefficient': model.coef_[0],
-            'intercept': model.intercept_,
-            'r2': r2,
-            'r_value': r_value,
-            'p_value': p_value,
-            'std_err': std_err,
-            'mae': mae,
-            'rmse': rmse
-        })
+        row = screened.loc[var]
         
         print(f"\n🔹 {var}:")
-        print(f"   계수: {model.coef_[0]:+,.4f}")
-        print(f"   절편: ${model.intercept_:,.2f}")
-        print(f"   R²: {r2:.4f} ({r2*100:.1f}% 설명력)")
-        print(f"   상관계수: {r_value:+.4f}")
-        print(f"   p-value: {p_value:.6f} {'✅ 유의함' if p_value < 0.05 else '⚠️  유의하지 않음'}")
-        print(f"   MAE: ${mae:,.2f}")
-        print(f"   RMSE: ${rmse:,.2f}")
+        print(f"   계수: {row['coefficient']:+,.4f}")
+        print(f"   절편: ${row['intercept']:,.2f}")
+        print(f"   R²: {row['r2']:.4f} ({row['r2']*100:.1f}% 설명력)")
+        print(f"   상관계수: {row['r_value']:+.4f}")
+        print(f"   p-value: {row['p_value']:.6f} {'✅ 유의함' if row['p_value'] < 0.05 else '⚠️  유의하지 않음'}")
+        print(f"   MAE: ${row['mae']:,.2f}")
+        print(f"   RMSE: ${row['rmse']:,.2f}")
     
-    results_df = pd.DataFrame(results)
-    results_df = results_df.sort_values('r2', ascending=False)
+    results_df = screened.reset_index().drop(columns='nobs')
     
     print(f"\n" + "=" * 80)
     print("📊 단순 회귀 결과 요약 (R² 순)")
@@ -216,6 +198,64 @@ def perform_multiple_regression(df, macro_vars):
     
     return model, scaler, macro_vars, y_pred, df_clean
 
+def perform_rolling_regression(df, df_clean, macro_vars, scaler, window=ROLLING_WINDOW):
+    """이동 구간 다중 회귀 (표준화 계수 경로로 계수 안정성 확인)"""
+    
+    print("\n" + "=" * 80)
+    print(f"📊 이동 구간 회귀 분석 ({window}일 구간)")
+    print("=" * 80)
+    
+    # 전체 표본 모델과 같은 스케일(표준화 변수)로 모든 구간을 한 번에 계산
+    X_scaled = pd.DataFrame(scaler.transform(df_clean[macro_vars].values),
+                            columns=macro_vars, index=df_clean.index)
+    rolling = rolling_ols(X_scaled, df_clean['BTC_Price'], window=window)
+    
+    rolling_df = pd.DataFrame({
+        'date': df.loc[df_clean.index, 'date'],
+        'r2': rolling['r2'],
+        'nobs': rolling['nobs'],
+    })
+    for var in macro_vars:
+        rolling_df[f'coef_{var}'] = rolling['coef'][var]
+        rolling_df[f'se_{var}'] = rolling['std_err'][var]
+    # 같은 구간의 공선성 (계수가 흔들리는 구간이 공선성 때문인지 확인)
+    collinearity = rolling_diagnostics(df_clean, macro_vars, window)
+    rolling_df['condition_number'] = collinearity['condition_number']
+    rolling_df['max_vif'] = collinearity['max_vif']
+    rolling_df = rolling_df.dropna(subset=['r2'])
+    
+    if rolling_df.empty:
+        print("\n⚠️  데이터가 부족하여 이동 구간 회귀를 수행할 수 없습니다.")
+        return rolling_df
+    
+    print(f"\n📈 구간별 R²: {rolling_df['r2'].min():.4f} ~ {rolling_df['r2'].max():.4f} "
+          f"(구간 {len(rolling_df)}개)")
+    print(f"\n📊 표준화 계수 범위 (부호 변화 = 관계 불안정):")
+    for var in macro_vars:
+        coefs = rolling_df[f'coef_{var}']
+        flips = int((np.sign(coefs).diff().fillna(0) != 0).sum())
+        print(f"   {var:15s}: {coefs.min():+10,.2f} ~ {coefs.max():+10,.2f} (부호 변화 {flips}회)")
+    print(f"\n📊 구간별 최대 VIF: {rolling_df['max_vif'].min():.2f} ~ {rolling_df['max_vif'].max():.2f}")
+    
+    return rolling_df
+
+def perform_walk_forward(df, features, horizons=FORECAST_HORIZON):
+    """Walk-forward 백테스트 (각 시점까지의 데이터로만 다시 적합해 1..N일 뒤 가격 예측)"""
+    
+    print("\n" + "=" * 80)
+    print(f"📊 Walk-forward 백테스트 (확장 구간, 1~{horizons}일 뒤 예측)")
+    print("=" * 80)
+    
+    # 다중 회귀와 같은 모델 (표준화 + LinearRegression), 최소 학습 MIN_TRAIN쌍
+    # 달력에 재색인해 결측으로 빠진 날짜를 건너뛰어도 horizon이 실제 일수가 되도록 함
+    result = walk_forward(df, features, 'BTC_Price', horizons=horizons, min_train=MIN_TRAIN,
+                          freq='D')
+    metrics = result['metrics']
+    print_forecast_metrics(metrics)
+    
+    return metrics
+
+@cached_figure(OUTPUT_DIR / "12_macroeconomic_regression.png")
 def plot_macro_regression_results(df_clean, macro_vars, simple_results, y_pred):
     """거시경제 회귀 결과 시각화"""
     
@@ -340,30 +380,39 @@ def plot_macro_regression_results(df_clean, macro_vars, simple_results, y_pred):
     ax9.grid(True, alpha=0.3, linestyle='--')
     
     output_file = OUTPUT_DIR / "12_macroeconomic_regression.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
-def analyze_variable_importance(model, scaler, macro_vars):
-    """변수 중요도 분석 및 시각화"""
+def analyze_variable_importance(model, scaler, macro_vars, diagnostics):
+    """변수 중요도 분석 및 시각화 (공선성 진단 포함)"""
     
     print("\n" + "=" * 80)
     print("📊 변수 중요도 분석")
     print("=" * 80)
     
-    # 표준화된 계수 (중요도)
+    # 표준화된 계수 (중요도) + VIF / target과의 편상관
     importance_df = pd.DataFrame({
         'variable': macro_vars,
         'coefficient': model.coef_,
         'abs_coefficient': np.abs(model.coef_)
     })
+    importance_df = importance_df.merge(diagnostics['table'], on='variable', how='left')
     importance_df = importance_df.sort_values('abs_coefficient', ascending=False)
     
+    print(f"\n📊 다중공선성 진단 (조건수: {diagnostics['condition_number']:,.1f}):")
+    for idx, row in importance_df.iterrows():
+        flag = "⚠️  공선성 의심" if row['vif'] >= VIF_THRESHOLD else "✅"
+        print(f"   {row['variable']:15s}: VIF {row['vif']:8.2f}, "
+              f"BTC 편상관 {row['partial_corr_target']:+.3f} {flag}")
+    
     print("\n📊 변수 중요도 (표준화 계수 기준):")
     for idx, row in importance_df.iterrows():
         direction = "↑ 양의 영향" if row['coefficient'] > 0 else "↓ 음의 영향"
-        print(f"   {row['variable']:15s}: {row['coefficient']:+8.2f} ({direction})")
+        # VIF가 크면 계수의 크기/부호가 다른 변수와 나눠 가진 설명력이라 해석 주의
+        caution = " (VIF 높음, 해석 주의)" if row['vif'] >= VIF_THRESHOLD else ""
+        print(f"   {row['variable']:15s}: {row['coefficient']:+8.2f} ({direction}){caution}")
     
     # 시각화
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -372,7 +421,8 @@ def analyze_variable_importance(model, scaler, macro_vars):
     bars = ax.barh(range(len(importance_df)), importance_df['coefficient'], 
                    color=colors, alpha=0.7, edgecolor='black', linewidth=1)
     ax.set_yticks(range(len(importance_df)))
-    ax.set_yticklabels(importance_df['variable'], fontsize=11)
+    ax.set_yticklabels([f"{row['variable']}\n(VIF {row['vif']:.1f})" for _, row in importance_df.iterrows()],
+                       fontsize=11)
     ax.set_xlabel('표준화 회귀 계수', fontsize=12, fontweight='bold')
     ax.set_title('거시경제 변수의 BTC 가격 영향도\n(양수: 가격 상승 요인, 음수: 가격 하락 요인)', 
                 fontsize=14, fontweight='bold', pad=15)
@@ -389,10 +439,10 @@ def analyze_variable_importance(model, scaler, macro_vars):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "13_macro_variable_importance.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 변수 중요도 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return importance_df
 
@@ -418,7 +468,8 @@ def main():
         plot_macro_regression_results(df_clean, macro_vars, simple_results, y_pred)
         
         # 6. 변수 중요도 분석
-        importance_df = analyze_variable_importance(model, scaler, features)
+        diagnostics = diagnose(df_clean, features, target='BTC_Price')
+        importance_df = analyze_variable_importance(model, scaler, features, diagnostics)
         
         # 7. 결과 저장
         simple_results.to_csv(OUTPUT_DIR / "macro_simple_regression.csv", 
@@ -435,6 +486,16 @@ def main():
         coef_df['intercept'] = model.intercept_
         coef_df.to_csv(OUTPUT_DIR / "macro_regression_coefficients.csv", 
                       index=False, encoding='utf-8-sig')
+        
+        # 8. 이동 구간 회귀 (계수 경로)
+        rolling_df = perform_rolling_regression(df, df_clean, features, scaler)
+        rolling_df.to_csv(OUTPUT_DIR / "macro_rolling_coefficients.csv", 
+                         index=False, encoding='utf-8-sig')
+        
+        # 9. Walk-forward 백테스트 (표본 외 예측 오차)
+        forecast_df = perform_walk_forward(df, features)
+        forecast_df.to_csv(OUTPUT_DIR / "macro_walk_forward_metrics.csv", 
+                          index=False, encoding='utf-8-sig')
     
     print("\n" + "=" * 80)
     print("Task 9 완료! ✅")
@@ -445,6 +506,8 @@ def main():
     print(f"   3. {OUTPUT_DIR / 'macro_simple_regression.csv'}")
     print(f"   4. {OUTPUT_DIR / 'macro_variable_importance.csv'}")
     print(f"   5. {OUTPUT_DIR / 'macro_regression_coefficients.csv'}")
+    print(f"   6. {OUTPUT_DIR / 'macro_rolling_coefficients.csv'}")
+    print(f"   7. {OUTPUT_DIR / 'macro_walk_forward_metrics.csv'}")
 
 if __name__ == "__main__":
     main()
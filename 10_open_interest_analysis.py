@@ -8,6 +8,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from anomaly_detection import detect
+from feature_store import add_features, load_features
+from figure_renderer import cached_figure, save_figure, show_figure
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
 import warnings
@@ -18,12 +21,22 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# feature_store에서 불러올 파생 피처
+OI_FEATURES = ['OI_change_pct', 'OI_change_abs', 'price_change_pct', 'price_volatility']
+
+# OI 급증/급감 탐지: 직전 SPIKE_WINDOW일의 이동 z-score가 ±SPIKE_THRESHOLD를 넘는 날
+SPIKE_METHOD = 'zscore'
+SPIKE_WINDOW = 20
+SPIKE_MIN_PERIODS = 10
+SPIKE_THRESHOLD = 2.0
+# 척도 하한 (%p): 보간된 OI처럼 변화율이 거의 일정한 구간에서 미세한 기울기 변화를 급변으로 보지 않도록
+SPIKE_MIN_SCALE = 1.0
+
 def load_and_analyze_oi_data(df):
-    """Open Interest 데이터 로드 및 기초 분석"""
+    """Open Interest 데이터 로드 및 기초 분석 (OI/가격 변화율 피처는 feature_store)"""
     
     print("\n" + "=" * 80)
     print("📊 Open Interest 데이터 분석")
@@ -42,13 +55,8 @@ def load_and_analyze_oi_data(df):
     print(f"   최대: {df['Open_Interest'].max():,.2f}")
     print(f"   범위: {df['Open_Interest'].max() - df['Open_Interest'].min():,.2f}")
     
-    # OI 변화율 계산
-    df['OI_change_pct'] = df['Open_Interest'].pct_change() * 100
-    df['OI_change_abs'] = df['Open_Interest'].diff()
-    
-    # 가격 변화율 계산
-    df['price_change_pct'] = df['BTC_Price'].pct_change() * 100
-    df['price_volatility'] = df['price_change_pct'].abs()
+    # OI/가격 변화율 (이미 불러온 피처는 그대로 사용)
+    df = add_features(df, OI_FEATURES)
     
     print(f"\n📊 OI 변화율 통계:")
     print(f"   평균: {df['OI_change_pct'].mean():+.2f}%")
@@ -58,62 +66,105 @@ def load_and_analyze_oi_data(df):
     
     return df
 
-def detect_oi_spikes(df):
-    """OI 급증/급감 시점 탐지"""
+def _print_spikes(rows):
+    """급증/급감 시점 표 출력"""
+    print("   날짜 | OI 변화 | 가격 변화 | BTC 가격")
+    print("-" * 80)
+    price_change = rows['price_change_pct'] if 'price_change_pct' in rows.columns else np.nan
+    lines = pd.DataFrame({
+        'date': rows['date'].dt.date.astype(str),
+        'oi': rows['OI_change_pct'].map('{:+6.2f}'.format),
+        'price': pd.Series(price_change, index=rows.index).map('{:+6.2f}'.format),
+        'btc': rows['BTC_Price'].map('{:,.0f}'.format),
+    })
+    print("\n".join("   " + lines['date'] + " | OI: " + lines['oi'] + "% | 가격: " + lines['price']
+                    + "% | $" + lines['btc']))
+
+def detect_oi_spikes(df, method=SPIKE_METHOD, window=SPIKE_WINDOW, threshold=SPIKE_THRESHOLD):
+    """
+    OI 급증/급감 시점 탐지 (anomaly_detection: 각 시점 이전 window일의 기준과 비교).
+
+    Args:
+        df: OI_change_pct 피처를 포함한 데이터
+        method: 'zscore', 'mad', 'ewma'
+        window: 기준 구간 길이 (일)
+        threshold: 임계 score (zscore면 이동 평균 ± threshold x 이동 표준편차)
+
+    Returns:
+        pd.DataFrame: OI_spike_up, OI_spike_down, OI_anomaly, OI_upper_threshold, OI_lower_threshold 추가
+    """
     
     print("\n" + "=" * 80)
     print("🔍 Open Interest 급증/급감 탐지")
     print("=" * 80)
     
-    # Z-score 기반 이상치 탐지
-    oi_change = df['OI_change_pct'].dropna()
-    mean = oi_change.mean()
-    std = oi_change.std()
+    result = detect(df['OI_change_pct'], method=method, window=window, threshold=threshold,
+                    min_periods=SPIKE_MIN_PERIODS, min_scale=SPIKE_MIN_SCALE)
     
-    # 임계값: 평균 ± 2 표준편차
-    upper_threshold = mean + 2 * std
-    lower_threshold = mean - 2 * std
+    # 시점별 임계값: 기준 중심 ± threshold x 척도
+    df['OI_upper_threshold'] = result['center'] + threshold * result['scale']
+    df['OI_lower_threshold'] = result['center'] - threshold * result['scale']
     
-    print(f"\n📊 이상치 임계값:")
-    print(f"   평균: {mean:+.2f}%")
-    print(f"   표준편차: {std:.2f}%")
-    print(f"   상한 (급증): {upper_threshold:+.2f}%")
-    print(f"   하한 (급감): {lower_threshold:+.2f}%")
+    print(f"\n📊 이상치 임계값 ({method}, 직전 {window}일 기준, ±{threshold})")
+    latest = result.dropna(subset=['score'])
+    if len(latest) > 0:
+        last = latest.index[-1]
+        print(f"   기준 중심 (최근): {result.at[last, 'center']:+.2f}%")
+        print(f"   기준 척도 (최근): {result.at[last, 'scale']:.2f}%")
+        print(f"   상한 (급증, 최근): {df.at[last, 'OI_upper_threshold']:+.2f}%")
+        print(f"   하한 (급감, 최근): {df.at[last, 'OI_lower_threshold']:+.2f}%")
+    print(f"   평가 가능 시점: {len(latest)}일 (직전 관측치 {SPIKE_MIN_PERIODS}일 이상)")
     
     # 급증/급감 시점
-    df['OI_spike_up'] = df['OI_change_pct'] > upper_threshold
-    df['OI_spike_down'] = df['OI_change_pct'] < lower_threshold
-    df['OI_anomaly'] = df['OI_spike_up'] | df['OI_spike_down']
+    df['OI_spike_up'] = result['spike_up']
+    df['OI_spike_down'] = result['spike_down']
+    df['OI_anomaly'] = result['anomaly']
     
     spikes_up = df[df['OI_spike_up']]
     spikes_down = df[df['OI_spike_down']]
     
     print(f"\n🔥 OI 급증 발생: {len(spikes_up)}회")
     if len(spikes_up) > 0:
-        print("   날짜 | OI 변화 | 가격 변화 | BTC 가격")
-        print("-" * 80)
-        for idx, row in spikes_up.iterrows():
-            date = row['date'].date()
-            oi_change = row['OI_change_pct']
-            price_change = row.get('price_change_pct', np.nan)
-            btc_price = row['BTC_Price']
-            print(f"   {date} | OI: {oi_change:+6.2f}% | 가격: {price_change:+6.2f}% | ${btc_price:,.0f}")
+        _print_spikes(spikes_up)
     
     print(f"\n📉 OI 급감 발생: {len(spikes_down)}회")
     if len(spikes_down) > 0:
-        print("   날짜 | OI 변화 | 가격 변화 | BTC 가격")
-        print("-" * 80)
-        for idx, row in spikes_down.iterrows():
-            date = row['date'].date()
-            oi_change = row['OI_change_pct']
-            price_change = row.get('price_change_pct', np.nan)
-            btc_price = row['BTC_Price']
-            print(f"   {date} | OI: {oi_change:+6.2f}% | 가격: {price_change:+6.2f}% | ${btc_price:,.0f}")
+        _print_spikes(spikes_down)
     
     return df
 
+def linear_fit(df, x_col, y_col):
+    """
+    두 컬럼의 단순 회귀선과 상관계수 (두 컬럼 모두 있는 행만 사용).
+
+    Returns:
+        dict: slope, intercept, corr, pval, x_min, x_max, nobs (관측치가 2개 미만이면 None)
+    """
+    pair = df[[x_col, y_col]].dropna()
+    if len(pair) < 2:
+        return None
+    x = pair[x_col].to_numpy()
+    y = pair[y_col].to_numpy()
+    slope, intercept = np.polyfit(x, y, 1)
+    corr, pval = stats.pearsonr(x, y)
+    return {'slope': slope, 'intercept': intercept, 'corr': corr, 'pval': pval,
+            'x_min': x.min(), 'x_max': x.max(), 'nobs': len(pair)}
+
+def crash_windows(df, window=7):
+    """급락일(10/10) 이전 window일, 당일 포함 이후 window일 구간"""
+    crash_date = pd.to_datetime('2025-10-10')
+    pre_crash = df[(df['date'] >= crash_date - pd.Timedelta(days=window)) & 
+                   (df['date'] < crash_date)]
+    post_crash = df[(df['date'] >= crash_date) & 
+                    (df['date'] <= crash_date + pd.Timedelta(days=window))]
+    return pre_crash, post_crash
+
+# plot_oi_analysis에 회귀선으로 그리는 컬럼 쌍
+PLOT_FITS = [('Open_Interest', 'BTC_Price'), ('OI_change_pct', 'price_change_pct'),
+             ('Open_Interest', 'price_volatility')]
+
 def analyze_oi_price_correlation(df):
-    """OI와 가격 변동의 상관관계 분석"""
+    """OI와 가격 변동의 상관관계 분석 (그래프 회귀선 포함)"""
     
     print("\n" + "=" * 80)
     print("📊 OI-가격 상관관계 분석")
@@ -151,6 +202,15 @@ def analyze_oi_price_correlation(df):
     for name, corr, pval in correlations:
         sig = "✅ 유의함" if pval < 0.05 else "⚠️  유의하지 않음"
         print(f"   {name:40s} | r={corr:+.4f} | p={pval:.4f} {sig}")
+    
+    # 그래프의 회귀선 (각 쌍에서 결측이 없는 행 기준)
+    print("\n📐 그래프 회귀선:")
+    print("-" * 80)
+    for x_col, y_col in PLOT_FITS:
+        fit = linear_fit(df, x_col, y_col)
+        if fit is not None:
+            print(f"   {x_col + ' vs ' + y_col:40s} | 기울기={fit['slope']:+.4f} | "
+                  f"r={fit['corr']:+.4f} | p={fit['pval']:.4f} | n={fit['nobs']}")
 
 def analyze_crash_period_oi(df):
     """급락 시점 전후 OI 분석"""
@@ -163,10 +223,7 @@ def analyze_crash_period_oi(df):
     
     # 급락 전후 7일
     window = 7
-    pre_crash = df[(df['date'] >= crash_date - pd.Timedelta(days=window)) & 
-                   (df['date'] < crash_date)]
-    post_crash = df[(df['date'] >= crash_date) & 
-                    (df['date'] <= crash_date + pd.Timedelta(days=window))]
+    pre_crash, post_crash = crash_windows(df, window)
     
     if len(pre_crash) > 0:
         print(f"\n🔹 급락 전 {window}일:")
@@ -190,8 +247,9 @@ def analyze_crash_period_oi(df):
         print(f"   가격 변화율: {row['price_change_pct']:+.2f}%")
         print(f"   BTC 가격: ${row['BTC_Price']:,.2f}")
 
+@cached_figure(OUTPUT_DIR / "14_open_interest_analysis.png")
 def plot_oi_analysis(df):
-    """OI 분석 시각화"""
+    """OI 분석 시각화 (수치 출력은 analyze_oi_price_correlation, analyze_crash_period_oi)"""
     
     print("\n" + "=" * 80)
     print("📈 Open Interest 시각화")
@@ -240,14 +298,12 @@ def plot_oi_analysis(df):
     ax3.axhline(0, color='black', linewidth=1)
     ax3.axvline(crash_date, color='red', linestyle=':', linewidth=2.5, alpha=0.8)
     
-    # 임계값 선
-    if 'OI_change_pct' in df.columns:
-        mean = df['OI_change_pct'].mean()
-        std = df['OI_change_pct'].std()
-        ax3.axhline(mean + 2*std, color='red', linestyle='--', linewidth=1.5, 
-                   alpha=0.7, label='급증 임계값')
-        ax3.axhline(mean - 2*std, color='blue', linestyle='--', linewidth=1.5, 
-                   alpha=0.7, label='급감 임계값')
+    # 임계값 선 (detect_oi_spikes의 시점별 이동 임계값)
+    if 'OI_upper_threshold' in df.columns:
+        ax3.step(df['date'], df['OI_upper_threshold'], where='mid', color='red', linestyle='--',
+                 linewidth=1.5, alpha=0.7, label='급증 임계값')
+        ax3.step(df['date'], df['OI_lower_threshold'], where='mid', color='blue', linestyle='--',
+                 linewidth=1.5, alpha=0.7, label='급감 임계값')
     
     ax3.set_xlabel('날짜', fontsize=11)
     ax3.set_ylabel('OI 변화율 (%)', fontsize=11, fontweight='bold')
@@ -263,18 +319,13 @@ def plot_oi_analysis(df):
                          alpha=0.6, s=100, edgecolors='black', linewidth=0.5)
     
     # 회귀선
-    mask = ~(df['Open_Interest'].isna() | df['BTC_Price'].isna())
-    if mask.sum() > 1:
-        X = df.loc[mask, 'Open_Interest'].values
-        y = df.loc[mask, 'BTC_Price'].values
-        z = np.polyfit(X, y, 1)
-        p = np.poly1d(z)
-        x_line = np.linspace(X.min(), X.max(), 100)
-        ax4.plot(x_line, p(x_line), 'r--', linewidth=2, 
-                label=f'회귀선 (기울기: {z[0]:.2f})')
+    fit = linear_fit(df, 'Open_Interest', 'BTC_Price')
+    if fit is not None:
+        x_line = np.linspace(fit['x_min'], fit['x_max'], 100)
+        ax4.plot(x_line, fit['slope'] * x_line + fit['intercept'], 'r--', linewidth=2, 
+                label=f"회귀선 (기울기: {fit['slope']:.2f})")
         
-        corr, pval = stats.pearsonr(X, y)
-        ax4.text(0.05, 0.95, f'r = {corr:.4f}\np = {pval:.4f}', 
+        ax4.text(0.05, 0.95, f"r = {fit['corr']:.4f}\np = {fit['pval']:.4f}", 
                 transform=ax4.transAxes, fontsize=10, verticalalignment='top',
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
     
@@ -309,13 +360,10 @@ def plot_oi_analysis(df):
                        linewidth=1, label='OI 이상치')
         
         # 회귀선
-        if len(plot_df) > 1:
-            X = plot_df['OI_change_pct'].values
-            y = plot_df['price_change_pct'].values
-            z = np.polyfit(X, y, 1)
-            p = np.poly1d(z)
-            x_line = np.linspace(X.min(), X.max(), 100)
-            ax5.plot(x_line, p(x_line), 'g--', linewidth=2, alpha=0.7,
+        fit = linear_fit(plot_df, 'OI_change_pct', 'price_change_pct')
+        if fit is not None:
+            x_line = np.linspace(fit['x_min'], fit['x_max'], 100)
+            ax5.plot(x_line, fit['slope'] * x_line + fit['intercept'], 'g--', linewidth=2, alpha=0.7,
                     label=f'회귀선')
     
     ax5.axhline(0, color='black', linewidth=1, alpha=0.5)
@@ -338,16 +386,12 @@ def plot_oi_analysis(df):
                             alpha=0.6, s=100, edgecolors='black', linewidth=0.5)
         
         # 회귀선
-        if len(plot_df) > 1:
-            X = plot_df['Open_Interest'].values
-            y = plot_df['price_volatility'].values
-            z = np.polyfit(X, y, 1)
-            p = np.poly1d(z)
-            x_line = np.linspace(X.min(), X.max(), 100)
-            ax6.plot(x_line, p(x_line), 'r--', linewidth=2)
+        fit = linear_fit(plot_df, 'Open_Interest', 'price_volatility')
+        if fit is not None:
+            x_line = np.linspace(fit['x_min'], fit['x_max'], 100)
+            ax6.plot(x_line, fit['slope'] * x_line + fit['intercept'], 'r--', linewidth=2)
             
-            corr, pval = stats.pearsonr(X, y)
-            ax6.text(0.05, 0.95, f'r = {corr:.4f}\np = {pval:.4f}', 
+            ax6.text(0.05, 0.95, f"r = {fit['corr']:.4f}\np = {fit['pval']:.4f}", 
                     transform=ax6.transAxes, fontsize=10, verticalalignment='top',
                     bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
     
@@ -363,10 +407,7 @@ def plot_oi_analysis(df):
     ax7 = axes[2, 1]
     
     window = 7
-    pre_crash = df[(df['date'] >= crash_date - pd.Timedelta(days=window)) & 
-                   (df['date'] < crash_date)]
-    post_crash = df[(df['date'] >= crash_date) & 
-                    (df['date'] <= crash_date + pd.Timedelta(days=window))]
+    pre_crash, post_crash = crash_windows(df, window)
     
     periods = []
     oi_means = []
@@ -419,10 +460,10 @@ def plot_oi_analysis(df):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "14_open_interest_analysis.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
 def main():
     print("=" * 80)
@@ -431,8 +472,7 @@ def main():
     
     # 1. 데이터 로드
     print("\n📂 데이터 로드 중...")
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_features('master_data_integrated', OI_FEATURES)
     print(f"✅ 데이터 로드 완료: {df.shape}")
     
     # 2. OI 데이터 분석
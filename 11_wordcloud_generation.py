@@ -8,7 +8,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 from wordcloud import WordCloud
+from figure_renderer import cached_figure, save_figure, show_figure
 from collections import Counter
+from keyword_analysis import keyword_lists_by_group, summarize_keywords
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -83,18 +85,17 @@ def extract_keywords_by_sentiment(df):
     print(f"   부정 댓글: {len(negative_df)}개 ({len(negative_df)/len(df)*100:.1f}%)")
     print(f"   중립 댓글: {len(neutral_df)}개 ({len(neutral_df)/len(df)*100:.1f}%)")
     
-    # 키워드 추출
-    def extract_keywords(data_df):
-        keywords = []
-        for idx, row in data_df.iterrows():
-            if pd.notna(row['keywords']):
-                kw_list = [k.strip() for k in str(row['keywords']).split(',')]
-                keywords.extend(kw_list)
-        return keywords
+    # 키워드 추출 (전체 레코드를 한 번에 펼친 뒤 감성 그룹별로 분리)
+    groups = np.select(
+        [df['sentiment_score'] > 0.3, df['sentiment_score'] < -0.3],
+        ['positive', 'negative'],
+        default='neutral'
+    )
+    keyword_lists = keyword_lists_by_group(df, groups)
     
-    positive_keywords = extract_keywords(positive_df)
-    negative_keywords = extract_keywords(negative_df)
-    neutral_keywords = extract_keywords(neutral_df)
+    positive_keywords = keyword_lists.get('positive', [])
+    negative_keywords = keyword_lists.get('negative', [])
+    neutral_keywords = keyword_lists.get('neutral', [])
     
     print(f"\n📊 추출된 키워드 수:")
     print(f"   긍정: {len(positive_keywords)}개")
@@ -150,13 +151,14 @@ def create_wordcloud(keywords, title, output_filename, colormap='viridis'):
     plt.tight_layout(pad=0)
     
     output_file = OUTPUT_DIR / output_filename
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"✅ 워드클라우드 저장: {output_file}")
     
-    plt.show()
+    show_figure()
     
     return wordcloud
 
+@cached_figure(OUTPUT_DIR / "15_wordcloud_combined.png")
 def create_combined_wordcloud(positive_kw, negative_kw, neutral_kw):
     """전체/긍정/부정 3개 워드클라우드를 한 화면에"""
     
@@ -227,10 +229,10 @@ def create_combined_wordcloud(positive_kw, negative_kw, neutral_kw):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "15_wordcloud_combined.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"\n✅ 통합 워드클라우드 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
 def analyze_sentiment_keywords(df):
     """감성별 대표 키워드 분석"""
@@ -239,27 +241,11 @@ def analyze_sentiment_keywords(df):
     print("🔍 감성별 대표 키워드 분석")
     print("=" * 80)
     
-    # 키워드별 평균 감성 점수 계산
-    keyword_sentiment = []
-    
-    for idx, row in df.iterrows():
-        if pd.notna(row['keywords']):
-            keywords = [k.strip() for k in str(row['keywords']).split(',')]
-            for keyword in keywords:
-                keyword_sentiment.append({
-                    'keyword': keyword,
-                    'sentiment_score': row['sentiment_score']
-                })
-    
-    keyword_df = pd.DataFrame(keyword_sentiment)
-    
-    # 키워드별 평균 감성 및 빈도
-    keyword_summary = keyword_df.groupby('keyword').agg({
-        'sentiment_score': ['mean', 'count']
-    }).reset_index()
-    
-    keyword_summary.columns = ['keyword', 'avg_sentiment', 'count']
-    keyword_summary = keyword_summary[keyword_summary['count'] >= 5]  # 최소 5회 이상
+    # 키워드별 평균 감성 및 빈도 (최소 5회 이상)
+    keyword_summary = summarize_keywords(
+        df, values={'avg_sentiment': 'sentiment_score'}, min_count=5,
+        count_column='sentiment_score'
+    )[['keyword', 'avg_sentiment', 'count']]
     
     # 가장 긍정적 키워드
     most_positive = keyword_summary.nlargest(10, 'avg_sentiment')
@@ -287,6 +273,7 @@ def analyze_sentiment_keywords(df):
         else:
             print(f"   ❌ {keyword:30s} | 데이터 없음")
 
+@cached_figure(OUTPUT_DIR / "16_keyword_frequency_comparison.png")
 def create_keyword_frequency_chart(positive_counts, negative_counts):
     """키워드 빈도 비교 차트"""
     
@@ -342,10 +329,10 @@ def create_keyword_frequency_chart(positive_counts, negative_counts):
     plt.tight_layout()
     
     output_file = OUTPUT_DIR / "16_keyword_frequency_comparison.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    save_figure(output_file, dpi=300, bbox_inches='tight')
     print(f"\n✅ 키워드 빈도 차트 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
 def main():
     print("=" * 80)
@@ -8,6 +8,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import networkx as nx
 from pathlib import Path
+from data_store import load_table
+from figure_renderer import cached_figure, save_figure, show_figure
+from lag_correlation import lag_correlation_matrix, best_lags
+from correlation_service import CorrelationService
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,7 +20,6 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -27,8 +30,7 @@ def load_data():
     print("📂 데이터 로드")
     print("=" * 80)
     
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_table('master_data_integrated')
     
     print(f"✅ 데이터 로드 완료: {df.shape}")
     
@@ -72,7 +74,7 @@ def select_key_variables(df):
     
     return available_vars
 
-def calculate_correlation_matrix(df, variables_dict):
+def calculate_correlation_matrix(service, variables_dict):
     """상관관계 행렬 계산"""
     
     print("\n" + "=" * 80)
@@ -88,13 +90,37 @@ def calculate_correlation_matrix(df, variables_dict):
             var_categories[var] = category
     
     # 상관관계 계산
-    corr_df = df[all_vars].corr()
+    corr_df = service.corr(all_vars)
     
     print(f"\n✅ 상관관계 행렬 크기: {corr_df.shape}")
     print(f"   변수 수: {len(all_vars)}")
     
     return corr_df, var_categories
 
+def analyze_lead_lag(df, variables_dict, target='BTC_Price', max_lag=7):
+    """주요 변수와 BTC 가격의 선행/후행 관계 (±max_lag일 시차 상관을 한 번에 계산)"""
+    
+    print("\n" + "=" * 80)
+    print("⏱️  선행/후행 관계 분석")
+    print("=" * 80)
+    
+    variables = [v for vars_list in variables_dict.values() for v in vars_list if v != target]
+    lag_corr, pvals, _ = lag_correlation_matrix(df, target, variables,
+                                                lags=range(-max_lag, max_lag + 1),
+                                                pvalues=True)
+    
+    lead_lag_df = best_lags(lag_corr).rename_axis('variable').reset_index()
+    lead_lag_df['p_value'] = [pvals.at[lag, var] for var, lag in
+                              zip(lead_lag_df['variable'], lead_lag_df['best_lag'])]
+    
+    print(f"\n📊 변수별 최대 시차 상관 (양수 시차: 변수가 {target}보다 선행)")
+    for _, row in lead_lag_df.iterrows():
+        mark = '*' if row['p_value'] < 0.05 else ' '
+        print(f"   {row['variable']:35s} 시차 {row['best_lag']:+3d}일  "
+              f"r={row['correlation']:+.3f}  p={row['p_value']:.4f} {mark}")
+    
+    return lead_lag_df
+
 def create_network_from_correlation(corr_df, var_categories, threshold=0.3):
     """상관관계 기반 네트워크 생성"""
     
@@ -256,39 +282,42 @@ def visualize_network(G, var_categories, centrality_df, output_file):
     ax.axis('off')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"\n✅ 네트워크 그래프 저장: {output_file}")
     
-    plt.show()
+    show_figure()
 
-def create_simplified_network(df, output_file):
-    """단순화된 네트워크 (주요 변수만)"""
-    
-    print("\n" + "=" * 80)
-    print("📊 단순화 네트워크 생성")
-    print("=" * 80)
-    
-    # 핵심 변수만 선택
-    core_vars = {
-        'BTC_Price': '가격',
-        'tone_mean': '뉴스 감성',
-        'tone_neg_share': '뉴스 부정',
-        'M2SL': 'M2 통화량',
-        'Yield_10Y': '10년물 금리',
-        'USD_Index': '달러 인덱스',
-        'Open_Interest': 'Open Interest',
-        'theme_cnt__EPU_POLICY': '정책 테마',
-        'theme_cnt__ECON_BITCOIN': '비트코인 테마'
-    }
+# 단순화 네트워크 핵심 변수 (원본 컬럼 -> 표시 레이블)
+CORE_VARS = {
+    'BTC_Price': '가격',
+    'tone_mean': '뉴스 감성',
+    'tone_neg_share': '뉴스 부정',
+    'M2SL': 'M2 통화량',
+    'Yield_10Y': '10년물 금리',
+    'USD_Index': '달러 인덱스',
+    'Open_Interest': 'Open Interest',
+    'theme_cnt__EPU_POLICY': '정책 테마',
+    'theme_cnt__ECON_BITCOIN': '비트코인 테마'
+}
+
+def build_simplified_network(df, service=None, threshold=0.4):
+    """
+    핵심 변수만으로 상관관계 네트워크 구성 (출력 없음)
     
-    available_core = {k: v for k, v in core_vars.items() if k in df.columns}
+    Args:
+        df: 분석 데이터프레임
+        service: CorrelationService (없으면 이 그래프용으로 생성)
+        threshold: 엣지로 남길 최소 |r|
     
-    print(f"\n📊 핵심 변수: {len(available_core)}개")
-    for var, label in available_core.items():
-        print(f"   - {var} ({label})")
+    Returns:
+        nx.Graph: 노드는 표시 레이블, original 속성에 원본 컬럼명
+    """
+    available_core = {k: v for k, v in CORE_VARS.items() if k in df.columns}
     
-    # 상관관계 계산
-    corr_df = df[list(available_core.keys())].corr()
+    # 상관관계 계산 (서비스가 없으면 이 그래프용으로 생성)
+    if service is None:
+        service = CorrelationService(df)
+    corr_df = service.corr(list(available_core.keys()))
     
     # 네트워크 생성
     G = nx.Graph()
@@ -298,7 +327,6 @@ def create_simplified_network(df, output_file):
         G.add_node(label, original=var)
     
     # 엣지 추가 (강한 상관관계만)
-    threshold = 0.4
     for i, var1 in enumerate(corr_df.index):
         for j, var2 in enumerate(corr_df.columns):
             if i < j:
@@ -309,9 +337,28 @@ def create_simplified_network(df, output_file):
                     G.add_edge(label1, label2, weight=abs(corr_value), 
                              correlation=corr_value)
     
+    return G
+
+def report_simplified_network(G):
+    """단순화 네트워크 구성 결과 출력 (그래프 캐시 여부와 무관하게 매번 출력)"""
+    
+    print("\n" + "=" * 80)
+    print("📊 단순화 네트워크 생성")
+    print("=" * 80)
+    
+    print(f"\n📊 핵심 변수: {G.number_of_nodes()}개")
+    for label, data in G.nodes(data=True):
+        print(f"   - {data['original']} ({label})")
+    
     print(f"\n✅ 단순화 네트워크:")
     print(f"   노드: {G.number_of_nodes()}개")
     print(f"   엣지: {G.number_of_edges()}개")
+
+@cached_figure(output_arg='output_file', ignore=('service',))
+def create_simplified_network(df, service=None, output_file=OUTPUT_DIR / "18_network_simplified.png"):
+    """단순화된 네트워크 (주요 변수만) 시각화"""
+    
+    G = build_simplified_network(df, service)
     
     # 시각화
     fig, ax = plt.subplots(figsize=(14, 12))
@@ -386,12 +433,10 @@ def create_simplified_network(df, output_file):
     ax.axis('off')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"\n✅ 단순화 네트워크 저장: {output_file}")
     
-    plt.show()
-    
-    return G
+    show_figure()
 
 def main():
     print("=" * 80)
@@ -405,7 +450,11 @@ def main():
     variables_dict = select_key_variables(df)
     
     # 3. 상관관계 행렬 계산
-    corr_df, var_categories = calculate_correlation_matrix(df, variables_dict)
+    service = CorrelationService(df)
+    corr_df, var_categories = calculate_correlation_matrix(service, variables_dict)
+    
+    # 선행/후행 관계
+    lead_lag_df = analyze_lead_lag(df, variables_dict)
     
     # 4. 네트워크 생성 (임계값 0.3)
     G = create_network_from_correlation(corr_df, var_categories, threshold=0.3)
@@ -418,7 +467,9 @@ def main():
                      OUTPUT_DIR / "17_network_full.png")
     
     # 7. 단순화 네트워크 생성
-    G_simple = create_simplified_network(df, OUTPUT_DIR / "18_network_simplified.png")
+    G_simple = build_simplified_network(df, service)
+    report_simplified_network(G_simple)
+    create_simplified_network(df, service, OUTPUT_DIR / "18_network_simplified.png")
     
     # 8. 결과 저장
     centrality_df.to_csv(OUTPUT_DIR / "network_centrality.csv", 
@@ -426,6 +477,7 @@ def main():
     
     # 상관관계 저장
     corr_df.to_csv(OUTPUT_DIR / "correlation_matrix.csv", encoding='utf-8-sig')
+    lead_lag_df.to_csv(OUTPUT_DIR / "network_lead_lag.csv", index=False, encoding='utf-8-sig')
     
     print("\n" + "=" * 80)
     print("Task 12 완료! ✅")
@@ -435,6 +487,7 @@ def main():
     print(f"   2. {OUTPUT_DIR / '18_network_simplified.png'}")
     print(f"   3. {OUTPUT_DIR / 'network_centrality.csv'}")
     print(f"   4. {OUTPUT_DIR / 'correlation_matrix.csv'}")
+    print(f"   5. {OUTPUT_DIR / 'network_lead_lag.csv'}")
 
 if __name__ == "__main__":
     main()
@@ -13,13 +13,13 @@ from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from pathlib import Path
+from data_store import load_table
 from datetime import datetime
 import os
 
 # 경로 설정
 OUTPUT_DIR = Path("output/visualizations")
 REPORT_DIR = Path("output/reports")
-INTEGRATED_DIR = Path("data/processed/integrated")
 
 # 리포트 디렉토리 생성
 REPORT_DIR.mkdir(parents=True, exist_ok=True)
@@ -36,8 +36,7 @@ except:
 
 def load_data():
     """데이터 로드"""
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_table('master_data_integrated')
     return df
 
 def create_custom_styles():
@@ -0,0 +1,298 @@
+"""
+이상치(급증/급감) 탐지 모듈
+전체 기간 평균 ± kσ 대신, 각 시점 이전 관측치만으로 만든 기준(중심, 척도)과 비교해
+score = (x_t - 중심_{t-1}) / 척도_{t-1} 를 계산 (미래 정보 누수 없음, 급증 값이 자기 기준을 키우지 않음)
+
+- zscore: 직전 window개 행의 평균/표준편차 (pandas 이동 구간 통계, 값 추가/제거 갱신이라 O(n))
+- mad:    직전 window개 행의 중앙값/MAD x 1.4826 (극단값에 강건, 구간 배열 묶음의 중앙값)
+- ewma:   지수가중 평균/분산 (span = window, alpha = 2 / (window + 1), 재귀식과 같은 O(n))
+- detect(): Series 하나, detect_frame(): 여러 컬럼의 이상 시점을 한 번에
+- StreamingDetector: 실시간 경보용. 관측치 하나씩 상태를 갱신하고 같은 score를 반환
+  (같은 설정이면 detect()와 결과가 같음)
+
+결측 행은 score NaN이고 기준 계산에서 제외 (window는 결측 행을 포함한 행 수 기준)
+|score| > threshold 이면 급증(spike_up) / 급감(spike_down)
+보간된 지표처럼 구간 변동이 거의 없으면 작은 변화도 큰 score가 되므로, min_scale로 척도 하한을 둘 수 있음
+
+사용 예:
+  result = detect(df['OI_change_pct'], method='zscore', window=20, threshold=2.0)
+  result[result['anomaly']]
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('zscore', 'mad', 'ewma')
+# 정규분포에서 MAD -> 표준편차 환산 계수
+MAD_SCALE = 1.4826
+# mad 구간 배열을 만들 때 한 번에 처리할 행 수 (메모리 = 행 수 x window)
+MAD_CHUNK = 4096
+RESULT_COLUMNS = ['value', 'center', 'scale', 'score', 'spike_up', 'spike_down', 'anomaly']
+
+
+def _score(values, center, scale):
+    """(x - 중심) / 척도 (척도가 0이면 같은 값은 0, 다른 값은 ±inf)"""
+    deviation = values - center
+    flat = ~(scale > 1e-12 * (np.abs(center) + 1.0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = deviation / np.where(flat, 1.0, scale)
+        step = np.where(deviation == 0, 0.0, np.sign(deviation) * np.inf)
+    return np.where(flat & np.isfinite(deviation), step, score)
+
+
+def _prior_zscore(x, window, min_periods):
+    """직전 window개 행의 평균/표준편차(ddof=1) 기준"""
+    # 현재 행 제외 -> 한 행 뒤로 민 구간 (누적합 차이와 달리 구간 안 값이 모두 같으면 표준편차가 정확히 0)
+    rolling = pd.Series(x).shift(1).rolling(window, min_periods=max(min_periods, 2))
+    return rolling.mean().to_numpy(), rolling.std().to_numpy()
+
+
+def _prior_mad(x, window, min_periods):
+    """직전 window개 행의 중앙값/MAD 기준 (구간 배열을 MAD_CHUNK행씩 묶어 계산)"""
+    n_rows = len(x)
+    padded = np.concatenate([np.full(window, np.nan), x])
+    count = np.concatenate([np.zeros(1), np.cumsum(np.isfinite(x))])
+    end = np.arange(n_rows)
+    n = count[end] - count[np.maximum(end - window, 0)]
+
+    # windows[t] = padded[t:t + window] = x[t - window:t]
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)[:n_rows]
+    center = np.full(n_rows, np.nan)
+    scale = np.full(n_rows, np.nan)
+    rows = np.flatnonzero(n >= max(min_periods, 1))
+    for i in range(0, len(rows), MAD_CHUNK):
+        idx = rows[i:i + MAD_CHUNK]
+        block = windows[idx]
+        median = np.nanmedian(block, axis=1)
+        center[idx] = median
+        scale[idx] = MAD_SCALE * np.nanmedian(np.abs(block - median[:, None]), axis=1)
+    return center, scale
+
+
+def _prior_ewma(x, window, min_periods):
+    """직전 시점까지의 지수가중 평균/분산 (alpha = 2 / (window + 1), 결측은 건너뜀)"""
+    alpha = 2.0 / (window + 1.0)
+    valid = np.isfinite(x)
+    offset = x[valid][0] if valid.any() else 0.0
+    z = pd.Series(x - offset)
+    # adjust=False: m_t = (1 - a) m_{t-1} + a x_t, 분산 = E_w[x²] - m² (= (1 - a)(v + a (x - m)²) 재귀식)
+    ew = lambda values: values.ewm(alpha=alpha, adjust=False, ignore_na=True).mean().ffill()
+    mean = ew(z)
+    var = np.maximum(ew(z * z) - mean ** 2, 0.0)
+    # 현재 행 제외 -> 한 행 뒤로
+    count = np.concatenate([np.zeros(1), np.cumsum(valid)[:-1]])
+    ok = count >= max(min_periods, 1)
+    return (np.where(ok, mean.shift(1).to_numpy() + offset, np.nan),
+            np.where(ok, np.sqrt(var.shift(1).to_numpy()), np.nan))
+
+
+_BASELINES = {'zscore': _prior_zscore, 'mad': _prior_mad, 'ewma': _prior_ewma}
+
+
+def detect(series, method='zscore', window=20, threshold=3.0, min_periods=None, min_scale=0.0):
+    """
+    Series 하나의 시점별 이상치 score와 급증/급감 여부.
+
+    Args:
+        series: 시계열 (행 순서 = 시간 순서)
+        method: 'zscore', 'mad', 'ewma'
+        window: 기준 구간 길이 (행 수, ewma는 span)
+        threshold: |score|가 이 값을 넘으면 이상치
+        min_periods: 기준을 계산할 최소 유효 관측치 수 (기본: window, 부족한 시점은 score NaN)
+        min_scale: 척도 하한 (series 단위, 0이면 하한 없음)
+
+    Returns:
+        pd.DataFrame: series.index 기준 value, center, scale, score, spike_up, spike_down, anomaly
+    """
+    if method not in _BASELINES:
+        raise ValueError(f"지원하지 않는 method: {method} (가능: {', '.join(METHODS)})")
+    x = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+    center, scale = _BASELINES[method](x, window, window if min_periods is None else min_periods)
+    scale = np.where(np.isnan(scale), np.nan, np.maximum(scale, min_scale))
+    score = np.where(np.isfinite(x), _score(x, center, scale), np.nan)
+    with np.errstate(invalid='ignore'):
+        spike_up = score > threshold
+        spike_down = score < -threshold
+    return pd.DataFrame({
+        'value': x,
+        'center': center,
+        'scale': scale,
+        'score': score,
+        'spike_up': spike_up,
+        'spike_down': spike_down,
+        'anomaly': spike_up | spike_down,
+    }, index=series.index)[RESULT_COLUMNS]
+
+
+def detect_frame(df, columns=None, method='zscore', window=20, threshold=3.0, min_periods=None,
+                 min_scale=0.0, date_col='date'):
+    """
+    여러 컬럼(Master DataFrame 전체 등)의 이상 시점 목록.
+
+    Args:
+        df: 시계열 DataFrame
+        columns: 검사할 컬럼 (None이면 date_col을 제외한 모든 숫자 컬럼)
+        method, window, threshold, min_periods, min_scale: detect()와 동일 (min_scale은 모든 컬럼 공통)
+        date_col: 결과에 표시할 날짜 컬럼 (없으면 행 index)
+
+    Returns:
+        pd.DataFrame: date, variable, value, center, score, direction ('up'/'down'), |score| 내림차순
+    """
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != date_col]
+    dates = df[date_col] if date_col in df.columns else pd.Series(df.index, index=df.index)
+    parts = []
+    for column in columns:
+        result = detect(df[column], method, window, threshold, min_periods, min_scale)
+        hits = result[result['anomaly']]
+        parts.append(pd.DataFrame({
+            'date': dates[hits.index].to_numpy(),
+            'variable': column,
+            'value': hits['value'].to_numpy(),
+            'center': hits['center'].to_numpy(),
+            'score': hits['score'].to_numpy(),
+            'direction': np.where(hits['spike_up'], 'up', 'down'),
+        }))
+    columns_out = ['date', 'variable', 'value', 'center', 'score', 'direction']
+    if not parts:
+        return pd.DataFrame(columns=columns_out)
+    result = pd.concat(parts, ignore_index=True)[columns_out]
+    order = np.argsort(-result['score'].abs().to_numpy(), kind='stable')
+    return result.iloc[order].reset_index(drop=True)
+
+
+class StreamingDetector:
+    """
+    관측치 단위로 기준을 갱신하는 이상치 탐지기 (실시간 경보용).
+
+    zscore는 구간 합/제곱합을 관측치마다 O(1)로 갱신 (첫 값을 기준점으로 빼고 누적,
+    refresh번 갱신마다 구간에서 정확히 다시 계산해 부동소수 오차가 쌓이지 않도록 함),
+    mad는 구간 값 O(window), ewma는 평균/분산 재귀식 O(1).
+    update()가 반환하는 score는 같은 설정의 detect()와 같음.
+
+    Args:
+        method: 'zscore', 'mad', 'ewma'
+        window: 기준 구간 길이 (ewma는 span)
+        threshold: |score|가 이 값을 넘으면 이상치
+        min_periods: 기준을 계산할 최소 유효 관측치 수 (기본: window)
+        min_scale: 척도 하한 (0이면 하한 없음)
+        refresh: zscore 합계의 정확한 재계산 주기 (갱신 횟수)
+    """
+
+    def __init__(self, method='zscore', window=20, threshold=3.0, min_periods=None, min_scale=0.0,
+                 refresh=1000):
+        if method not in _BASELINES:
+            raise ValueError(f"지원하지 않는 method: {method} (가능: {', '.join(METHODS)})")
+        self.method = method
+        self.window = window
+        self.threshold = threshold
+        self.min_periods = window if min_periods is None else min_periods
+        self.min_scale = min_scale
+        self.refresh = refresh
+        self._buffer = deque()           # zscore/mad: 직전 window개 행 (결측은 NaN)
+        self._offset = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._count = 0                  # zscore/mad: 구간 안 유효값 수, ewma: 지금까지 유효값 수
+        self._updates = 0
+        self._mean = 0.0                 # ewma 상태 (기준점 좌표)
+        self._var = 0.0
+
+    def __repr__(self):
+        return (f"StreamingDetector(method={self.method!r}, window={self.window}, "
+                f"threshold={self.threshold}, nobs={self._count})")
+
+    def _baseline(self):
+        """min_scale 적용 전 기준 (중심, 척도)"""
+        if self.method == 'ewma':
+            if self._count < max(self.min_periods, 1):
+                return np.nan, np.nan
+            return self._mean + self._offset, np.sqrt(max(self._var, 0.0))
+        if self.method == 'zscore':
+            n = self._count
+            if n < max(self.min_periods, 2):
+                return np.nan, np.nan
+            mean = self._sum / n
+            spread = self._sumsq - self._sum * mean
+            if spread <= 1e-12 * self._sumsq:
+                # 구간 값이 모두 같음 -> 반올림 오차 없이 그 값과 척도 0 (batch와 같은 결과)
+                values = np.array(self._buffer, dtype=float)
+                return values[np.isfinite(values)][-1], 0.0
+            return mean + self._offset, np.sqrt(spread / (n - 1))
+        if self._count < max(self.min_periods, 1):
+            return np.nan, np.nan
+        values = np.array(self._buffer, dtype=float)
+        median = np.nanmedian(values)
+        return median, MAD_SCALE * np.nanmedian(np.abs(values - median))
+
+    def baseline(self):
+        """
+        현재 기준 (다음 관측치와 비교할 중심, 척도).
+
+        Returns:
+            tuple: (center, scale), 관측치가 부족하면 (nan, nan)
+        """
+        center, scale = self._baseline()
+        return center, scale if np.isnan(scale) else max(scale, self.min_scale)
+
+    def _recompute(self):
+        """구간 값으로 합계를 정확히 다시 계산"""
+        self._updates = 0
+        values = np.array(self._buffer, dtype=float) - self._offset
+        values = values[np.isfinite(values)]
+        self._sum = float(values.sum())
+        self._sumsq = float((values * values).sum())
+
+    def _push(self, value, valid):
+        """구간에 값 하나 추가, 넘치면 가장 오래된 값 제거 (zscore/mad)"""
+        self._buffer.append(value if valid else np.nan)
+        if valid:
+            self._count += 1
+            if self.method == 'zscore':
+                self._sum += value - self._offset
+                self._sumsq += (value - self._offset) ** 2
+        if len(self._buffer) > self.window:
+            old = self._buffer.popleft()
+            if np.isfinite(old):
+                self._count -= 1
+                if self.method == 'zscore':
+                    self._sum -= old - self._offset
+                    self._sumsq -= (old - self._offset) ** 2
+        if self.method == 'zscore':
+            self._updates += 1
+            if self._updates >= self.refresh:
+                self._recompute()
+
+    def update(self, value):
+        """
+        관측치 하나를 평가한 뒤 기준에 반영.
+
+        Args:
+            value: 새 관측치 (결측이면 score NaN, ewma 상태는 그대로)
+
+        Returns:
+            dict: value, center, scale, score, anomaly, direction ('up'/'down'/None)
+        """
+        value = float(value) if value is not None else np.nan
+        valid = np.isfinite(value)
+        if valid and self._offset is None:
+            self._offset = value
+        center, scale = self.baseline()
+        score = float(_score(np.array(value), np.array(center), np.array(scale))) if valid else np.nan
+        direction = 'up' if score > self.threshold else 'down' if score < -self.threshold else None
+
+        if self.method != 'ewma':
+            self._push(value, valid)
+        elif valid:
+            alpha = 2.0 / (self.window + 1.0)
+            z = value - self._offset
+            if self._count == 0:
+                self._mean, self._var = z, 0.0
+            else:
+                self._var = (1 - alpha) * (self._var + alpha * (z - self._mean) ** 2)
+                self._mean = (1 - alpha) * self._mean + alpha * z
+            self._count += 1
+        return {'value': value, 'center': center, 'scale': scale, 'score': score,
+                'anomaly': direction is not None, 'direction': direction}
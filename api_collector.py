@@ -0,0 +1,289 @@
+"""
+API 수집 공용 모듈
+가격(Binance), 공포탐욕지수(Alternative.me), GDELT 수집 스크립트가 같은 HTTP 클라이언트를 사용하도록
+커넥션 풀 세션, 호스트별 요청 속도 제한, 재시도, 체크포인트, 병렬 요청을 한 곳에서 제공
+
+- 호스트별 토큰 버킷: 스레드 수와 무관하게 API 허용 속도를 넘지 않음 (time.sleep 하드코딩 불필요)
+- 재시도: 연결 오류/타임아웃/429/5xx는 지수 백오프(+지터)로 재시도, Retry-After 헤더 우선
+  (429를 받으면 같은 호스트의 다른 스레드도 함께 대기)
+- fetch_all(): 여러 요청을 스레드 풀로 동시에 보내고, 체크포인트 파일(JSONL)에 완료된 응답을 기록해
+  중단된 백필을 다시 실행하면 남은 요청만 보냄
+- ttl을 지정한 요청은 response_cache에 저장해 다시 실행할 때 네트워크 요청 없이 사용
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# 호스트 -> (초당 요청 수, 버스트 허용량)
+DEFAULT_RATE_LIMITS = {
+    'api.binance.com': (10.0, 20),         # klines weight 2, 분당 6000 weight 한도 대비 여유
+    'api.alternative.me': (1.0, 2),
+    'api.gdeltproject.org': (0.2, 1),      # GDELT DOC API: 5초에 1번
+}
+FALLBACK_RATE_LIMIT = (2.0, 4)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    토큰 버킷 속도 제한 (스레드 안전).
+
+    Args:
+        rate: 초당 요청 수
+        burst: 한 번에 연속으로 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """서버가 속도 제한을 알려오면 이 호스트의 모든 요청을 seconds 동안 멈춤"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class Checkpoint:
+    """
+    완료된 요청의 응답을 기록하는 JSONL 체크포인트 (한 줄 = {"key", "data"}).
+    줄 단위로 추가 기록하므로 중간에 중단돼도 기록된 응답은 유지됨
+
+    Args:
+        path: 체크포인트 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self):
+        """기록된 응답 (key -> data). 마지막 줄이 잘린 경우 그 줄만 무시"""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[entry['key']] = entry['data']
+        return done
+
+    def record(self, key, data):
+        """응답 하나를 기록"""
+        line = json.dumps({'key': key, 'data': data}, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a+b') as f:
+                # 중단으로 마지막 줄이 잘려 있으면 새 줄에서 시작 (잘린 줄에 이어 쓰면 이 기록도 깨짐)
+                if f.tell() > 0:
+                    f.seek(-1, 2)
+                    if f.read(1) != b'\n':
+                        line = '\n' + line
+                f.write(line.encode('utf-8'))
+
+    def clear(self):
+        """백필이 끝나면 체크포인트 삭제"""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+
+def _retry_after(response):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초로 변환 (없으면 None)"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ApiCollector:
+    """
+    속도 제한/재시도/병렬 요청을 갖춘 JSON API 클라이언트 (스레드 안전).
+
+    Args:
+        rate_limits: 호스트 -> (초당 요청 수, 버스트) (None이면 DEFAULT_RATE_LIMITS)
+        max_retries: 요청당 최대 재시도 횟수
+        backoff: 첫 재시도 대기(초), 이후 2배씩 증가
+        timeout: 기본 요청 타임아웃(초)
+        pool_size: 호스트별 커넥션 풀 크기
+        cache: ResponseCache (None이면 캐시 없이 항상 요청)
+    """
+
+    def __init__(self, rate_limits=None, max_retries=4, backoff=1.0, timeout=30, pool_size=8,
+                 cache=None):
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url):
+        """URL 호스트의 속도 제한기"""
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            if host not in self._limiters:
+                rate, burst = self.rate_limits.get(host, FALLBACK_RATE_LIMIT)
+                self._limiters[host] = RateLimiter(rate, burst)
+            return self._limiters[host]
+
+    def get(self, url, params=None, timeout=None):
+        """
+        GET 요청 (속도 제한 + 재시도).
+
+        Args:
+            url: 요청 URL
+            params: 쿼리 파라미터
+            timeout: 요청 타임아웃(초, None이면 기본값)
+
+        Returns:
+            requests.Response: 성공 응답
+
+        Raises:
+            requests.exceptions.RequestException: 재시도 후에도 실패하거나 재시도 대상이 아닌 4xx
+        """
+        limiter = self.limiter(url)
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response
+                error = requests.exceptions.HTTPError(
+                    f"HTTP {response.status_code} for {response.url}", response=response)
+                retry_after = _retry_after(response)
+
+            if attempt == self.max_retries:
+                raise error
+            wait = retry_after if retry_after is not None else \
+                self.backoff * 2 ** attempt * (1 + random.random() * 0.25)
+            if retry_after is not None or getattr(error.response, 'status_code', None) == 429:
+                limiter.pause(wait)
+            logger.warning(f"Retrying {url} in {wait:.1f}s ({attempt + 1}/{self.max_retries}): {error}")
+            time.sleep(wait)
+
+    def get_json(self, url, params=None, timeout=None, ttl=None):
+        """
+        GET 요청 후 JSON 파싱 결과 반환 (get과 같은 재시도 규칙).
+
+        Args:
+            url: 요청 URL
+            params: 쿼리 파라미터
+            timeout: 요청 타임아웃(초)
+            ttl: 응답 캐시 유효 시간(초, response_cache.period_ttl 참고). None이면 캐시하지 않음
+
+        Returns:
+            JSON 응답
+        """
+        if self.cache is None or ttl is None:
+            return self.get(url, params, timeout).json()
+        return self.cache.cached(url, params, lambda: self.get(url, params, timeout).json(), ttl)
+
+    def fetch_all(self, jobs, workers=4, checkpoint=None, timeout=None):
+        """
+        여러 JSON 요청을 병렬로 수집 (호스트별 속도 제한은 그대로 적용).
+
+        Args:
+            jobs: key(str) -> (url, params) 또는 (url, params, ttl) 요청 목록
+            workers: 동시 요청 스레드 수
+            checkpoint: Checkpoint (있으면 기록된 key는 건너뛰고, 완료될 때마다 기록)
+            timeout: 요청 타임아웃(초, None이면 기본값)
+
+        Returns:
+            dict: key -> JSON 응답 (실패한 요청은 제외, 경고 로그 출력)
+        """
+        results = checkpoint.load() if checkpoint is not None else {}
+        results = {key: results[key] for key in jobs if key in results}
+        pending = {key: job for key, job in jobs.items() if key not in results}
+        if results:
+            logger.info(f"Resuming from checkpoint: {len(results)} done, {len(pending)} pending")
+        if not pending:
+            return results
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+            futures = {}
+            for key, job in pending.items():
+                url, params, ttl = job if len(job) == 3 else (*job, None)
+                futures[executor.submit(self.get_json, url, params, timeout, ttl)] = key
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    data = future.result()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    logger.error(f"Failed to fetch {key}: {e}")
+                    failed.append(key)
+                    continue
+                results[key] = data
+                if checkpoint is not None:
+                    checkpoint.record(key, data)
+
+        if failed:
+            logger.warning(f"{len(failed)}/{len(jobs)} requests failed (re-run to resume)")
+        return results
+
+
+_DEFAULT_COLLECTOR = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_collector():
+    """프로세스 공유 기본 수집기 (호스트별 속도 제한과 응답 캐시를 모든 수집 함수가 공유)"""
+    global _DEFAULT_COLLECTOR
+    with _DEFAULT_LOCK:
+        if _DEFAULT_COLLECTOR is None:
+            _DEFAULT_COLLECTOR = ApiCollector(cache=ResponseCache())
+        return _DEFAULT_COLLECTOR
+
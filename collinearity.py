@@ -0,0 +1,237 @@
+"""
+다중공선성 진단 모듈
+변수마다 보조 회귀(변수 ~ 나머지 변수)를 따로 적합하지 않고,
+상관 행렬의 고유분해 한 번으로 VIF, 조건수, 편상관계수를 모두 계산
+
+- 상관 행렬 R = V diag(λ) V' 이면 R^-1 = V diag(1/λ) V'
+  -> VIF_i = (R^-1)_ii, 조건수 = sqrt(λmax / λmin), 편상관 ρ_ij·rest = -P_ij / sqrt(P_ii P_jj)
+- target을 주면 (변수 + target) 상관 행렬 하나로 target과의 편상관까지 계산하고,
+  설명변수끼리의 역행렬은 Schur 보수로 얻음 (역행렬 추가 계산 없음)
+- 모든 함수가 (묶음, k, k) 상관 행렬 배열을 np.linalg.eigh 한 번으로 처리:
+  feature_set_diagnostics()는 수백 개의 후보 변수 조합, rolling_diagnostics()는 모든 이동 구간을 한 번에
+- 다른 변수들의 선형결합으로 정확히 표현되는 변수(영 고유값의 고유벡터에 걸린 변수)는 VIF = inf,
+  그 변수가 낀 편상관은 NaN, 조건수는 inf (나머지 변수는 유사역행렬로 정상 계산)
+
+VIF 해석: 1 = 독립, 5~10 이상 = 공선성 의심 (VIF_THRESHOLD)
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# 조건수(sqrt(λmax/λmin))가 이보다 크면 특이 행렬로 보고 해당 고유값을 0으로 처리
+MAX_CONDITION = 1e8
+# 이 값 이상의 VIF는 공선성 경고
+VIF_THRESHOLD = 10.0
+
+
+def _precision(corr):
+    """
+    (..., k, k) 상관 행렬 묶음의 (유사)역행렬.
+
+    Returns:
+        tuple: precision (유사역행렬), eigvals, involved (..., k) 영(null) 고유벡터에 걸린 변수
+               (= 다른 변수들의 선형결합으로 정확히 표현되는 변수)
+    """
+    eigvals, eigvecs = np.linalg.eigh(corr)
+    null = ~(eigvals > eigvals[..., -1:] / MAX_CONDITION ** 2)
+    inv_vals = np.where(null, 0.0, 1.0 / np.where(null, 1.0, eigvals))
+    precision = (eigvecs * inv_vals[..., None, :]) @ np.swapaxes(eigvecs, -1, -2)
+    involved = ((np.abs(eigvecs) > 1e-6) & null[..., None, :]).any(axis=-1)
+    return precision, eigvals, involved
+
+
+def _diagnose(corr, with_target=False):
+    """
+    (..., k, k) 상관 행렬 묶음의 공선성 지표.
+
+    Args:
+        corr: 상관 행렬 배열 (with_target이면 마지막 행/열이 target)
+        with_target: True면 target과의 편상관을 계산하고 VIF/조건수는 설명변수 부분만
+
+    Returns:
+        dict: vif (..., p), condition_number (...), eigenvalues (..., p),
+              partial_corr (..., p, p) 설명변수끼리, target_partial_corr (..., p) (with_target일 때)
+    """
+    corr = np.asarray(corr, dtype=float)
+    precision, eigvals, involved = _precision(corr)
+
+    out = {}
+    if with_target:
+        diag = np.sqrt(np.diagonal(precision, axis1=-2, axis2=-1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            target_partial = -precision[..., :-1, -1] / (diag[..., :-1] * diag[..., -1:])
+        out['target_partial_corr'] = np.where(involved[..., :-1] | involved[..., -1:], np.nan, target_partial)
+
+        # 설명변수 블록의 역행렬 = P_xx - P_xy P_yx / P_yy (Schur 보수, 전체 행렬이 정칙일 때)
+        p_xy = precision[..., :-1, -1]
+        p_yy = precision[..., -1, -1]
+        regular = ~involved.any(axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            schur = precision[..., :-1, :-1] - p_xy[..., :, None] * p_xy[..., None, :] / p_yy[..., None, None]
+        corr = corr[..., :-1, :-1]
+        eigvals = np.linalg.eigvalsh(corr)
+        precision, involved = schur, np.zeros(corr.shape[:-1], dtype=bool)
+        if not np.all(regular):
+            # 공선성 때문에 전체 행렬이 특이한 묶음만 설명변수 블록을 다시 분해
+            sub = ~regular
+            precision[sub], _, involved[sub] = _precision(corr[sub])
+
+    diag = np.diagonal(precision, axis1=-2, axis2=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        partial = -precision / np.sqrt(diag[..., :, None] * diag[..., None, :])
+        condition = np.sqrt(eigvals[..., -1] / eigvals[..., 0])
+    k = corr.shape[-1]
+    partial[..., np.arange(k), np.arange(k)] = 1.0
+    pair_involved = involved[..., :, None] | involved[..., None, :]
+    partial = np.where(pair_involved, np.nan, partial)
+    partial[..., np.arange(k), np.arange(k)] = 1.0
+
+    singular = involved.any(axis=-1)
+    out['vif'] = np.where(involved, np.inf, diag)
+    out['condition_number'] = np.where(singular, np.inf, condition)
+    out['eigenvalues'] = eigvals
+    out['partial_corr'] = partial
+    return out
+
+
+def diagnose(df, columns=None, target=None):
+    """
+    설명변수 집합 하나의 공선성 진단 (결측은 사용하는 모든 컬럼 기준 행 제거).
+
+    Args:
+        df: DataFrame
+        columns: 설명변수 목록 (None이면 target을 제외한 모든 숫자 컬럼)
+        target: 종속변수 컬럼명 (주면 각 변수와 target의 편상관 포함)
+
+    Returns:
+        dict: table (variable, vif, tolerance[, partial_corr_target], VIF 내림차순),
+              condition_number, eigenvalues, partial_corr (변수 x 변수 DataFrame), nobs
+    """
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != target]
+    columns = list(columns)
+    frame = df[columns + ([target] if target else [])].astype(float).dropna()
+    result = _diagnose(frame.corr().to_numpy(), with_target=target is not None)
+
+    table = pd.DataFrame({'variable': columns, 'vif': result['vif']})
+    table['tolerance'] = 1 / table['vif']
+    if target:
+        table['partial_corr_target'] = result['target_partial_corr']
+    return {
+        'table': table.sort_values('vif', ascending=False, ignore_index=True),
+        'condition_number': float(result['condition_number']),
+        'eigenvalues': result['eigenvalues'],
+        'partial_corr': pd.DataFrame(result['partial_corr'], index=columns, columns=columns),
+        'nobs': len(frame),
+    }
+
+
+def feature_set_diagnostics(df, feature_sets=None, candidates=None, size=2):
+    """
+    여러 설명변수 조합의 공선성을 한 번에 진단 (전체 상관 행렬에서 부분 블록만 꺼내 묶음 고유분해).
+
+    Args:
+        df: DataFrame
+        feature_sets: 변수 조합 목록 (None이면 candidates의 size개 조합 전체)
+        candidates: feature_sets가 None일 때 후보 변수 (None이면 모든 숫자 컬럼)
+        size: feature_sets가 None일 때 조합 크기
+
+    Returns:
+        pd.DataFrame: features (튜플), size, max_vif, condition_number, vif (features 순서의 튜플)
+                      (조건수 오름차순, 결측은 모든 후보 기준 행 제거)
+    """
+    if feature_sets is None:
+        if candidates is None:
+            candidates = df.select_dtypes(include='number').columns
+        feature_sets = combinations(candidates, size)
+    feature_sets = [tuple(s) for s in feature_sets]
+    columns = list(dict.fromkeys(c for s in feature_sets for c in s))
+    corr = df[columns].astype(float).dropna().corr().to_numpy()
+    position = {c: i for i, c in enumerate(columns)}
+
+    by_size = {}
+    for features in feature_sets:
+        by_size.setdefault(len(features), []).append(features)
+
+    parts = []
+    for k, sets in by_size.items():
+        idx = np.array([[position[c] for c in s] for s in sets])
+        result = _diagnose(corr[idx[:, :, None], idx[:, None, :]])
+        parts.append(pd.DataFrame({
+            'features': sets,
+            'size': k,
+            'max_vif': result['vif'].max(axis=1),
+            'condition_number': result['condition_number'],
+            'vif': list(map(tuple, result['vif'].tolist())),
+        }))
+    if not parts:
+        return pd.DataFrame(columns=['features', 'size', 'max_vif', 'condition_number', 'vif'])
+    result = pd.concat(parts, ignore_index=True)
+    return result.sort_values('condition_number', ignore_index=True)
+
+
+def rolling_diagnostics(df, columns, window, min_periods=None):
+    """
+    이동 구간별 VIF와 조건수 (구간 상관 행렬을 누적합 차이로 만들고 묶음 고유분해 한 번).
+
+    Args:
+        df: 시계열 DataFrame (행 순서 = 시간 순서)
+        columns: 설명변수 목록
+        window: 구간 길이 (행 수)
+        min_periods: 최소 유효 관측치 수 (기본: 변수 수 + 2)
+
+    Returns:
+        pd.DataFrame: df.index 기준 condition_number, max_vif, vif_<변수>, nobs
+                      (관측치 부족 구간은 NaN, 구간 안에서 상수인 변수는 VIF NaN이고 나머지 변수만으로 계산)
+    """
+    columns = list(columns)
+    k = len(columns)
+    min_periods = max(k + 2, min_periods or 0)
+    x = df[columns].to_numpy(dtype=float)
+    valid = np.isfinite(x).all(axis=1)
+
+    # 전체 평균/표준편차로 표준화한 뒤 누적 (큰 값의 상쇄 오차 방지, 상관계수는 불변)
+    mean = x[valid].mean(axis=0) if valid.any() else np.zeros(k)
+    std = x[valid].std(axis=0) if valid.any() else np.ones(k)
+    z = np.where(valid[:, None], (x - mean) / np.where(std > 0, std, 1.0), 0.0)
+
+    def prefix(values):
+        out = np.zeros((len(values) + 1,) + values.shape[1:])
+        np.cumsum(values, axis=0, out=out[1:])
+        return out
+
+    sxx = prefix(z[:, :, None] * z[:, None, :])
+    sx = prefix(z)
+    count = prefix(valid.astype(float))
+    end = np.arange(1, len(z) + 1)
+    start = np.maximum(end - window, 0)
+    n = count[end] - count[start]
+    s = sx[end] - sx[start]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = (sxx[end] - sxx[start]) - s[:, :, None] * s[:, None, :] / n[:, None, None]
+        scale = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 0.0))
+        corr = cov / (scale[:, :, None] * scale[:, None, :])
+
+    # 구간 안에서 상수인 변수(월별 지표 등)는 단위 행/열로 바꿔 나머지 변수만의 진단과 같게 하고 VIF는 NaN
+    # (표준화 스케일이라 분산 합이 관측치 수에 비례 -> 상대 오차 수준 이하면 상수)
+    constant = ~(scale > 1e-6 * np.sqrt(n)[:, None])
+    corr[constant[:, :, None] | constant[:, None, :]] = 0.0
+    corr[:, np.arange(k), np.arange(k)] = 1.0
+
+    ok = n >= min_periods
+    vif = np.full((len(z), k), np.nan)
+    condition = np.full(len(z), np.nan)
+    if ok.any():
+        result = _diagnose(corr[ok])
+        vif[ok] = np.where(constant[ok], np.nan, result['vif'])
+        condition[ok] = result['condition_number']
+
+    max_vif = np.where(np.isnan(vif).all(axis=1), np.nan, np.where(np.isnan(vif), -np.inf, vif).max(axis=1))
+    out = pd.DataFrame({'condition_number': condition, 'max_vif': max_vif}, index=df.index)
+    for j, column in enumerate(columns):
+        out[f'vif_{column}'] = vif[:, j]
+    out['nobs'] = n.astype(int)
+    return out
@@ -0,0 +1,246 @@
+"""
+상관관계 행렬 서비스
+컬럼 쌍별 충분통계량(유효 개수, 합, 제곱합, 교차곱)의 누적합(prefix sum)을 유지해
+임의 날짜 구간 x 임의 컬럼 부분집합의 상관 행렬을 데이터 재스캔 없이 계산
+
+- Pearson: 누적합 두 행의 차이로 O(k²) 계산 (결측치는 pandas DataFrame.corr와 동일하게 쌍별 제외)
+- Spearman: 순위는 구간마다 달라지므로 구간 내에서 순위를 매긴 뒤 계산
+- append(): 새 날짜 1행 추가는 O(k²) (기존 누적합 재계산 없음)
+- 결과는 (컬럼, 구간 행 범위, 방법) 키로 캐시, 행 범위 기준이므로 append 후에도 유효
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class CorrelationService:
+    """
+    날짜 구간별 상관 행렬을 누적합으로 계산하는 서비스.
+
+    Args:
+        df: 날짜 컬럼과 수치형 컬럼을 가진 DataFrame
+        columns: 관리할 컬럼 목록 (None이면 모든 수치형 컬럼)
+        date_column: 날짜 컬럼명
+        cache_size: 캐시할 최대 결과 수
+    """
+
+    def __init__(self, df, columns=None, date_column='date', cache_size=256):
+        if columns is None:
+            columns = df.select_dtypes(include='number').columns.tolist()
+        self.columns = list(columns)
+        self.date_column = date_column
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+        df = df.sort_values(date_column)
+        values = df[self.columns].to_numpy(dtype=float)
+        # 큰 값(가격, M2 등)의 상쇄 오차를 줄이기 위해 초기 평균을 빼고 누적 (상관계수는 평행이동 불변)
+        self._offset = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else \
+            np.zeros(len(self.columns))
+
+        k = len(self.columns)
+        capacity = max(len(values), 16)
+        self._dates = np.empty(capacity, dtype='datetime64[ns]')
+        self._values = np.empty((capacity, k))
+        # 누적합: [t] = 0..t-1행의 합, (capacity + 1, k, k)
+        self._n = np.zeros((capacity + 1, k, k))
+        self._sx = np.zeros((capacity + 1, k, k))
+        self._sxx = np.zeros((capacity + 1, k, k))
+        self._sxy = np.zeros((capacity + 1, k, k))
+        self._size = 0
+
+        if len(values):
+            self._extend(df[date_column].to_numpy(dtype='datetime64[ns]'), values)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return (f"CorrelationService(rows={self._size}, columns={len(self.columns)}, "
+                f"cache={len(self._cache)}, hits={self.hits}, misses={self.misses})")
+
+    @property
+    def dates(self):
+        return self._dates[:self._size]
+
+    def _grow(self, needed):
+        """용량이 부족하면 두 배로 확장 (append 분할상환 O(k²))"""
+        capacity = len(self._dates)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        self._dates = np.resize(self._dates, new_capacity)
+        self._values = np.resize(self._values, (new_capacity, len(self.columns)))
+        for name in ('_n', '_sx', '_sxx', '_sxy'):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity + 1,) + old.shape[1:])
+            new[:self._size + 1] = old[:self._size + 1]
+            setattr(self, name, new)
+
+    def _extend(self, dates, values):
+        """행 블록을 추가하고 누적합 갱신"""
+        m = len(values)
+        start = self._size
+        self._grow(start + m)
+
+        centered = values - self._offset
+        valid = ~np.isnan(centered)
+        x = np.where(valid, centered, 0.0)
+        pair = valid[:, :, None] & valid[:, None, :]          # (m, k, k) 쌍별 유효
+
+        self._dates[start:start + m] = dates
+        self._values[start:start + m] = values
+        base = slice(start, start + 1)
+        self._n[start + 1:start + m + 1] = self._n[base] + np.cumsum(pair, axis=0)
+        self._sx[start + 1:start + m + 1] = self._sx[base] + np.cumsum(pair * x[:, :, None], axis=0)
+        self._sxx[start + 1:start + m + 1] = self._sxx[base] + np.cumsum(pair * (x ** 2)[:, :, None], axis=0)
+        self._sxy[start + 1:start + m + 1] = self._sxy[base] + np.cumsum(
+            x[:, :, None] * x[:, None, :], axis=0)
+        self._size += m
+
+    def append(self, row):
+        """
+        새 날짜 행 추가 (기존 날짜보다 이후여야 함).
+
+        Args:
+            row: 날짜 컬럼과 값 컬럼을 가진 dict, Series 또는 DataFrame
+                 (없는 컬럼은 결측치로 처리)
+        """
+        rows = pd.DataFrame([row]) if isinstance(row, (dict, pd.Series)) else row
+        rows = rows.sort_values(self.date_column)
+        dates = pd.to_datetime(rows[self.date_column]).to_numpy(dtype='datetime64[ns]')
+        if self._size and dates[0] <= self.dates[-1]:
+            raise ValueError(f"추가할 날짜는 마지막 날짜({self.dates[-1]}) 이후여야 합니다")
+        values = rows.reindex(columns=self.columns).to_numpy(dtype=float)
+        self._extend(dates, values)
+
+    def _row_range(self, start, end):
+        """날짜 구간(양 끝 포함)을 행 범위 [a, b)로 변환"""
+        dates = self.dates
+        a = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left'))
+        b = self._size if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), 'right'))
+        return a, max(a, b)
+
+    def _resolve_columns(self, columns):
+        if columns is None:
+            return list(self.columns)
+        missing = [c for c in columns if c not in self._col_index]
+        if missing:
+            raise KeyError(f"서비스에 없는 컬럼: {missing}")
+        return list(columns)
+
+    def _pearson(self, idx, a, b, min_periods):
+        """누적합 두 행의 차이로 Pearson 상관 행렬 계산"""
+        sel = np.ix_(idx, idx)
+        n = self._n[b][sel] - self._n[a][sel]
+        sx = self._sx[b][sel] - self._sx[a][sel]
+        sxx = self._sxx[b][sel] - self._sxx[a][sel]
+        sxy = self._sxy[b][sel] - self._sxy[a][sel]
+        sy, syy = sx.T, sxx.T
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * sxy - sx * sy
+            var_x = n * sxx - sx ** 2
+            var_y = n * syy - sy ** 2
+            corr = cov / np.sqrt(var_x * var_y)
+            # 부동소수 오차로 생기는 미세한 음수 분산은 상수 컬럼으로 처리
+            scale = np.maximum(np.abs(n * sxx), 1.0)
+            corr[(var_x <= 1e-12 * scale) | (var_y <= 1e-12 * scale.T)] = np.nan
+
+        corr = np.clip(corr, -1.0, 1.0)
+        corr[n < max(min_periods, 2)] = np.nan
+        diag = np.diag_indices_from(corr)
+        corr[diag] = np.where(np.isnan(corr[diag]), np.nan, 1.0)
+        return corr
+
+    def _spearman(self, idx, a, b, min_periods):
+        """구간 내에서 순위를 매겨 Spearman 상관 행렬 계산"""
+        window = pd.DataFrame(self._values[a:b, idx], columns=[self.columns[i] for i in idx])
+        if window.isna().any().any():
+            # 결측치가 있으면 쌍마다 유효 행이 달라 순위도 쌍별로 다시 매겨야 함
+            return window.corr(method='spearman', min_periods=max(min_periods, 1)).to_numpy()
+        ranks = window.rank().to_numpy()
+        centered = ranks - ranks.mean(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = centered.T @ centered
+            std = np.sqrt(np.diag(cov))
+            corr = cov / np.outer(std, std)
+        corr = np.clip(corr, -1.0, 1.0)
+        if len(window) < max(min_periods, 2):
+            corr[:] = np.nan
+        return corr
+
+    def corr(self, columns=None, start=None, end=None, method='pearson', min_periods=1):
+        """
+        날짜 구간의 상관 행렬.
+
+        Args:
+            columns: 컬럼 목록 (None이면 전체)
+            start: 시작 날짜, 포함 (None이면 처음부터)
+            end: 종료 날짜, 포함 (None이면 끝까지)
+            method: 'pearson' 또는 'spearman'
+            min_periods: 쌍별 최소 유효 표본 수 (pandas DataFrame.corr와 동일)
+
+        Returns:
+            pd.DataFrame: 상관 행렬
+        """
+        if method not in ('pearson', 'spearman'):
+            raise ValueError(f"지원하지 않는 method: {method}")
+        columns = self._resolve_columns(columns)
+        a, b = self._row_range(start, end)
+
+        key = (tuple(columns), a, b, method, min_periods)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key].copy()
+        self.misses += 1
+
+        idx = [self._col_index[c] for c in columns]
+        compute = self._pearson if method == 'pearson' else self._spearman
+        result = pd.DataFrame(compute(idx, a, b, min_periods), index=columns, columns=columns)
+
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result.copy()
+
+    def pair(self, col1, col2, start=None, end=None, method='pearson'):
+        """두 컬럼의 상관계수 하나"""
+        return self.corr([col1, col2], start, end, method).iat[0, 1]
+
+
+def top_pairs(corr_matrix, n=10, threshold=None):
+    """
+    상관 행렬에서 |상관계수| 기준 상위 변수 쌍 (상삼각만, 벡터화).
+
+    Args:
+        corr_matrix: 상관 행렬 DataFrame
+        n: 반환할 최대 쌍 수 (None이면 전체)
+        threshold: |상관계수| 최소값 (None이면 제한 없음)
+
+    Returns:
+        pd.DataFrame: Variable 1, Variable 2, Correlation 컬럼 (|상관계수| 내림차순)
+    """
+    names = corr_matrix.columns.to_numpy()
+    i, j = np.triu_indices(len(names), k=1)
+    values = corr_matrix.to_numpy()[i, j]
+
+    keep = ~np.isnan(values)
+    if threshold is not None:
+        keep &= np.abs(values) > threshold
+    i, j, values = i[keep], j[keep], values[keep]
+
+    order = np.argsort(-np.abs(values), kind='stable')
+    if n is not None:
+        order = order[:n]
+    return pd.DataFrame({
+        'Variable 1': names[i[order]],
+        'Variable 2': names[j[order]],
+        'Correlation': values[order],
+    })
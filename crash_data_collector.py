@@ -17,11 +17,13 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import yfinance as yf
-import requests
 import json
-import time
 import os
 
+from api_collector import default_collector
+from response_cache import period_ttl
+from synthetic_signals import SOCIAL_BASES, liquidation_signals, news_signals, social_signals
+
 # ============================================================================
 # 설정
 # ============================================================================
@@ -44,6 +46,17 @@ PERIOD_2 = {
 OUTPUT_DIR = './crash_analysis_data'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# 수집 응답 캐시 (api_collector 기본 수집기와 공유)
+RESPONSE_CACHE = default_collector().cache
+
+# 합성 비정형 신호: 기간별 급락일, 소셜 기본값, 부정 뉴스 폭증일 (급락일 기준)
+CRASH_SIGNALS = {
+    '2025': {'crash_date': '20251010', 'social_bases': SOCIAL_BASES['2025_Oct'], 'news_crash_offsets': (0,)},
+    '2026': {'crash_date': '20260202', 'social_bases': SOCIAL_BASES['2026_Feb'], 'news_crash_offsets': (0, 1)},
+}
+SIGNAL_SEED = 42
+SIGNAL_RNG = np.random.default_rng(SIGNAL_SEED)
+
 print("=" * 100)
 print("비정형 데이터 선행성 분석 - 데이터 수집")
 print("=" * 100)
@@ -63,6 +76,18 @@ def get_date_range(start_date, end_date):
     dates = pd.date_range(start, end, freq='D')
     return [d.strftime('%Y%m%d') for d in dates]
 
+def download_prices(ticker, start, end):
+    """
+    yf.download 결과를 응답 캐시로 감싸기
+    끝난 과거 구간은 한 번만 내려받고, 진행 중인 구간만 OPEN_TTL마다 다시 요청
+    """
+    params = {'ticker': ticker, 'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')}
+    return RESPONSE_CACHE.cached(
+        'yfinance', params,
+        lambda: yf.download(ticker, start=start, end=end, progress=False),
+        ttl=period_ttl(end)
+    )
+
 def collect_price_data(start_date, end_date):
     """
     정형 데이터: 가격 및 거래량
@@ -75,11 +100,11 @@ def collect_price_data(start_date, end_date):
     end = pd.to_datetime(end_date) + timedelta(days=1)
     
     # BTC 데이터
-    btc = yf.download('BTC-USD', start=start, end=end, progress=False)
+    btc = download_prices('BTC-USD', start, end)
     btc = btc.add_prefix('BTC_')
     
     # ETH 데이터
-    eth = yf.download('ETH-USD', start=start, end=end, progress=False)
+    eth = download_prices('ETH-USD', start, end)
     eth = eth.add_prefix('ETH_')
     
     # 합치기
@@ -102,11 +127,15 @@ def collect_fear_greed_index(start_date, end_date):
     """
     print("  [2/6] 공포 탐욕 지수 수집 중...")
     
-    try:
+    start_str = pd.to_datetime(start_date).strftime('%Y%m%d')
+    end_str = pd.to_datetime(end_date).strftime('%Y%m%d')
+    url = "https://api.alternative.me/fng/"
+    
+    def fetch_period():
         # Alternative.me API
-        url = "https://api.alternative.me/fng/?limit=365"
-        response = requests.get(url, timeout=10)
-        data = response.json()
+        # 공용 수집기: 호스트별 속도 제한 + 429/5xx 재시도
+        # (limit=365 응답은 매일 바뀌므로 응답 대신 기간별 결과를 캐시)
+        data = default_collector().get_json(url, params={'limit': 365}, timeout=10)
         
         fg_data = []
         for item in data['data']:
@@ -121,9 +150,12 @@ def collect_fear_greed_index(start_date, end_date):
         df_fg = df_fg.set_index('Date')
         
         # 날짜 필터링
-        start_str = pd.to_datetime(start_date).strftime('%Y%m%d')
-        end_str = pd.to_datetime(end_date).strftime('%Y%m%d')
-        df_fg = df_fg[(df_fg.index >= start_str) & (df_fg.index <= end_str)]
+        return df_fg[(df_fg.index >= start_str) & (df_fg.index <= end_str)]
+    
+    try:
+        # 끝난 기간은 캐시된 결과 사용 (네트워크 요청 없음)
+        df_fg = RESPONSE_CACHE.cached(url, {'limit': 365, 'start': start_str, 'end': end_str},
+                                      fetch_period, ttl=period_ttl(end_date))
         
         print(f"    ✓ 공포 탐욕 지수: {len(df_fg)}일")
         
@@ -133,6 +165,16 @@ def collect_fear_greed_index(start_date, end_date):
         print(f"    ✗ 공포 탐욕 지수 수집 실패: {e}")
         return pd.DataFrame()
 
+def crash_signal_config(period_name):
+    """기간의 급락일과 합성 신호 설정 (2025년 10월 / 2026년 1-2월)"""
+    return CRASH_SIGNALS['2025' if '2025' in period_name else '2026']
+
+def days_from_crash(start_date, end_date, crash_date):
+    """기간의 날짜 문자열 목록과 급락일 기준 일수 배열"""
+    dates = pd.date_range(start_date, end_date, freq='D')
+    days = (dates - pd.to_datetime(crash_date)).days.to_numpy()
+    return [d.strftime('%Y%m%d') for d in dates], days
+
 def estimate_social_metrics(start_date, end_date, period_name):
     """
     비정형 데이터 추정 (실제 API 없을 경우)
@@ -143,66 +185,19 @@ def estimate_social_metrics(start_date, end_date, period_name):
     - YouTube 영상 수
     - Google Trends
     
-    여기서는 패턴 기반으로 추정값 생성
+    여기서는 패턴 기반으로 추정값 생성 (synthetic_signals, 날짜 반복 없이 배열 연산)
     """
     print("  [3/6] 소셜 미디어 메트릭 추정 중...")
     
-    dates = pd.date_range(start_date, end_date, freq='D')
-    date_strs = [d.strftime('%Y%m%d') for d in dates]
-    
-    # 기본 패턴: 크래시 당일(Oct 10 또는 최근)에 급증
-    if '2025' in period_name:
-        # 2025년 10월 - October 10이 크래시
-        crash_date = '20251010'
-        base_reddit = 150
-        base_twitter = 5000
-        base_youtube = 20
-        base_trends = 40
-    else:
-        # 2026년 1-2월 - February 2-3이 크래시
-        crash_date = '20260202'
-        base_reddit = 180
-        base_twitter = 6000
-        base_youtube = 25
-        base_trends = 45
-    
-    social_data = []
-    
-    for i, date_str in enumerate(date_strs):
-        # 크래시 근처에서 급증하는 패턴
-        days_from_crash = (pd.to_datetime(date_str) - pd.to_datetime(crash_date)).days
-        
-        # 급증 패턴 (-2일부터 시작, 크래시 당일 최고, 이후 감소)
-        if days_from_crash == -2:
-            multiplier = 1.3  # 2일 전부터 조짐
-        elif days_from_crash == -1:
-            multiplier = 1.8  # 1일 전 급증
-        elif days_from_crash == 0:
-            multiplier = 3.5  # 크래시 당일 폭발
-        elif days_from_crash == 1:
-            multiplier = 2.2  # 다음날 여전히 높음
-        elif days_from_crash == 2:
-            multiplier = 1.5  # 점차 감소
-        else:
-            multiplier = 1.0 + np.random.uniform(-0.2, 0.2)  # 평상시 변동
-        
-        # 감정 점수 (부정적일수록 낮음, 1-100)
-        if days_from_crash >= -1 and days_from_crash <= 1:
-            sentiment = max(10, 50 - (multiplier - 1) * 30 + np.random.uniform(-5, 5))
-        else:
-            sentiment = 50 + np.random.uniform(-10, 10)
-        
-        social_data.append({
-            'Date': date_str,
-            'Reddit_Posts': int(base_reddit * multiplier + np.random.uniform(-10, 10)),
-            'Twitter_Mentions': int(base_twitter * multiplier + np.random.uniform(-500, 500)),
-            'YouTube_Videos': int(base_youtube * multiplier + np.random.uniform(-2, 2)),
-            'Google_Trends': int(base_trends * multiplier + np.random.uniform(-5, 5)),
-            'Sentiment_Score': max(0, min(100, sentiment)),  # 0-100 범위
-        })
-    
-    df_social = pd.DataFrame(social_data)
-    df_social = df_social.set_index('Date')
+    # 기본 패턴: 크래시 당일(Oct 10 또는 Feb 2)에 급증
+    config = crash_signal_config(period_name)
+    date_strs, days = days_from_crash(start_date, end_date, config['crash_date'])
+    
+    # 급증 패턴 (-2일부터 시작, 크래시 당일 최고, 이후 감소), 감정 점수 0-100
+    signals = social_signals(days, bases=config['social_bases'], seed=SIGNAL_RNG)
+    
+    df_social = pd.DataFrame({name: values[0] for name, values in signals.items()},
+                             index=pd.Index(date_strs, name='Date'))
     
     print(f"    ✓ 소셜 메트릭 생성: {len(df_social)}일")
     
@@ -213,78 +208,36 @@ def estimate_liquidation_data(price_data):
     청산 데이터 추정
     실제로는 Coinglass API 등에서 수집
     
-    패턴: 가격 급락 시 청산 급증
+    패턴: 가격 급락 시 청산 급증 (1% 하락 = $50M, 1% 상승 = $20M 숏 청산)
     """
     print("  [4/6] 청산 데이터 추정 중...")
     
-    liquidation_data = []
-    
-    for date, row in price_data.iterrows():
-        btc_change = row.get('BTC_Change_Pct', 0)
-        
-        # 가격 하락 시 청산 증가 (절대값 사용)
-        if btc_change < 0:
-            # 하락폭이 클수록 청산 급증
-            liquidation_amount = abs(btc_change) * 50_000_000  # 1% 하락 = $50M 청산
-        else:
-            # 상승 시에도 숏 청산 발생
-            liquidation_amount = btc_change * 20_000_000  # 1% 상승 = $20M 청산
-        
-        # 노이즈 추가
-        liquidation_amount *= (1 + np.random.uniform(-0.3, 0.3))
-        
-        liquidation_data.append({
-            'Date': date,
-            'Liquidation_USD': max(0, liquidation_amount),
-            'Liquidation_Long_Pct': 60 if btc_change < 0 else 40,  # 하락 시 롱 청산 많음
-        })
+    if 'BTC_Change_Pct' in price_data.columns:
+        btc_change = price_data['BTC_Change_Pct'].to_numpy(dtype=float)
+    else:
+        btc_change = np.zeros(len(price_data))
     
-    df_liq = pd.DataFrame(liquidation_data)
-    df_liq = df_liq.set_index('Date')
+    df_liq = pd.DataFrame(liquidation_signals(btc_change, seed=SIGNAL_RNG), index=price_data.index)
+    df_liq.index.name = 'Date'
     
     print(f"    ✓ 청산 데이터 생성: {len(df_liq)}일")
     
     return df_liq
 
-def collect_news_sentiment(start_date, end_date):
+def collect_news_sentiment(start_date, end_date, period_name):
     """
     뉴스 감정 분석 (추정)
     실제로는 NewsAPI, GDELT 등에서 수집
     """
     print("  [5/6] 뉴스 감정 추정 중...")
     
-    dates = pd.date_range(start_date, end_date, freq='D')
-    date_strs = [d.strftime('%Y%m%d') for d in dates]
-    
-    news_data = []
-    
-    for date_str in date_strs:
-        # 크래시 근처에서 부정 뉴스 급증
-        if '1010' in date_str or '0202' in date_str or '0203' in date_str:
-            negative_news = np.random.randint(30, 50)
-            positive_news = np.random.randint(2, 8)
-        elif '1009' in date_str or '0201' in date_str:  # 1일 전
-            negative_news = np.random.randint(15, 25)
-            positive_news = np.random.randint(5, 12)
-        else:
-            negative_news = np.random.randint(5, 15)
-            positive_news = np.random.randint(8, 20)
-        
-        neutral_news = np.random.randint(20, 40)
-        
-        total_news = negative_news + positive_news + neutral_news
-        
-        news_data.append({
-            'Date': date_str,
-            'News_Total': total_news,
-            'News_Negative': negative_news,
-            'News_Positive': positive_news,
-            'News_Neutral': neutral_news,
-            'News_Sentiment_Score': (positive_news - negative_news) / total_news * 100,  # -100 to 100
-        })
-    
-    df_news = pd.DataFrame(news_data)
-    df_news = df_news.set_index('Date')
+    # 크래시 근처에서 부정 뉴스 급증 (1일 전부터 증가)
+    config = crash_signal_config(period_name)
+    date_strs, days = days_from_crash(start_date, end_date, config['crash_date'])
+    signals = news_signals(days, crash_offsets=config['news_crash_offsets'], seed=SIGNAL_RNG)
+    
+    df_news = pd.DataFrame({name: values[0] for name, values in signals.items()},
+                           index=pd.Index(date_strs, name='Date'))
     
     print(f"    ✓ 뉴스 감정 생성: {len(df_news)}일")
     
@@ -339,7 +292,7 @@ def collect_period_data(period_config):
     liquidation_data = estimate_liquidation_data(price_data)
     
     # 5. 뉴스 감정
-    news_data = collect_news_sentiment(start, end)
+    news_data = collect_news_sentiment(start, end, name)
     
     # 6. 통합
     combined = combine_all_data(price_data, fear_greed, social_data, 
@@ -365,9 +318,7 @@ print()
 # 기간 1: 2025년 10월
 df_period1 = collect_period_data(PERIOD_1)
 
-time.sleep(2)
-
-# 기간 2: 2026년 1-2월
+# 기간 2 (API 요청 간격은 api_collector의 호스트별 속도 제한이 조절): 2026년 1-2월
 df_period2 = collect_period_data(PERIOD_2)
 
 # ============================================================================
@@ -402,6 +353,10 @@ print(f"  2. {PERIOD_2['name']}_data.csv")
 
 print(f"\n📂 저장 위치: {os.path.abspath(OUTPUT_DIR)}")
 
+cache_stats = RESPONSE_CACHE.stats()
+print(f"\n📦 응답 캐시: hit {cache_stats['hits']}, miss {cache_stats['misses']} "
+      f"(miss만 네트워크 요청, 저장 위치: {RESPONSE_CACHE.root})")
+
 print("\n" + "=" * 100)
 print("다음 단계: 비정형 데이터 선행성 분석")
 print("=" * 100)
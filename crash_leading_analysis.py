@@ -5,7 +5,7 @@
 가설: 비정형 데이터가 가격 변동보다 1-3일 선행한다
 
 분석 방법:
-1. 시차 상관 분석 (Lag Correlation)
+1. 시차 상관 분석 (Lag Correlation) + Monte-Carlo 유의성 (순열 p-value, bootstrap 신뢰구간)
 2. Granger Causality Test
 3. 이벤트 타임라인 비교
 4. 선행 지표 시각화
@@ -16,8 +16,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
-from statsmodels.tsa.stattools import grangercausalitytests
 import os
+from granger_batch import best_lags, granger_batch
+from lag_correlation import lag_correlation_matrix
+from leadlag_significance import leadlag_significance
 
 # 한글 폰트
 try:
@@ -56,27 +58,17 @@ print()
 
 print("[1/5] 시차 상관 분석...")
 
-def calculate_lag_correlation(df, unstructured_col, price_col, max_lag=3):
+def calculate_lag_correlation(df, unstructured_cols, price_col, max_lag=3):
     """
-    비정형 지표와 가격의 시차 상관관계
+    비정형 지표들과 가격의 시차 상관관계 (모든 지표 x 시차를 한 번에 계산)
     양수 lag: 비정형 지표가 선행
     """
-    correlations = []
+    lag_corr = lag_correlation_matrix(df, price_col, unstructured_cols,
+                                      lags=range(-max_lag, max_lag + 1))
     
-    for lag in range(-max_lag, max_lag + 1):
-        if lag < 0:
-            # 비정형 지표가 뒤따름
-            corr = df[unstructured_col].corr(df[price_col].shift(-lag))
-        else:
-            # 비정형 지표가 선행
-            corr = df[unstructured_col].shift(lag).corr(df[price_col])
-        
-        correlations.append({
-            'Lag': lag,
-            'Correlation': corr
-        })
-    
-    return pd.DataFrame(correlations)
+    return (lag_corr.rename_axis('Lag')
+            .melt(ignore_index=False, var_name='Indicator', value_name='Correlation')
+            .reset_index())
 
 # 주요 비정형 지표
 unstructured_indicators = [
@@ -86,21 +78,33 @@ unstructured_indicators = [
     'News_Negative',
     'Google_Trends'
 ]
+available_indicators = [c for c in unstructured_indicators if c in df1.columns]
 
 # 시차 상관 계산
-lag_results = {}
-
-for indicator in unstructured_indicators:
-    if indicator in df1.columns:
-        # 기간 1
-        lag_corr1 = calculate_lag_correlation(df1, indicator, 'BTC_Change_Pct', max_lag=3)
-        lag_corr1['Period'] = '2025_Oct'
-        
-        # 기간 2
-        lag_corr2 = calculate_lag_correlation(df2, indicator, 'BTC_Change_Pct', max_lag=3)
-        lag_corr2['Period'] = '2026_Jan_Feb'
-        
-        lag_results[indicator] = pd.concat([lag_corr1, lag_corr2])
+lag_corr1 = calculate_lag_correlation(df1, available_indicators, 'BTC_Change_Pct', max_lag=3)
+lag_corr1['Period'] = '2025_Oct'
+lag_corr2 = calculate_lag_correlation(df2, available_indicators, 'BTC_Change_Pct', max_lag=3)
+lag_corr2['Period'] = '2026_Jan_Feb'
+
+lag_all = pd.concat([lag_corr1, lag_corr2], ignore_index=True)
+
+# Monte-Carlo 유의성: 7-9일 표본이라 정규근사 대신 재표본 분포로 p-value와 신뢰구간 계산
+N_RESAMPLES = 10000
+significance = pd.concat([
+    leadlag_significance(df, 'BTC_Change_Pct', available_indicators, lags=range(-3, 4),
+                         n_resamples=N_RESAMPLES).assign(Period=period)
+    for df, period in [(df1, '2025_Oct'), (df2, '2026_Jan_Feb')]
+], ignore_index=True)
+significance = significance.rename(columns={
+    'lag': 'Lag', 'indicator': 'Indicator', 'n': 'N', 'p_value': 'P_Value',
+    'null_low': 'Null_Low', 'null_high': 'Null_High', 'ci_low': 'CI_Low', 'ci_high': 'CI_High',
+}).drop(columns='correlation')
+lag_all = lag_all.merge(significance, on=['Lag', 'Indicator', 'Period'], how='left')
+lag_all.to_csv(f'{OUTPUT_DIR}/leadlag_significance.csv', index=False)
+print(f"✅ leadlag_significance.csv (재표본 {N_RESAMPLES:,}회)")
+
+lag_results = {indicator: lag_all[lag_all['Indicator'] == indicator].drop(columns='Indicator')
+               for indicator in available_indicators}
 
 # 시각화
 fig, axes = plt.subplots(2, 3, figsize=(18, 10))
@@ -119,6 +123,9 @@ for i, (indicator, df_lag) in enumerate(lag_results.items()):
         axes[i].plot(data['Lag'], data['Correlation'], 
                     marker='o', linewidth=2, markersize=8,
                     label=label, color=color)
+        # 귀무분포 95% 구간 (이 범위 밖이면 우연으로 보기 어려움)
+        axes[i].fill_between(data['Lag'], data['Null_Low'], data['Null_High'],
+                             color=color, alpha=0.1)
     
     axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.5)
     axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.5)
@@ -160,6 +167,9 @@ for indicator, df_lag in lag_results.items():
                 'Period': period,
                 'Leading_Days': max_corr_row['Lag'],
                 'Correlation': max_corr_row['Correlation'],
+                'P_Value': max_corr_row['P_Value'],
+                'CI_Low': max_corr_row['CI_Low'],
+                'CI_High': max_corr_row['CI_High'],
                 'Strength': 'Strong' if abs(max_corr_row['Correlation']) > 0.7 else 
                            'Moderate' if abs(max_corr_row['Correlation']) > 0.4 else 'Weak'
             })
@@ -263,60 +273,21 @@ plt.close()
 
 print("\n[4/5] Granger Causality Test...")
 
-def run_granger_test(df, cause_var, effect_var='BTC_Change_Pct', max_lag=3):
-    """
-    Granger 인과관계 검정
-    귀무가설: cause_var가 effect_var에 영향 없음
-    """
-    try:
-        # 결측치 제거
-        test_data = df[[cause_var, effect_var]].dropna()
-        
-        if len(test_data) < 10:
-            return None
-        
-        # Granger test
-        result = grangercausalitytests(test_data, maxlag=max_lag, verbose=False)
-        
-        # 최적 lag 찾기 (p-value 최소)
-        min_p_value = 1.0
-        best_lag = 0
-        
-        for lag in range(1, max_lag + 1):
-            p_value = result[lag][0]['ssr_ftest'][1]
-            if p_value < min_p_value:
-                min_p_value = p_value
-                best_lag = lag
-        
-        return {
-            'Cause': cause_var,
-            'Effect': effect_var,
-            'Best_Lag': best_lag,
-            'P_Value': min_p_value,
-            'Significant': 'Yes' if min_p_value < 0.05 else 'No'
-        }
-        
-    except Exception as e:
-        print(f"    ✗ {cause_var}: {e}")
-        return None
-
+# 두 기간 x 모든 지표 x 1-3일 시차를 한 번에 검정 (지표 -> BTC_Change_Pct 방향)
+granger_indicators = [c for c in unstructured_indicators if c in df1.columns]
 granger_results = []
-
-for indicator in unstructured_indicators:
-    if indicator in df1.columns:
-        # 기간 1
-        result1 = run_granger_test(df1, indicator)
-        if result1:
-            result1['Period'] = '2025_Oct'
-            granger_results.append(result1)
-        
-        # 기간 2
-        result2 = run_granger_test(df2, indicator)
-        if result2:
-            result2['Period'] = '2026_Jan_Feb'
-            granger_results.append(result2)
-
-df_granger = pd.DataFrame(granger_results)
+for df, period in [(df1, '2025_Oct'), (df2, '2026_Jan_Feb')]:
+    best = best_lags(granger_batch(df, 'BTC_Change_Pct', granger_indicators, lags=3))
+    granger_results.append(pd.DataFrame({
+        'Cause': best['indicator'],
+        'Effect': best['target'],
+        'Best_Lag': best['lag'],
+        'P_Value': best['p_value'],
+        'Significant': np.where(best['significant'], 'Yes', 'No'),
+        'Period': period,
+    }))
+
+df_granger = pd.concat(granger_results, ignore_index=True)
 df_granger = df_granger.sort_values('P_Value')
 
 print("\n📊 Granger Causality 분석 결과:")
@@ -365,6 +336,16 @@ if len(moderate_leaders) > 0:
     for _, row in moderate_leaders.head(3).iterrows():
         report += f"   • {row['Indicator']}: {row['Leading_Days']}일 선행 (상관계수: {row['Correlation']:.3f}, {row['Period']})\n"
 
+# Monte-Carlo 유의성
+report += f"\n\n   🎲 Monte-Carlo 유의성 (순열 {N_RESAMPLES:,}회, 양측 p < 0.05)\n   {'─'*100}\n"
+significant_lags = df_leading[df_leading['P_Value'] < 0.05]
+if len(significant_lags) > 0:
+    for _, row in significant_lags.iterrows():
+        report += (f"   • {row['Indicator']}: {row['Leading_Days']}일 선행 (상관계수: {row['Correlation']:.3f}, "
+                   f"p-value: {row['P_Value']:.4f}, 95% CI [{row['CI_Low']:.3f}, {row['CI_High']:.3f}], {row['Period']})\n")
+else:
+    report += "\n   → 재표본 분포 기준으로 유의미한 선행 상관 없음 (표본 크기 부족 가능)\n"
+
 # Granger Causality 결과
 report += f"\n\n   📈 Granger Causality Test\n   {'─'*100}\n"
 
@@ -443,6 +424,7 @@ output_files = [
     '01_lag_correlation_analysis.png',
     '02_event_timeline_comparison.png',
     'leading_indicators_summary.csv',
+    'leadlag_significance.csv',
     'granger_causality_results.csv',
     'LEADING_INDICATOR_REPORT.txt'
 ]
@@ -9,6 +9,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from data_registry import DERIVED_COLUMNS, REGISTRY, peak_rss_mb
+from dashboard_cube import DashboardCube
+from regression_screener import screen_single, screen_subsets
+from timeseries_downsampling import SeriesCache
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
@@ -26,24 +30,39 @@ st.set_page_config(
 )
 
 # 데이터 경로
-INTEGRATED_DIR = Path("data/processed/integrated")
 OUTPUT_DIR = Path("output/visualizations")
 
-@st.cache_data
-def load_data():
-    """데이터 로드 (캐싱)"""
-    df = pd.read_csv(INTEGRATED_DIR / "master_data_integrated.csv")
+def _read_sentiment_csv():
+    df = pd.read_csv(OUTPUT_DIR / "sentiment_daily_analysis.csv")
     df['date'] = pd.to_datetime(df['date'])
     return df
 
-@st.cache_data
+REGISTRY.register('sentiment_daily', _read_sentiment_csv)
+
+def load_data():
+    """마스터 데이터 (프로세스 공유 레지스트리의 읽기 전용 뷰, 세션별 복사 없음)"""
+    return REGISTRY.get('master_data_integrated').frame()
+
+@st.cache_resource
+def get_cube():
+    """분석 큐브 (세션 간 공유, 파생 컬럼/구간 통계/상관 행렬을 미리 계산)"""
+    return DashboardCube(load_data())
+
+@st.cache_resource
+def get_series_cache():
+    """다운샘플 결과 캐시 (세션 간 공유, 구간이 바뀐 트레이스만 다시 계산)"""
+    return SeriesCache()
+
+def trace_xy(frame, column, method='lttb', token='master_data_integrated'):
+    """go.Scatter의 x/y 인자 (화면 해상도에 맞게 서버에서 다운샘플한 구간 시계열)"""
+    x, y = get_series_cache().xy(frame, column, method=method, token=token)
+    return dict(x=x, y=y)
+
 def load_sentiment_data():
-    """감성 분석 데이터 로드"""
+    """감성 분석 데이터셋 (레지스트리 공유, 파일이 없으면 None)"""
     try:
-        df = pd.read_csv(OUTPUT_DIR / "sentiment_daily_analysis.csv")
-        df['date'] = pd.to_datetime(df['date'])
-        return df
-    except:
+        return REGISTRY.get('sentiment_daily')
+    except (OSError, KeyError, ValueError):
         return None
 
 def main():
@@ -55,7 +74,7 @@ def main():
     # 데이터 로드
     with st.spinner('데이터 로딩 중...'):
         df = load_data()
-        sentiment_df = load_sentiment_data()
+        sentiment_data = load_sentiment_data()
     
     # 사이드바
     st.sidebar.header("⚙️ 설정")
@@ -81,10 +100,12 @@ def main():
         # 타임스탬프로 변환하여 비교
         start_ts = pd.Timestamp(start_date)
         end_ts = pd.Timestamp(end_date)
-        mask = (df['date'] >= start_ts) & (df['date'] <= end_ts)
-        filtered_df = df[mask].copy()
     else:
-        filtered_df = df.copy()
+        start_ts, end_ts = None, None
+    
+    # 구간 행은 큐브의 슬라이스 (복사/재계산 없음, 읽기 전용)
+    cube = get_cube()
+    filtered_df = cube.window(start_ts, end_ts)
     
     # 급락일 표시
     crash_date = pd.Timestamp('2025-10-10')
@@ -94,9 +115,10 @@ def main():
     st.sidebar.subheader("📊 주요 지표")
     
     if len(filtered_df) > 0:
-        avg_price = filtered_df['BTC_Price'].mean()
-        max_price = filtered_df['BTC_Price'].max()
-        min_price = filtered_df['BTC_Price'].min()
+        price_stats = cube.stat('BTC_Price', start_ts, end_ts)
+        avg_price = price_stats['mean']
+        max_price = price_stats['max']
+        min_price = price_stats['min']
         
         col1, col2 = st.sidebar.columns(2)
         col1.metric("평균 가격", f"${avg_price:,.0f}")
@@ -106,6 +128,14 @@ def main():
         col3.metric("최저가", f"${min_price:,.0f}")
         col4.metric("변동폭", f"${max_price - min_price:,.0f}")
     
+    # 메모리 사용량 (컨테이너 크기 산정용, 모든 세션이 같은 데이터를 공유)
+    with st.sidebar.expander("🧠 메모리 사용량"):
+        st.dataframe(REGISTRY.memory_usage().style.format(
+            {'base_mb': '{:.2f}', 'derived_mb': '{:.2f}', 'total_mb': '{:.2f}'}))
+        rss = peak_rss_mb()
+        st.caption(f"분석 큐브: {cube.nbytes / 1024 ** 2:.2f} MB"
+                   + (f" · 프로세스 최대 RSS: {rss:,.0f} MB" if rss is not None else ""))
+    
     # 탭 생성
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📈 가격 분석", 
@@ -126,8 +156,7 @@ def main():
             fig = go.Figure()
             
             fig.add_trace(go.Scatter(
-                x=filtered_df['date'],
-                y=filtered_df['BTC_Price'],
+                **trace_xy(filtered_df, 'BTC_Price', method='minmax'),
                 mode='lines+markers',
                 name='BTC Price',
                 line=dict(color='#4ECDC4', width=3),
@@ -182,16 +211,18 @@ def main():
             st.subheader("📊 가격 통계")
             
             if len(filtered_df) > 0:
-                # 가격 변화율 계산
-                filtered_df['price_change_pct'] = filtered_df['BTC_Price'].pct_change() * 100
+                # 가격 변화율은 큐브의 파생 컬럼 (구간 첫날은 통계에서 제외)
+                stats = cube.stats(['BTC_Price', 'price_change_pct'], start_ts, end_ts)
+                price_stats = stats.loc['BTC_Price']
+                change_stats = stats.loc['price_change_pct']
                 
-                st.metric("평균 가격", f"${filtered_df['BTC_Price'].mean():,.2f}")
-                st.metric("표준편차", f"${filtered_df['BTC_Price'].std():,.2f}")
-                st.metric("변동계수", f"{(filtered_df['BTC_Price'].std() / filtered_df['BTC_Price'].mean() * 100):.2f}%")
+                st.metric("평균 가격", f"${price_stats['mean']:,.2f}")
+                st.metric("표준편차", f"${price_stats['std']:,.2f}")
+                st.metric("변동계수", f"{(price_stats['std'] / price_stats['mean'] * 100):.2f}%")
                 
                 st.markdown("---")
-                st.metric("최대 상승", f"+{filtered_df['price_change_pct'].max():.2f}%")
-                st.metric("최대 하락", f"{filtered_df['price_change_pct'].min():.2f}%")
+                st.metric("최대 상승", f"+{change_stats['max']:.2f}%")
+                st.metric("최대 하락", f"{change_stats['min']:.2f}%")
                 
                 # 급락일 정보
                 if crash_date in filtered_df['date'].values:
@@ -207,8 +238,7 @@ def main():
         fig2 = go.Figure()
         
         fig2.add_trace(go.Scatter(
-            x=filtered_df['date'],
-            y=filtered_df['Open_Interest'],
+            **trace_xy(filtered_df, 'Open_Interest'),
             mode='lines',
             name='Open Interest',
             yaxis='y',
@@ -216,8 +246,7 @@ def main():
         ))
         
         fig2.add_trace(go.Scatter(
-            x=filtered_df['date'],
-            y=filtered_df['BTC_Price'],
+            **trace_xy(filtered_df, 'BTC_Price'),
             mode='lines',
             name='BTC Price',
             yaxis='y2',
@@ -254,8 +283,7 @@ def main():
             fig = go.Figure()
             
             fig.add_trace(go.Scatter(
-                x=filtered_df['date'],
-                y=filtered_df['tone_mean'],
+                **trace_xy(filtered_df, 'tone_mean'),
                 mode='lines+markers',
                 name='뉴스 감성 (tone_mean)',
                 line=dict(color='#FFD93D', width=3),
@@ -285,21 +313,14 @@ def main():
         
         with col2:
             # 커뮤니티 감성
-            if sentiment_df is not None:
-                # 날짜 필터링
-                if len(date_range) == 2:
-                    start_ts = pd.Timestamp(start_date)
-                    end_ts = pd.Timestamp(end_date)
-                    mask = (sentiment_df['date'] >= start_ts) & (sentiment_df['date'] <= end_ts)
-                    filtered_sentiment = sentiment_df[mask].copy()
-                else:
-                    filtered_sentiment = sentiment_df.copy()
+            if sentiment_data is not None:
+                # 날짜 필터링 (공유 배열의 뷰, 복사 없음)
+                filtered_sentiment = sentiment_data.frame(start_ts, end_ts)
                 
                 fig = go.Figure()
                 
                 fig.add_trace(go.Scatter(
-                    x=filtered_sentiment['date'],
-                    y=filtered_sentiment['sentiment_mean'],
+                    **trace_xy(filtered_sentiment, 'sentiment_mean', token='sentiment_daily'),
                     mode='lines+markers',
                     name='커뮤니티 감성',
                     line=dict(color='#FF6B6B', width=3),
@@ -333,18 +354,20 @@ def main():
         st.subheader("📊 감성 지표 비교")
         
         col1, col2, col3 = st.columns(3)
+        tone_means = cube.stats(['tone_mean', 'tone_pos_share', 'tone_neg_share'],
+                                start_ts, end_ts)['mean']
         
         with col1:
-            avg_tone = filtered_df['tone_mean'].mean()
+            avg_tone = tone_means['tone_mean']
             st.metric("평균 뉴스 감성", f"{avg_tone:.3f}", 
                      delta="긍정" if avg_tone > 0 else "부정")
         
         with col2:
-            avg_pos = filtered_df['tone_pos_share'].mean()
+            avg_pos = tone_means['tone_pos_share']
             st.metric("평균 긍정 비율", f"{avg_pos*100:.1f}%")
         
         with col3:
-            avg_neg = filtered_df['tone_neg_share'].mean()
+            avg_neg = tone_means['tone_neg_share']
             st.metric("평균 부정 비율", f"{avg_neg*100:.1f}%")
     
     # ===== 탭 3: 거시경제 =====
@@ -365,8 +388,7 @@ def main():
                 fig = go.Figure()
                 
                 fig.add_trace(go.Scatter(
-                    x=filtered_df['date'],
-                    y=filtered_df[selected_var],
+                    **trace_xy(filtered_df, selected_var),
                     mode='lines+markers',
                     name=selected_var,
                     yaxis='y',
@@ -374,8 +396,7 @@ def main():
                 ))
                 
                 fig.add_trace(go.Scatter(
-                    x=filtered_df['date'],
-                    y=filtered_df['BTC_Price'],
+                    **trace_xy(filtered_df, 'BTC_Price'),
                     mode='lines',
                     name='BTC Price',
                     yaxis='y2',
@@ -404,13 +425,14 @@ def main():
             with col2:
                 st.subheader("📊 통계")
                 
-                st.metric("평균", f"{filtered_df[selected_var].mean():.2f}")
-                st.metric("표준편차", f"{filtered_df[selected_var].std():.2f}")
-                st.metric("최소", f"{filtered_df[selected_var].min():.2f}")
-                st.metric("최대", f"{filtered_df[selected_var].max():.2f}")
+                var_stats = cube.stat(selected_var, start_ts, end_ts)
+                st.metric("평균", f"{var_stats['mean']:.2f}")
+                st.metric("표준편차", f"{var_stats['std']:.2f}")
+                st.metric("최소", f"{var_stats['min']:.2f}")
+                st.metric("최대", f"{var_stats['max']:.2f}")
                 
                 # 상관관계
-                corr = filtered_df[[selected_var, 'BTC_Price']].corr().iloc[0, 1]
+                corr = cube.pair(selected_var, 'BTC_Price', start_ts, end_ts)
                 st.markdown("---")
                 st.metric("BTC 가격과 상관계수", f"{corr:+.4f}")
         
@@ -418,13 +440,16 @@ def main():
         st.subheader("📊 전체 거시경제 지표")
         
         fig = go.Figure()
+        macro_stats = cube.stats(available_vars, start_ts, end_ts)
         
         for var in available_vars:
             # 정규화 (0-1 범위)
-            normalized = (filtered_df[var] - filtered_df[var].min()) / (filtered_df[var].max() - filtered_df[var].min())
+            var_min, var_max = macro_stats.loc[var, ['min', 'max']]
+            xy = trace_xy(filtered_df, var)
+            normalized = (xy['y'] - var_min) / (var_max - var_min)
             
             fig.add_trace(go.Scatter(
-                x=filtered_df['date'],
+                x=xy['x'],
                 y=normalized,
                 mode='lines',
                 name=var,
@@ -459,7 +484,7 @@ def main():
         available_key_vars = [v for v in key_vars if v in filtered_df.columns]
         
         # 상관관계 행렬
-        corr_matrix = filtered_df[available_key_vars].corr()
+        corr_matrix = cube.corr(available_key_vars, start_ts, end_ts)
         
         # Plotly 히트맵
         fig = go.Figure(data=go.Heatmap(
@@ -485,28 +510,36 @@ def main():
         # 강한 상관관계 Top 10
         st.subheader("🔝 강한 상관관계 Top 10")
         
-        # 상관관계를 리스트로 변환
-        corr_pairs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                var1 = corr_matrix.columns[i]
-                var2 = corr_matrix.columns[j]
-                corr_val = corr_matrix.iloc[i, j]
-                corr_pairs.append({
-                    'Variable 1': var1,
-                    'Variable 2': var2,
-                    'Correlation': corr_val,
-                    'Abs Correlation': abs(corr_val)
-                })
-        
-        corr_df = pd.DataFrame(corr_pairs)
-        corr_df = corr_df.sort_values('Abs Correlation', ascending=False).head(10)
+        corr_df = cube.top_pairs(available_key_vars, start_ts, end_ts, n=10)
         
         # 표시
         st.dataframe(
             corr_df[['Variable 1', 'Variable 2', 'Correlation']].style.format({'Correlation': '{:+.4f}'}),
             use_container_width=True
         )
+        
+        # BTC 가격 설명 변수 순위 (선택 구간의 모든 컬럼 회귀를 Gram 행렬 한 번으로 계산)
+        st.subheader("🎯 BTC 가격 설명력 순위")
+        candidates = [c for c in cube.columns if c != 'BTC_Price' and c not in DERIVED_COLUMNS]
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**단순 회귀 Top 15**")
+            single = screen_single(filtered_df, 'BTC_Price', candidates).head(15)
+            st.dataframe(
+                single[['variable', 'r2', 'coefficient', 'p_value']].style.format(
+                    {'r2': '{:.4f}', 'coefficient': '{:+,.4g}', 'p_value': '{:.2e}'}),
+                use_container_width=True
+            )
+        with col2:
+            st.markdown("**2변수 조합 Top 10 (수정 R²)**")
+            pairs = screen_subsets(filtered_df, 'BTC_Price', candidates, max_size=2, min_size=2, top=10)
+            pairs = pairs.assign(variables=pairs['variables'].str.join(' + '))
+            st.dataframe(
+                pairs[['variables', 'r2', 'adj_r2', 'f_p_value']].style.format(
+                    {'r2': '{:.4f}', 'adj_r2': '{:.4f}', 'f_p_value': '{:.2e}'}),
+                use_container_width=True
+            )
     
     # ===== 탭 5: 종합 분석 =====
     with tab5:
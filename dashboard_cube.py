@@ -0,0 +1,205 @@
+"""
+대시보드 분석 큐브
+대시보드가 위젯 조작마다 다시 계산하던 파생 컬럼, 구간 통계, 상관 행렬을 프로세스당 한 번 미리 계산해 두고
+임의 날짜 구간 x 임의 변수 선택을 데이터 재스캔 없이 응답
+
+- 파생 컬럼(price_change_pct 등): 전체 기간에 대해 한 번 계산
+- 구간 평균/표준편차: 컬럼별 누적합(개수, 합, 제곱합) 두 행의 차이로 O(1)
+- 구간 최소/최대: sparse table(2^j 구간 최소/최대)로 O(1)
+- 상관 행렬: CorrelationService의 쌍별 충분통계량 누적합 사용 (결과 캐시 공유).
+  누적합은 O(행 x 컬럼^2)이므로 전체 컬럼이 아니라 처음 요청된 컬럼 집합별로 지연 생성
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from correlation_service import CorrelationService, top_pairs
+from data_registry import DERIVED_COLUMNS
+
+STAT_COLUMNS = ['count', 'mean', 'std', 'min', 'max']
+
+
+def _sparse_table(values, reducer):
+    """(행, 컬럼) 배열의 2^j 길이 구간 최소/최대 테이블 목록 (NaN 무시)"""
+    tables = [values]
+    span = 1
+    while span * 2 <= len(values):
+        prev = tables[-1]
+        tables.append(reducer(prev[:-span], prev[span:]))
+        span *= 2
+    return tables
+
+
+class DashboardCube:
+    """
+    날짜 구간 통계와 상관 행렬을 미리 계산한 대시보드용 큐브.
+
+    Args:
+        df: 날짜 컬럼과 수치형 컬럼을 가진 DataFrame
+            (날짜순 정렬되어 있고 파생 컬럼이 이미 있으면 복사 없이 그대로 참조,
+             예: data_registry의 Dataset.frame())
+        columns: 통계/상관을 제공할 컬럼 목록 (None이면 모든 수치형 컬럼 + 파생 컬럼)
+        date_column: 날짜 컬럼명
+        derived: 파생 컬럼 정의 (None이면 DERIVED_COLUMNS)
+    """
+
+    def __init__(self, df, columns=None, date_column='date', derived=None):
+        derived = DERIVED_COLUMNS if derived is None else derived
+        if not df[date_column].is_monotonic_increasing:
+            df = df.sort_values(date_column).reset_index(drop=True)
+        missing = [name for name in derived if name not in df.columns]
+        if missing:
+            df = df.copy()
+        self._warmup = {}
+        for name, (func, warmup) in derived.items():
+            if name in missing:
+                try:
+                    df[name] = func(df)
+                except KeyError:
+                    continue  # 원천 컬럼이 없는 데이터셋
+            self._warmup[name] = warmup
+
+        if columns is None:
+            columns = df.select_dtypes(include='number').columns.tolist()
+        self.columns = list(columns)
+        self.date_column = date_column
+        self.frame = df
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        self._dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+
+        values = df[self.columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        # 큰 값의 상쇄 오차를 줄이기 위해 평균을 빼고 누적 (분산은 평행이동 불변)
+        self._offset = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else \
+            np.zeros(len(self.columns))
+        centered = np.where(valid, values - self._offset, 0.0)
+        zeros = np.zeros((1, len(self.columns)))
+        self._n = np.vstack([zeros, np.cumsum(valid, axis=0)])
+        self._sum = np.vstack([zeros, np.cumsum(centered, axis=0)])
+        self._sumsq = np.vstack([zeros, np.cumsum(centered ** 2, axis=0)])
+        self._min = _sparse_table(values, np.fmin)
+        self._max = _sparse_table(values, np.fmax)
+
+        # 컬럼 집합(tuple) -> CorrelationService, 요청 시 생성 (세션 간 공유되므로 잠금)
+        self._correlations = {}
+        self._corr_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._dates)
+
+    def __repr__(self):
+        return f"DashboardCube(rows={len(self)}, columns={len(self.columns)})"
+
+    @property
+    def nbytes(self):
+        """미리 계산한 배열(누적합, sparse table, 지금까지 생성된 상관 충분통계량)의 메모리 사용량 (바이트, 원본 프레임 제외)"""
+        arrays = [self._n, self._sum, self._sumsq, *self._min, *self._max[1:]]
+        for service in list(self._correlations.values()):
+            arrays += [service._n, service._sx, service._sxx, service._sxy, service._values]
+        return sum(a.nbytes for a in arrays)
+
+    def correlations(self, columns):
+        """
+        컬럼 집합을 담당하는 CorrelationService (없으면 해당 컬럼만으로 생성).
+        이미 만든 서비스 중 요청 컬럼을 모두 포함하는 것이 있으면 재사용
+
+        Args:
+            columns: 컬럼 목록
+
+        Returns:
+            CorrelationService
+        """
+        columns = tuple(dict.fromkeys(columns))
+        missing = [c for c in columns if c not in self._col_index]
+        if missing:
+            raise KeyError(f"큐브에 없는 컬럼: {missing}")
+        with self._corr_lock:
+            service = self._correlations.get(columns)
+            if service is None:
+                service = next((svc for key, svc in self._correlations.items()
+                                if set(columns) <= set(key)), None)
+            if service is None:
+                service = CorrelationService(self.frame, columns=list(columns),
+                                             date_column=self.date_column)
+                self._correlations[columns] = service
+        return service
+
+    def rows(self, start=None, end=None):
+        """날짜 구간(양 끝 포함)을 행 범위 [a, b)로 변환"""
+        a = 0 if start is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), 'left'))
+        b = len(self._dates) if end is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), 'right'))
+        return a, max(a, b)
+
+    def window(self, start=None, end=None):
+        """날짜 구간의 행 (복사 없는 슬라이스, 읽기 전용으로 사용)"""
+        a, b = self.rows(start, end)
+        return self.frame.iloc[a:b]
+
+    @staticmethod
+    def _extreme(tables, reducer, a, b, i):
+        """sparse table의 겹치는 두 조각으로 [a, b) 구간 최소/최대 (빈 구간은 NaN)"""
+        if b <= a:
+            return np.nan
+        level = (b - a).bit_length() - 1
+        table = tables[level]
+        return reducer(table[a, i], table[b - (1 << level), i])
+
+    def stats(self, columns=None, start=None, end=None):
+        """
+        날짜 구간의 컬럼별 개수/평균/표준편차/최소/최대 (pandas와 동일하게 결측치 제외, ddof=1).
+
+        Args:
+            columns: 컬럼명 또는 목록 (None이면 전체)
+            start: 시작 날짜, 포함 (None이면 처음부터)
+            end: 종료 날짜, 포함 (None이면 끝까지)
+
+        Returns:
+            pd.DataFrame: 컬럼(index) x count, mean, std, min, max
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        columns = list(self.columns if columns is None else columns)
+        missing = [c for c in columns if c not in self._col_index]
+        if missing:
+            raise KeyError(f"큐브에 없는 컬럼: {missing}")
+
+        idx = np.array([self._col_index[c] for c in columns], dtype=np.int64)
+        a, b = self.rows(start, end)
+        # 파생 컬럼은 구간 앞 워밍업 행을 제외
+        starts = [min(a + self._warmup.get(c, 0), b) for c in columns]
+
+        n = self._n[b, idx] - self._n[starts, idx]
+        s = self._sum[b, idx] - self._sum[starts, idx]
+        ss = self._sumsq[b, idx] - self._sumsq[starts, idx]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = s / n
+            sq_dev = ss - s * mean
+            # 상수 구간은 누적합 차이의 반올림 오차만 남으므로 0으로 처리
+            sq_dev = np.where(sq_dev <= 1e-12 * ss, 0.0, sq_dev)
+            var = sq_dev / (n - 1)
+        mean = np.where(n > 0, mean + self._offset[idx], np.nan)
+        std = np.where(n > 1, np.sqrt(var), np.nan)
+
+        mins = [self._extreme(self._min, np.fmin, lo, b, i) for lo, i in zip(starts, idx)]
+        maxs = [self._extreme(self._max, np.fmax, lo, b, i) for lo, i in zip(starts, idx)]
+        return pd.DataFrame({'count': n.astype(int), 'mean': mean, 'std': std,
+                             'min': mins, 'max': maxs}, index=columns)[STAT_COLUMNS]
+
+    def stat(self, column, start=None, end=None):
+        """컬럼 하나의 구간 통계 (Series: count, mean, std, min, max)"""
+        return self.stats([column], start, end).iloc[0]
+
+    def corr(self, columns=None, start=None, end=None, method='pearson'):
+        """날짜 구간의 상관 행렬 (CorrelationService.corr와 동일, columns=None이면 전체 컬럼)"""
+        columns = list(self.columns if columns is None else columns)
+        return self.correlations(columns).corr(columns, start, end, method)
+
+    def pair(self, col1, col2, start=None, end=None, method='pearson'):
+        """두 컬럼의 날짜 구간 상관계수"""
+        return self.correlations([col1, col2]).pair(col1, col2, start, end, method)
+
+    def top_pairs(self, columns=None, start=None, end=None, n=10, threshold=None):
+        """날짜 구간 상관 행렬의 |상관계수| 상위 변수 쌍"""
+        return top_pairs(self.corr(columns, start, end), n=n, threshold=threshold)
@@ -0,0 +1,240 @@
+"""
+공유 데이터 레지스트리
+대시보드 세션마다 DataFrame을 복사하지 않도록 데이터셋을 프로세스당 한 번만 로드해
+읽기 전용 numpy 배열로 보관하고, 날짜 구간은 복사 없는 뷰로 제공
+
+- 컬럼 배열은 writeable=False: 실수로 수정하면 ValueError (다른 세션 데이터 오염 방지)
+- frame(start, end): 배열 슬라이스로 만든 DataFrame (데이터 복사 없음)
+- 파생 컬럼(feature_store에 선언된 price_change_pct 등)은 처음 요청될 때 한 번 계산해 메모이즈
+- memory_usage(): 데이터셋별 메모리 사용량 (컨테이너 크기 산정용)
+"""
+
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_store import TABLES, load_table
+from feature_store import derived_columns
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 파생 컬럼: 이름 -> (계산 함수, 워밍업 행 수), feature_store에 선언된 피처 전체
+# 워밍업 행 수만큼 구간 앞부분은 통계에서 제외 (구간 안에서만 다시 계산한 것과 동일한 결과)
+DERIVED_COLUMNS = derived_columns()
+
+
+def _readonly(values):
+    """배열을 읽기 전용으로 표시 (연속 메모리가 아니면 한 번 복사)"""
+    values = np.ascontiguousarray(values)
+    values.flags.writeable = False
+    return values
+
+
+class Dataset:
+    """
+    읽기 전용 컬럼 배열로 보관한 시계열 데이터셋.
+
+    Args:
+        name: 데이터셋 이름
+        df: 원본 DataFrame (날짜순으로 정렬해 보관, 원본은 참조하지 않음)
+        date_column: 날짜 컬럼명 (None이면 구간 조회 불가)
+        derived: 파생 컬럼 정의 (None이면 DERIVED_COLUMNS 중 원천 컬럼이 있는 것)
+    """
+
+    def __init__(self, name, df, date_column='date', derived=None):
+        if date_column is not None:
+            df = df.sort_values(date_column, kind='stable')
+        self.name = name
+        self.date_column = date_column
+        self._arrays = {c: _readonly(df[c].to_numpy()) for c in df.columns}
+        self._base_columns = list(df.columns)
+        self._derived = dict(DERIVED_COLUMNS if derived is None else derived)
+        self._derived_arrays = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(next(iter(self._arrays.values()))) if self._arrays else 0
+
+    def __repr__(self):
+        return (f"Dataset({self.name!r}, rows={len(self)}, columns={len(self._base_columns)}, "
+                f"derived={list(self._derived_arrays)})")
+
+    @property
+    def columns(self):
+        """기본 컬럼 + 계산 가능한 파생 컬럼 목록"""
+        return self._base_columns + [c for c in self._derived if c not in self._arrays]
+
+    def warmup(self, column):
+        """파생 컬럼의 워밍업 행 수 (기본 컬럼은 0)"""
+        return self._derived[column][1] if column in self._derived else 0
+
+    def column(self, name):
+        """
+        컬럼 배열 (읽기 전용). 파생 컬럼은 처음 요청 시 전체 기간에 대해 한 번 계산.
+
+        Args:
+            name: 컬럼명
+
+        Returns:
+            np.ndarray: 읽기 전용 배열
+        """
+        if name in self._arrays:
+            return self._arrays[name]
+        if name not in self._derived:
+            raise KeyError(f"{self.name}에 없는 컬럼: {name}")
+        with self._lock:
+            if name not in self._derived_arrays:
+                func, _ = self._derived[name]
+                values = func(self.frame(columns=self._base_columns))
+                self._derived_arrays[name] = _readonly(np.asarray(values, dtype=float))
+        return self._derived_arrays[name]
+
+    def rows(self, start=None, end=None):
+        """날짜 구간(양 끝 포함)을 행 범위 [a, b)로 변환"""
+        if self.date_column is None or (start is None and end is None):
+            return 0, len(self)
+        dates = self._arrays[self.date_column]
+        a = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left'))
+        b = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), 'right'))
+        return a, max(a, b)
+
+    def frame(self, start=None, end=None, columns=None):
+        """
+        날짜 구간의 DataFrame (배열 슬라이스 뷰, 데이터 복사 없음, 수정 불가).
+
+        Args:
+            start: 시작 날짜, 포함 (None이면 처음부터)
+            end: 종료 날짜, 포함 (None이면 끝까지)
+            columns: 컬럼 목록 (None이면 기본 컬럼 + 파생 컬럼 전체)
+
+        Returns:
+            pd.DataFrame: 인덱스는 전체 데이터 기준 행 번호
+        """
+        a, b = self.rows(start, end)
+        columns = [c for c in self.columns
+                   if c not in self._derived or self._derivable(c)] if columns is None else columns
+        data = {c: self.column(c)[a:b] for c in columns}
+        return pd.DataFrame(data, index=pd.RangeIndex(a, b), copy=False)
+
+    def _derivable(self, name):
+        """파생 컬럼의 원천 컬럼이 있는지 (없으면 frame 기본 컬럼에서 제외)"""
+        try:
+            self.column(name)
+        except KeyError:
+            return False
+        return True
+
+    def memory_usage(self):
+        """
+        메모리 사용량 (바이트). object 컬럼은 문자열 객체 크기 포함.
+
+        Returns:
+            dict: rows, columns, base_bytes, derived_bytes
+        """
+        base = 0
+        for values in self._arrays.values():
+            base += values.nbytes
+            if values.dtype == object:
+                base += sum(sys.getsizeof(v) for v in values)
+        return {
+            'rows': len(self),
+            'columns': len(self._base_columns),
+            'base_bytes': base,
+            'derived_bytes': sum(v.nbytes for v in self._derived_arrays.values()),
+        }
+
+
+class DataRegistry:
+    """
+    프로세스 공유 데이터셋 레지스트리 (처음 요청 시 한 번 로드, 스레드 안전).
+    data_store에 등록된 테이블은 별도 등록 없이 load_table로 로드
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, date_column='date', derived=None, replace=False):
+        """
+        데이터셋 로더 등록. 스크립트가 매번 다시 실행되는 Streamlit에서도 안전하도록
+        이미 등록된 이름은 replace=True일 때만 교체 (교체하면 다음 요청 때 다시 로드).
+
+        Args:
+            name: 데이터셋 이름
+            loader: 인자 없이 DataFrame을 반환하는 함수
+            date_column: 날짜 컬럼명
+            derived: 파생 컬럼 정의
+            replace: True면 기존 등록과 로드된 데이터를 교체
+        """
+        with self._lock:
+            if name in self._loaders and not replace:
+                return
+            self._loaders[name] = (loader, date_column, derived)
+            self._datasets.pop(name, None)
+
+    def get(self, name):
+        """데이터셋 반환 (없으면 로드)"""
+        dataset = self._datasets.get(name)
+        if dataset is not None:
+            return dataset
+        with self._lock:
+            if name not in self._datasets:
+                if name in self._loaders:
+                    loader, date_column, derived = self._loaders[name]
+                elif name in TABLES:
+                    loader, date_column, derived = (lambda: load_table(name)), 'date', None
+                else:
+                    raise KeyError(f"등록되지 않은 데이터셋: {name}")
+                self._datasets[name] = Dataset(name, loader(), date_column, derived)
+            return self._datasets[name]
+
+    def loaded(self):
+        """로드된 데이터셋 이름 목록"""
+        return list(self._datasets)
+
+    def memory_usage(self):
+        """
+        로드된 데이터셋별 메모리 사용량.
+
+        Returns:
+            pd.DataFrame: dataset(index) x rows, columns, base_mb, derived_mb, total_mb
+        """
+        records = []
+        for name, dataset in list(self._datasets.items()):
+            usage = dataset.memory_usage()
+            records.append({
+                'dataset': name,
+                'rows': usage['rows'],
+                'columns': usage['columns'],
+                'base_mb': usage['base_bytes'] / 1024 ** 2,
+                'derived_mb': usage['derived_bytes'] / 1024 ** 2,
+            })
+        report = pd.DataFrame(records, columns=['dataset', 'rows', 'columns', 'base_mb', 'derived_mb'])
+        report['total_mb'] = report['base_mb'] + report['derived_mb']
+        return report.set_index('dataset')
+
+
+def peak_rss_mb():
+    """프로세스 최대 상주 메모리 (MB, 측정 불가 환경이면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    if sys.platform == 'darwin':
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+# 프로세스 공유 기본 레지스트리
+REGISTRY = DataRegistry()
+
+
+def get_dataset(name):
+    """기본 레지스트리의 데이터셋 (프로세스당 한 번 로드)"""
+    return REGISTRY.get(name)
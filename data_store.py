@@ -0,0 +1,145 @@
+"""
+컬럼형(Parquet) 저장소 모듈
+정제/통합 데이터셋을 dtype과 datetime 타입을 보존한 압축 Parquet으로 저장하고,
+모든 단계에서 load_table(name, columns=..., date_range=...) 하나로 읽어옴
+
+- pyarrow가 없거나 Parquet 파일이 아직 없으면 기존 CSV로 대체
+- CSV가 Parquet보다 최신이면(수동 수정 등) CSV를 우선 사용
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 데이터 경로
+CLEANED_DIR = Path("data/processed/cleaned")
+INTEGRATED_DIR = Path("data/processed/integrated")
+
+# 테이블 이름 -> 저장 디렉토리
+TABLES = {
+    'bitcoin_news_cleaned': CLEANED_DIR,
+    'features_daily_cleaned': CLEANED_DIR,
+    'gdelt_articles_cleaned': CLEANED_DIR,
+    'daily_data_cleaned': CLEANED_DIR,
+    'm2_inflation_daily_expanded': CLEANED_DIR,
+    'sns_youtube_cleaned': CLEANED_DIR,
+    'master_data_integrated': INTEGRATED_DIR,
+}
+
+PARQUET_COMPRESSION = 'zstd'
+
+
+def table_paths(name):
+    """
+    테이블의 Parquet / CSV 경로 반환.
+
+    Args:
+        name: TABLES에 등록된 테이블 이름
+
+    Returns:
+        tuple: (parquet 경로, csv 경로)
+    """
+    if name not in TABLES:
+        raise KeyError(f"등록되지 않은 테이블: {name} (사용 가능: {list(TABLES)})")
+    base = TABLES[name] / name
+    return base.with_suffix('.parquet'), base.with_suffix('.csv')
+
+
+def save_table(df, name, write_csv=True):
+    """
+    테이블을 압축 Parquet으로 저장 (dtype, datetime 타입 보존).
+
+    Args:
+        df: 저장할 DataFrame
+        name: TABLES에 등록된 테이블 이름
+        write_csv: True면 사람이 열어볼 수 있도록 CSV 사본도 함께 저장
+
+    Returns:
+        Path: 기본 저장 경로 (Parquet, pyarrow가 없으면 CSV)
+    """
+    parquet_path, csv_path = table_paths(name)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # CSV를 먼저 써서 Parquet의 mtime이 항상 CSV 이후가 되도록 함
+    if write_csv or not HAS_PYARROW:
+        df.to_csv(csv_path, index=False)
+
+    if not HAS_PYARROW:
+        print(f"  ⚠️  pyarrow가 없어 CSV로만 저장: {csv_path}")
+        return csv_path
+
+    df.to_parquet(parquet_path, index=False, compression=PARQUET_COMPRESSION)
+    return parquet_path
+
+
+def _use_parquet(parquet_path, csv_path):
+    """Parquet을 읽어도 되는지 (존재하고 CSV보다 오래되지 않았는지)"""
+    if not HAS_PYARROW or not parquet_path.exists():
+        return False
+    if not csv_path.exists():
+        return True
+    return parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+
+
+def _normalize_date_range(date_range):
+    """(start, end) 튜플을 Timestamp로 변환 (None은 열린 구간)"""
+    if date_range is None:
+        return None, None
+    start, end = date_range
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    return start, end
+
+
+def load_table(name, columns=None, date_range=None, date_column='date'):
+    """
+    저장된 테이블을 필요한 컬럼과 날짜 구간만 읽어오기.
+
+    Args:
+        name: TABLES에 등록된 테이블 이름
+        columns: 읽을 컬럼 목록 (None이면 전체)
+        date_range: (start, end) 날짜 구간, 양 끝 포함 (None이면 전체)
+        date_column: 날짜 구간 필터와 datetime 변환에 사용할 컬럼
+
+    Returns:
+        pd.DataFrame: 로드된 데이터
+    """
+    parquet_path, csv_path = table_paths(name)
+    start, end = _normalize_date_range(date_range)
+
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns)
+        if date_range is not None and date_column not in read_columns:
+            read_columns.append(date_column)
+
+    if _use_parquet(parquet_path, csv_path):
+        filters = []
+        if start is not None:
+            filters.append((date_column, '>=', start))
+        if end is not None:
+            filters.append((date_column, '<=', end))
+        df = pd.read_parquet(parquet_path, columns=read_columns,
+                             filters=filters or None)
+    elif csv_path.exists():
+        header = pd.read_csv(csv_path, nrows=0).columns
+        parse_dates = [date_column] if date_column in header and (
+            read_columns is None or date_column in read_columns) else None
+        df = pd.read_csv(csv_path, usecols=read_columns, parse_dates=parse_dates)
+        if start is not None:
+            df = df[df[date_column] >= start]
+        if end is not None:
+            df = df[df[date_column] <= end]
+    else:
+        raise FileNotFoundError(f"테이블 파일이 없습니다: {parquet_path} / {csv_path}")
+
+    if columns is not None:
+        df = df[list(columns)]
+
+    return df.reset_index(drop=True)
@@ -0,0 +1,155 @@
+"""
+벡터화 날짜 파싱 모듈
+컬럼 단위로 날짜 형식을 한 번만 감지한 뒤 전체 컬럼을 한 번에 datetime으로 변환
+
+지원 형식:
+- YYYYMMDD (int/str)        -> 'yyyymmdd'
+- YYYY-MM-DD[ HH:MM[:SS]]  -> 'iso'
+- ISO8601 + 타임존 (Z, +00:00) -> 'iso_tz'
+- 위 형식이 섞인 컬럼        -> 'mixed'
+"""
+
+import pandas as pd
+
+YYYYMMDD_PATTERN = r'\d{8}'
+ISO_PATTERN = r'\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?'
+ISO_TZ_PATTERN = ISO_PATTERN + r'(?:Z|[+-]\d{2}:?\d{2})'
+
+_FORMAT_PATTERNS = [
+    ('yyyymmdd', YYYYMMDD_PATTERN),
+    ('iso', ISO_PATTERN),
+    ('iso_tz', ISO_TZ_PATTERN),
+]
+
+
+def detect_date_format(values, sample_size=1000):
+    """
+    컬럼의 날짜 형식을 샘플 기반으로 한 번만 감지.
+
+    Args:
+        values: 날짜 값이 담긴 Series
+        sample_size: 형식 판별에 사용할 최대 샘플 수 (결측치 제외)
+
+    Returns:
+        str: 'datetime', 'yyyymmdd', 'iso', 'iso_tz', 'mixed', 'empty' 중 하나
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return 'datetime'
+
+    sample = values.dropna()
+    if len(sample) == 0:
+        return 'empty'
+    sample = sample.iloc[:sample_size]
+
+    # int64 / float64 (결측치 때문에 float로 읽힌 YYYYMMDD 포함)
+    if pd.api.types.is_numeric_dtype(sample):
+        valid = (sample >= 10000101) & (sample <= 99991231) & (sample % 1 == 0)
+        return 'yyyymmdd' if valid.all() else 'mixed'
+
+    sample = sample.astype(str).str.strip()
+    for fmt, pattern in _FORMAT_PATTERNS:
+        if sample.str.fullmatch(pattern).all():
+            return fmt
+    return 'mixed'
+
+
+def _parse_yyyymmdd(values):
+    """YYYYMMDD 값을 연/월/일 산술로 한 번에 변환"""
+    numeric = pd.to_numeric(values, errors='coerce')
+    return pd.to_datetime(
+        pd.DataFrame({
+            'year': numeric // 10000,
+            'month': numeric // 100 % 100,
+            'day': numeric % 100,
+        }),
+        errors='coerce'
+    )
+
+
+def _parse_mixed(values, utc):
+    """형식이 섞인 컬럼: 형식별 그룹으로 나눠 각각 한 번씩 변환"""
+    text = values.astype('string').str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index,
+                       dtype='datetime64[ns, UTC]' if utc else 'datetime64[ns]')
+
+    is_yyyymmdd = text.str.fullmatch(YYYYMMDD_PATTERN).fillna(False).astype(bool)
+    if is_yyyymmdd.any():
+        part = _parse_yyyymmdd(text[is_yyyymmdd])
+        parsed[is_yyyymmdd] = part.dt.tz_localize('UTC') if utc else part
+
+    rest = text.notna() & ~is_yyyymmdd
+    if rest.any():
+        part = pd.to_datetime(text[rest], format='ISO8601', utc=True, errors='coerce')
+        # ISO8601로 처리되지 않은 나머지 행만 개별 형식 추론
+        leftover = part.isna()
+        if leftover.any():
+            part[leftover] = pd.to_datetime(text[rest][leftover], format='mixed',
+                                            utc=True, errors='coerce')
+        parsed[rest] = part if utc else part.dt.tz_localize(None)
+
+    return parsed
+
+
+def parse_dates(values, fmt=None, utc=None):
+    """
+    날짜 컬럼 전체를 한 번의 벡터 연산으로 datetime으로 변환.
+
+    Args:
+        values: 날짜 값이 담긴 Series
+        fmt: 날짜 형식 (None이면 detect_date_format으로 자동 감지)
+        utc: True면 UTC tz-aware로 변환 (None이면 'iso_tz'일 때만 True)
+
+    Returns:
+        tuple: (변환된 Series, 감지된 형식, 변환 실패 행 마스크)
+    """
+    if fmt is None:
+        fmt = detect_date_format(values)
+    if utc is None:
+        utc = fmt == 'iso_tz'
+
+    if fmt == 'datetime':
+        parsed = pd.to_datetime(values, utc=utc)
+    elif fmt == 'empty':
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    elif fmt == 'yyyymmdd':
+        parsed = _parse_yyyymmdd(values)
+        if utc:
+            parsed = parsed.dt.tz_localize('UTC')
+    elif fmt in ('iso', 'iso_tz'):
+        parsed = pd.to_datetime(values, format='ISO8601', utc=utc, errors='coerce')
+        if not utc and isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            parsed = parsed.dt.tz_localize(None)
+    else:
+        parsed = _parse_mixed(values, utc)
+
+    failed = parsed.isna() & values.notna()
+    return parsed, fmt, failed
+
+
+def normalize_date_column(df, column, new_name=None, utc=None, max_examples=5):
+    """
+    DataFrame의 날짜 컬럼을 변환하고 변환 실패 행을 리포트.
+
+    Args:
+        df: 대상 DataFrame (제자리에서 수정)
+        column: 변환할 날짜 컬럼명
+        new_name: 변환 결과를 저장할 컬럼명 (None이면 기존 컬럼 덮어쓰기)
+        utc: parse_dates의 utc 옵션
+        max_examples: 출력할 변환 실패 예시 수
+
+    Returns:
+        pd.Series: 변환 실패 행 마스크
+    """
+    parsed, fmt, failed = parse_dates(df[column], utc=utc)
+
+    n_failed = int(failed.sum())
+    print(f"  📅 {column}: 형식={fmt}, {len(df):,}행 변환, 실패 {n_failed:,}행")
+    if n_failed > 0:
+        examples = df.loc[failed, column].head(max_examples).tolist()
+        print(f"     ⚠️  변환 실패 예시: {examples}")
+
+    df[column] = parsed
+    if new_name is not None and new_name != column:
+        df.rename(columns={column: new_name}, inplace=True)
+
+    return failed
@@ -0,0 +1,394 @@
+"""
+파생 피처 저장소
+분석 스크립트마다 pct_change()/rolling()으로 같은 컬럼을 다시 만들고 공유 DataFrame을 수정하던 것을,
+피처 정의(이름, 의존 컬럼, 계산 함수, 워밍업 행 수)를 한 곳에 선언하고 모든 단계가 여기서 읽도록 통일
+
+- 지연 계산: 요청된 피처와 그 의존 피처만 처음 접근할 때 계산
+- 데이터 버전별 메모이즈: 버전 = (피처 정의 버전 + 의존 컬럼 내용 해시), 같은 데이터면 프로세스 안에서 재사용
+- 영속화: 통합 테이블 옆(data/processed/integrated/<테이블>_features.parquet + 버전 manifest)에 저장해
+  다른 단계/프로세스는 다시 계산하지 않고 읽음 (원천 데이터가 바뀌면 버전이 달라져 자동으로 다시 계산)
+- 입력 DataFrame은 수정하지 않고 새 DataFrame을 반환
+- data_registry.DERIVED_COLUMNS(대시보드)도 여기 선언된 피처에서 만들어짐
+
+사용 예:
+  df = load_features('master_data_integrated', ['price_change_pct', 'MA7'])
+  df = add_features(merged_df, ['price_change_pct'])        # 임의 DataFrame
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data_store import HAS_PYARROW, TABLES, load_table
+
+THEME_PREFIX = 'theme_cnt__'
+
+# 기본 정치 관련 테마 (테마 이름 또는 glob 패턴)
+POLITICAL_THEMES = [
+    'EPU_POLICY',
+    'LEADER',
+    'GENERAL_GOVERNMENT',
+    'EPU_POLICY_GOVERNMENT'
+]
+
+# 프로세스 안 메모이즈 최대 항목 수 (데이터 버전 x 피처)
+MEMO_SIZE = 256
+
+
+class Feature:
+    """
+    파생 피처 정의.
+
+    Args:
+        name: 피처(컬럼) 이름
+        func: 의존 컬럼만 담은 DataFrame -> Series/배열
+        depends: 의존 컬럼 목록 (다른 피처 이름 또는 glob 패턴 가능)
+        warmup: 앞부분에 값이 정의되지 않는 행 수 (구간 통계에서 제외할 행 수)
+        version: 계산 방식을 바꾸면 올려서 저장된 값을 무효화
+        require_all: False면 없는 의존 컬럼은 건너뜀 (하나도 없을 때만 KeyError)
+    """
+
+    def __init__(self, name, func, depends, warmup=0, version=1, require_all=True):
+        self.name = name
+        self.func = func
+        self.depends = list(depends)
+        self.warmup = warmup
+        self.version = version
+        self.require_all = require_all
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, depends={self.depends}, warmup={self.warmup})"
+
+    def sources(self, available):
+        """
+        의존 컬럼을 실제 컬럼명으로 해석 (glob 패턴은 일치하는 컬럼 전체).
+
+        Raises:
+            KeyError: 의존 컬럼이 없을 때 (패턴이면 하나도 일치하지 않을 때)
+        """
+        resolved = []
+        for dep in self.depends:
+            if any(ch in dep for ch in '*?['):
+                matches = [c for c in available if fnmatch.fnmatchcase(c, dep)]
+            else:
+                matches = [dep] if dep in available else []
+            if not matches and self.require_all:
+                raise KeyError(f"{self.name}의 원천 컬럼이 없음: {dep}")
+            resolved.extend(m for m in matches if m not in resolved)
+        if not resolved:
+            raise KeyError(f"{self.name}의 원천 컬럼이 없음: {self.depends}")
+        return resolved
+
+
+# 피처 이름 -> Feature (선언 순서 유지)
+FEATURES = {}
+
+
+def feature(name, depends, warmup=0, version=1, registry=None):
+    """피처 선언 데코레이터 (함수는 의존 컬럼만 담은 DataFrame을 받음)"""
+    def decorator(func):
+        (FEATURES if registry is None else registry)[name] = Feature(name, func, depends, warmup, version)
+        return func
+    return decorator
+
+
+@feature('price_change_pct', ['BTC_Price'], warmup=1)
+def _price_change_pct(frame):
+    """일별 가격 변화율 (%)"""
+    return frame['BTC_Price'].pct_change() * 100
+
+
+@feature('price_volatility', ['price_change_pct'], warmup=1)
+def _price_volatility(frame):
+    """일별 가격 변동성 (변화율 절대값, %)"""
+    return frame['price_change_pct'].abs()
+
+
+@feature('MA7', ['BTC_Price'], warmup=6)
+def _ma7(frame):
+    """가격 7일 이동평균"""
+    return frame['BTC_Price'].rolling(window=7).mean()
+
+
+@feature('OI_change_pct', ['Open_Interest'], warmup=1)
+def _oi_change_pct(frame):
+    """Open Interest 일별 변화율 (%)"""
+    return frame['Open_Interest'].pct_change() * 100
+
+
+@feature('OI_change_abs', ['Open_Interest'], warmup=1)
+def _oi_change_abs(frame):
+    """Open Interest 일별 변화량"""
+    return frame['Open_Interest'].diff()
+
+
+def theme_total_feature(themes=POLITICAL_THEMES, name='political_themes_total'):
+    """
+    테마 건수 합계 피처 (테마 이름 또는 glob 패턴 목록, 있는 theme_cnt__ 컬럼만 합산).
+
+    Args:
+        themes: 테마 이름 또는 glob 패턴 목록
+        name: 피처 이름
+
+    Returns:
+        Feature: 테마 목록을 의존 컬럼으로 가진 피처 (테마가 다르면 버전도 달라짐)
+    """
+    return Feature(name, lambda frame: frame.sum(axis=1),
+                   [f"{THEME_PREFIX}{t}" for t in themes], warmup=0, require_all=False)
+
+
+FEATURES['political_themes_total'] = theme_total_feature()
+
+
+class _Memo:
+    """(피처 버전) -> 읽기 전용 배열 LRU (스레드 안전)"""
+
+    def __init__(self, size=MEMO_SIZE):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        return None
+
+    def put(self, key, values):
+        with self._lock:
+            self._items[key] = values
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+MEMO = _Memo()
+
+
+def _column_digest(series):
+    """컬럼 내용 해시 (이름, dtype, 값)"""
+    digest = hashlib.sha256(f"{series.name}|{series.dtype}|{len(series)}".encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class _Resolver:
+    """DataFrame 하나에 대한 피처 버전 계산/값 계산 (의존 관계를 따라 재귀)"""
+
+    def __init__(self, df, features, preloaded=None):
+        self.df = df
+        self.features = features
+        self.preloaded = preloaded or {}
+        self.available = list(df.columns) + [f for f in features if f not in df.columns]
+        self._versions = {}
+        self._values = {}
+        self.computed = []
+
+    def _is_base(self, name):
+        # 이미 DataFrame에 있는 컬럼은 (같은 이름의 피처가 있어도) 주어진 값을 그대로 사용
+        return name in self.df.columns or name not in self.features
+
+    def version(self, name, stack=()):
+        """컬럼의 데이터 버전 (기본 컬럼은 내용 해시, 피처는 정의 + 의존 컬럼 버전의 해시)"""
+        if name in self._versions:
+            return self._versions[name]
+        if self._is_base(name):
+            if name not in self.df.columns:
+                raise KeyError(f"없는 컬럼: {name}")
+            version = _column_digest(self.df[name])
+        else:
+            if name in stack:
+                raise ValueError(f"피처 의존 관계 순환: {' -> '.join(stack + (name,))}")
+            spec = self.features[name]
+            payload = [name, spec.version, spec.depends]
+            payload += [(dep, self.version(dep, stack + (name,))) for dep in spec.sources(self.available)]
+            version = hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+        self._versions[name] = version
+        return version
+
+    def values(self, name):
+        """컬럼 값 (피처는 메모 -> 저장값 -> 계산 순서로 찾음)"""
+        if name in self._values:
+            return self._values[name]
+        if self._is_base(name):
+            return self.df[name]
+
+        version = self.version(name)
+        cached = MEMO.get(version)
+        if cached is None and version in self.preloaded:
+            cached = self.preloaded[version]
+            MEMO.put(version, cached)
+        if cached is None:
+            spec = self.features[name]
+            sources = spec.sources(self.available)
+            frame = pd.DataFrame({dep: self.values(dep) for dep in sources}, index=self.df.index)
+            cached = np.asarray(spec.func(frame), dtype=float)
+            cached.flags.writeable = False
+            MEMO.put(version, cached)
+            self.computed.append(name)
+        # 메모의 배열은 읽기 전용으로 공유하고, 반환 컬럼은 스크립트가 수정해도 되도록 복사
+        series = pd.Series(cached.copy(), index=self.df.index, name=name)
+        self._values[name] = series
+        return series
+
+
+def add_features(df, names, features=None):
+    """
+    DataFrame에 피처 컬럼을 붙인 새 DataFrame (원본은 수정하지 않음).
+
+    Args:
+        df: 원천 컬럼을 가진 DataFrame (행 순서 = 시간 순서)
+        names: 피처 이름 목록 (이미 df에 있는 컬럼은 그대로 둠)
+        features: 피처 정의 (None이면 FEATURES, 일부만 바꾸려면 {**FEATURES, ...})
+
+    Returns:
+        pd.DataFrame: df + 요청한 피처
+    """
+    resolver = _Resolver(df, FEATURES if features is None else features)
+    new = {name: resolver.values(name) for name in names if name not in df.columns}
+    return df.assign(**new) if new else df
+
+
+def compute_feature(df, name, features=None):
+    """피처 하나의 값 (Series, 메모이즈 공유)"""
+    return _Resolver(df, FEATURES if features is None else features).values(name)
+
+
+def derived_columns(features=None):
+    """
+    data_registry/DashboardCube 형식의 파생 컬럼 정의.
+
+    Returns:
+        dict: 이름 -> (df를 받아 값을 반환하는 함수, 워밍업 행 수)
+    """
+    features = FEATURES if features is None else features
+    return {name: (lambda df, name=name: compute_feature(df, name, features), spec.warmup)
+            for name, spec in features.items()}
+
+
+def feature_paths(table):
+    """통합 테이블 옆 피처 저장 경로 (데이터 파일, 버전 manifest)"""
+    if table not in TABLES:
+        raise KeyError(f"등록되지 않은 테이블: {table} (사용 가능: {list(TABLES)})")
+    base = TABLES[table] / f"{table}_features"
+    suffix = '.parquet' if HAS_PYARROW else '.csv'
+    return base.with_suffix(suffix), base.with_suffix('.json')
+
+
+def _read_persisted(table, n_rows):
+    """저장된 피처 -> {버전: 배열} (행 수가 다르거나 읽을 수 없으면 빈 dict)"""
+    data_path, manifest_path = feature_paths(table)
+    if not data_path.exists() or not manifest_path.exists():
+        return {}
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        stored = pd.read_parquet(data_path) if data_path.suffix == '.parquet' else pd.read_csv(data_path)
+    except (OSError, ValueError):
+        return {}
+    if len(stored) != n_rows:
+        return {}
+    return {version: stored[name].to_numpy(dtype=float)
+            for name, version in manifest.items() if name in stored.columns}
+
+
+def _write_atomic(path, write):
+    """임시 파일에 쓴 뒤 교체 (동시에 읽는 단계가 잘린 파일을 보지 않도록)"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _persist(table, resolver, names):
+    """현재 버전 피처를 저장 (기존에 저장된 다른 피처 중 버전이 유효한 것은 유지)"""
+    data_path, manifest_path = feature_paths(table)
+    manifest, columns = {}, {}
+    for name in names:
+        manifest[name] = resolver.version(name)
+        columns[name] = resolver.values(name).to_numpy()
+    if data_path.exists() and manifest_path.exists():
+        try:
+            old_manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            old = pd.read_parquet(data_path) if data_path.suffix == '.parquet' else pd.read_csv(data_path)
+        except (OSError, ValueError):
+            old_manifest, old = {}, None
+        for name, version in old_manifest.items():
+            if name in manifest or old is None or name not in old.columns or len(old) != len(resolver.df):
+                continue
+            try:
+                valid = resolver.version(name) == version
+            except KeyError:
+                valid = False
+            if valid:
+                manifest[name], columns[name] = version, old[name].to_numpy()
+
+    frame = pd.DataFrame(columns)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    if data_path.suffix == '.parquet':
+        _write_atomic(data_path, lambda p: frame.to_parquet(p, index=False, compression='zstd'))
+    else:
+        _write_atomic(data_path, lambda p: frame.to_csv(p, index=False))
+    _write_atomic(manifest_path, lambda p: p.write_text(json.dumps(manifest, indent=2), encoding='utf-8'))
+
+
+def load_features(table='master_data_integrated', features=None, columns=None, date_range=None,
+                  persist=True):
+    """
+    테이블 + 파생 피처 (저장된 피처를 우선 사용하고, 없거나 원천 데이터가 바뀐 피처만 계산해 저장).
+
+    Args:
+        table: data_store에 등록된 테이블 이름
+        features: 피처 이름 목록 (None이면 원천 컬럼이 있는 모든 피처)
+        columns: 함께 반환할 테이블 컬럼 (None이면 전체)
+        date_range: (start, end) 날짜 구간, 양 끝 포함 (피처는 전체 기간으로 계산한 뒤 자름)
+        persist: 새로 계산한 피처를 테이블 옆에 저장할지 여부
+
+    Returns:
+        pd.DataFrame: columns + features
+    """
+    df = load_table(table)
+    resolver = _Resolver(df, FEATURES, _read_persisted(table, len(df)))
+    if features is None:
+        features = []
+        for name, spec in FEATURES.items():
+            try:
+                spec.sources(resolver.available)
+            except KeyError:
+                continue
+            features.append(name)
+    features = [f for f in features if f not in df.columns]
+    values = {name: resolver.values(name) for name in features}
+    if persist and resolver.computed:
+        _persist(table, resolver, features)
+
+    base = list(df.columns) if columns is None else list(columns)
+    result = df[base].assign(**values)
+    if date_range is not None:
+        start, end = (pd.Timestamp(d) if d is not None else None for d in date_range)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df['date'] >= start
+        if end is not None:
+            mask &= df['date'] <= end
+        result = result[mask].reset_index(drop=True)
+    return result
+
+
+def materialize(table='master_data_integrated'):
+    """
+    원천 컬럼이 있는 모든 피처를 계산해 테이블 옆에 저장 (통합 단계 직후 호출).
+
+    Returns:
+        list: 저장된 피처 이름
+    """
+    return list(load_features(table, columns=[]).columns)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GDELT 일별 뉴스 원본 -> features_daily 스트리밍 생성기
+data/news/bitcoin_news_YYYYMMDD.csv 파일을 하루치씩 읽어 일별 피처 1행을 만들고
+features_daily.csv에 이어 붙임 (이미 있는 날짜는 건너뜀)
+
+- 메모리 사용량은 처리 기간과 무관하게 하루치 파일 크기로 제한됨
+- v2_themes(';' 구분)는 벡터화 문자열 연산(str.split + explode)으로 집계
+- theme_cnt__* : 해당 테마를 포함한 기사 수 (기사당 1회)
+
+실행 방법:
+  python features_daily_builder.py                     # 새 날짜만 추가
+  python features_daily_builder.py --start 2025-11-01  # 특정 기간만 대상
+  python features_daily_builder.py --rebuild           # 전체 재생성
+"""
+
+import argparse
+import logging
+import os
+import re
+from pathlib import Path
+
+import pandas as pd
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+NEWS_DIR = Path("data/news")
+OUTPUT_PATH = Path("data/processed/features_daily.csv")
+FILE_PATTERN = re.compile(r'bitcoin_news_(\d{8})\.csv$')
+
+# 하루치 파일에서 실제로 읽는 컬럼
+USE_COLUMNS = ['source', 'v2_themes', 'avg_tone']
+
+BASE_COLUMNS = ['date', 'n_articles', 'n_sources', 'tone_mean', 'tone_std',
+                'tone_neg_share', 'tone_pos_share']
+THEME_PREFIX = 'theme_cnt__'
+
+# 기존 features_daily.csv와 동일한 테마 목록 (출력 파일이 없을 때 사용)
+DEFAULT_THEMES = [
+    'CRISISLEX_C07_SAFETY', 'CRISISLEX_CRISISLEXREC', 'ECON_BITCOIN',
+    'ECON_STOCKMARKET', 'EPU_CATS_REGULATION', 'EPU_ECONOMY',
+    'EPU_ECONOMY_HISTORIC', 'EPU_POLICY', 'EPU_POLICY_GOVERNMENT',
+    'GENERAL_GOVERNMENT', 'LEADER', 'TAX_ECON_PRICE', 'TAX_ETHNICITY',
+    'TAX_FNCACT', 'TAX_FNCACT_PRESIDENT', 'TAX_WORLDLANGUAGES',
+    'UNGP_FORESTS_RIVERS_OCEANS', 'USPEC_POLICY1', 'USPEC_POLITICS_GENERAL1',
+    'WB_1104_MACROECONOMIC_VULNERABILITY_AND_DEBT',
+    'WB_133_INFORMATION_AND_COMMUNICATION_TECHNOLOGIES',
+    'WB_1920_FINANCIAL_SECTOR_DEVELOPMENT',
+    'WB_2432_FRAGILITY_CONFLICT_AND_VIOLENCE',
+    'WB_507_ENERGY_AND_EXTRACTIVES', 'WB_678_DIGITAL_GOVERNMENT',
+    'WB_694_BROADCAST_AND_MEDIA', 'WB_696_PUBLIC_SECTOR_MANAGEMENT',
+    'WB_698_TRADE', 'WB_831_GOVERNANCE', 'WB_840_JUSTICE',
+]
+
+
+def list_day_files(news_dir=NEWS_DIR, start=None, end=None):
+    """
+    일별 뉴스 파일 목록을 날짜순으로 반환.
+
+    Args:
+        news_dir: bitcoin_news_YYYYMMDD.csv 파일이 있는 디렉토리
+        start: 시작 날짜 (포함, None이면 제한 없음)
+        end: 종료 날짜 (포함, None이면 제한 없음)
+
+    Returns:
+        list: (YYYYMMDD int, Path) 튜플 목록
+    """
+    start = int(pd.Timestamp(start).strftime('%Y%m%d')) if start is not None else None
+    end = int(pd.Timestamp(end).strftime('%Y%m%d')) if end is not None else None
+
+    files = []
+    for path in Path(news_dir).glob('bitcoin_news_*.csv'):
+        match = FILE_PATTERN.search(path.name)
+        if not match:
+            continue
+        day = int(match.group(1))
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        files.append((day, path))
+    return sorted(files)
+
+
+def build_day_features(path, day, themes):
+    """
+    하루치 뉴스 파일에서 일별 피처 1행 생성.
+
+    Args:
+        path: 일별 뉴스 CSV 경로
+        day: 날짜 (YYYYMMDD int)
+        themes: theme_cnt__로 집계할 테마 목록
+
+    Returns:
+        dict: 컬럼명 -> 값 (BASE_COLUMNS + theme_cnt__*)
+    """
+    df = pd.read_csv(path, usecols=USE_COLUMNS, encoding='utf-8-sig')
+    # 테마가 없는 행은 GKG 매칭 실패 건으로 보고 제외
+    df = df.dropna(subset=['v2_themes'])
+    tone = df['avg_tone']
+
+    row = {
+        'date': day,
+        'n_articles': len(df),
+        'n_sources': df['source'].nunique(),
+        'tone_mean': tone.mean(),
+        'tone_std': tone.std(),
+        'tone_neg_share': (tone < 0).mean(),
+        'tone_pos_share': (tone > 0).mean(),
+    }
+
+    # 기사 x 테마 목록을 한 번에 펼친 뒤, 기사당 테마 1회로 중복 제거
+    exploded = df['v2_themes'].str.split(';').explode()
+    exploded = exploded[exploded.isin(themes)]
+    pairs = exploded.reset_index().drop_duplicates()
+    counts = pairs['v2_themes'].value_counts()
+
+    for theme in themes:
+        row[f"{THEME_PREFIX}{theme}"] = int(counts.get(theme, 0))
+    return row
+
+
+def _existing_output(output_path):
+    """기존 출력 파일의 (테마 목록, 처리된 날짜 집합) 반환 (헤더와 date 컬럼만 읽음)"""
+    if not output_path.exists():
+        return None, set()
+    header = pd.read_csv(output_path, nrows=0).columns
+    themes = [c[len(THEME_PREFIX):] for c in header if c.startswith(THEME_PREFIX)]
+    dates = set(pd.read_csv(output_path, usecols=['date'])['date'].astype(int))
+    return themes, dates
+
+
+def build_features_daily(news_dir=NEWS_DIR, output_path=OUTPUT_PATH,
+                         start=None, end=None, themes=None, rebuild=False):
+    """
+    일별 뉴스 파일을 하루씩 처리해 features_daily에 증분 추가.
+
+    Args:
+        news_dir: 일별 뉴스 파일 디렉토리
+        output_path: features_daily CSV 경로
+        start: 처리 시작 날짜 (None이면 전체)
+        end: 처리 종료 날짜 (None이면 전체)
+        themes: 집계할 테마 목록 (None이면 기존 출력 헤더, 없으면 DEFAULT_THEMES)
+        rebuild: True면 기존 출력을 무시하고 전체 재생성
+
+    Returns:
+        int: 새로 추가된 날짜 수
+    """
+    output_path = Path(output_path)
+    existing_themes, done = (None, set()) if rebuild else _existing_output(output_path)
+
+    if existing_themes is not None:
+        if themes is not None and list(themes) != existing_themes:
+            raise ValueError("테마 목록이 기존 출력과 다릅니다. --rebuild로 재생성하세요.")
+        themes = existing_themes
+    elif themes is None:
+        themes = DEFAULT_THEMES
+    themes = list(themes)
+
+    pending = [(day, path) for day, path in list_day_files(news_dir, start, end)
+               if day not in done]
+    logger.info(f"대상 파일 {len(pending)}개 (이미 처리된 날짜 {len(done)}개 건너뜀)")
+    if not pending:
+        return 0
+
+    # 재생성은 임시 파일에 쓴 뒤 교체해 중간 실패 시 기존 파일 보존
+    target = output_path.with_suffix('.tmp') if rebuild else output_path
+    write_header = rebuild or not output_path.exists()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    columns = BASE_COLUMNS + [f"{THEME_PREFIX}{t}" for t in themes]
+
+    for day, path in pending:
+        row = build_day_features(path, day, themes)
+        pd.DataFrame([row], columns=columns).to_csv(
+            target, mode='w' if write_header else 'a', header=write_header, index=False)
+        write_header = False
+        logger.info(f"{day}: 기사 {row['n_articles']}건, 출처 {row['n_sources']}곳")
+
+    if rebuild:
+        os.replace(target, output_path)
+
+    # 날짜 파일 순서와 무관하게 출력은 날짜순으로 유지
+    dates = pd.read_csv(output_path, usecols=['date'])['date']
+    if not dates.is_monotonic_increasing:
+        pd.read_csv(output_path).sort_values('date').to_csv(output_path, index=False)
+
+    logger.info(f"✅ {len(pending)}일 추가 -> {output_path}")
+    return len(pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GDELT 일별 뉴스 -> features_daily 생성")
+    parser.add_argument('--news-dir', default=str(NEWS_DIR), help="일별 뉴스 파일 디렉토리")
+    parser.add_argument('--out', default=str(OUTPUT_PATH), help="출력 CSV 경로")
+    parser.add_argument('--start', default=None, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="종료 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--rebuild', action='store_true', help="기존 출력을 무시하고 전체 재생성")
+    args = parser.parse_args()
+
+    build_features_daily(args.news_dir, args.out, args.start, args.end, rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
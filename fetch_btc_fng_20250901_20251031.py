@@ -7,17 +7,23 @@ Crypto Fear & Greed Index + Bitcoin(BTC) 일봉 가격 수집 및 병합 스크
   python fetch_btc_fng_20250901_20251031.py
   python fetch_btc_fng_20250901_20251031.py --start 2025-09-01 --end 2025-10-31
   python fetch_btc_fng_20250901_20251031.py --start 2025-09-01 --end 2025-10-31 --out ./output/my_data.csv
+  python fetch_btc_fng_20250901_20251031.py --interval 1h   # 시간봉 수집/저장 후 일봉으로 리샘플링
 """
 
 import argparse
 import logging
 import os
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 import requests
 
+from api_collector import default_collector
+from intraday_store import INTERVAL_MS, fetch_klines, resample_bars, update_bars
+from response_cache import OPEN_TTL
+
 
 # 로깅 설정
 logging.basicConfig(
@@ -47,9 +53,9 @@ def fetch_fear_greed_index(limit=0, timeout=30):
     logger.info(f"Fetching Fear & Greed Index from {url}")
     
     try:
-        response = requests.get(url, params=params, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
+        # 공용 수집기: 호스트별 속도 제한 + 429/5xx 재시도
+        # 전체 이력 응답은 매일 바뀌므로 열린 구간 TTL로만 캐시
+        data = default_collector().get_json(url, params=params, timeout=timeout, ttl=OPEN_TTL)
         
         if "data" not in data:
             logger.error("API response missing 'data' field")
@@ -60,7 +66,7 @@ def fetch_fear_greed_index(limit=0, timeout=30):
         
         return df
     
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.error(f"Failed to fetch Fear & Greed Index: {e}")
         return pd.DataFrame()
 
@@ -120,64 +126,46 @@ def process_fear_greed_data(df, start_date, end_date):
     return df
 
 
-def fetch_btc_price(start_date_str, end_date_str, timeout=30):
+def fetch_btc_price(start_date_str, end_date_str, timeout=30, interval='1d'):
     """
     Bitcoin(BTC) 가격 데이터를 Binance API로부터 수집.
+    klines는 요청당 최대 1000봉이므로 intraday_store.fetch_klines로 페이지를 동시에 요청하고,
+    장중 간격(1m, 1h 등)이면 봉을 intraday_store에 저장한 뒤 일봉 종가로 리샘플링
     
     Args:
         start_date_str: 시작 날짜 (YYYYMMDD)
         end_date_str: 종료 날짜 (YYYYMMDD)
         timeout: 요청 타임아웃(초)
+        interval: Binance 봉 간격 ('1d'면 일봉을 바로 사용)
     
     Returns:
-        pd.DataFrame: 수집된 BTC 가격 데이터
+        pd.DataFrame: 수집된 BTC 일별 가격 데이터 (timestamp_ms, price)
     """
-    url = "https://api.binance.com/api/v3/klines"
+    start_dt = datetime.strptime(start_date_str, '%Y%m%d')
+    end_dt = datetime.strptime(end_date_str, '%Y%m%d')
     
-    # YYYYMMDD를 datetime으로 변환 후 밀리초 타임스탬프로
-    start_dt = datetime.strptime(start_date_str, '%Y%m%d').replace(tzinfo=timezone.utc)
-    end_dt = datetime.strptime(end_date_str, '%Y%m%d').replace(hour=23, minute=59, second=59, tzinfo=timezone.utc)
+    logger.info(f"Fetching BTC {interval} klines from Binance API")
     
-    start_time_ms = int(start_dt.timestamp() * 1000)
-    end_time_ms = int(end_dt.timestamp() * 1000)
+    if interval == '1d':
+        bars = fetch_klines(start_dt, end_dt, interval, timeout=timeout)
+    else:
+        # 장중 봉은 저장소에 보관 (이미 받은 구간은 다시 요청하지 않음)
+        bars = update_bars(start_dt, end_dt, interval)
+        bars = resample_bars(bars, '1D')
     
-    params = {
-        "symbol": "BTCUSDT",
-        "interval": "1d",
-        "startTime": start_time_ms,
-        "endTime": end_time_ms,
-        "limit": 1000
-    }
+    if bars.empty:
+        logger.error("API response is empty")
+        return pd.DataFrame()
     
-    logger.info(f"Fetching BTC price from Binance API: {url}")
+    # 일봉 Close 가격 사용 (timestamp는 봉 시작 시각)
+    df = pd.DataFrame({
+        'timestamp_ms': bars['timestamp'].astype('datetime64[ms]').astype('int64'),
+        'price': bars['close'].astype(float),
+    })
     
-    try:
-        response = requests.get(url, params=params, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
-        
-        if not data:
-            logger.error("API response is empty")
-            return pd.DataFrame()
-        
-        # Binance klines 데이터: [open_time, open, high, low, close, volume, ...]
-        # Close 가격(index 4)을 사용
-        df = pd.DataFrame(data, columns=[
-            'open_time', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp_ms'] = pd.to_numeric(df['open_time'])
-        df['price'] = pd.to_numeric(df['close'])
-        
-        logger.info(f"Fetched {len(df)} BTC daily price records from Binance")
-        
-        return df[['timestamp_ms', 'price']]
+    logger.info(f"Fetched {len(df)} BTC daily price records from Binance")
     
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to fetch BTC price from Binance: {e}")
-        return pd.DataFrame()
+    return df
 
 
 def process_btc_price_data(df, start_date, end_date):
@@ -305,6 +293,13 @@ def main():
         default='2025-10-31',
         help='End date (YYYY-MM-DD format, default: 2025-10-31)'
     )
+    parser.add_argument(
+        '--interval',
+        type=str,
+        default='1d',
+        choices=list(INTERVAL_MS),
+        help='Binance kline interval; intraday bars are stored in data/intraday and resampled to daily (default: 1d)'
+    )
     parser.add_argument(
         '--out',
         type=str,
@@ -325,16 +320,20 @@ def main():
     logger.info(f"Date range: {start_date} ~ {end_date}")
     logger.info(f"Output path: {args.out}")
     
-    # Fear & Greed Index 수집 및 처리
-    fng_raw = fetch_fear_greed_index(limit=0)
+    # Fear & Greed Index와 BTC 가격은 호스트가 달라 동시에 수집 (호스트별 속도 제한은 수집기가 적용)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fng_future = executor.submit(fetch_fear_greed_index, limit=0)
+        btc_future = executor.submit(fetch_btc_price, start_date, end_date, interval=args.interval)
+        fng_raw, btc_raw = fng_future.result(), btc_future.result()
+    
+    # Fear & Greed Index 처리
     fng_processed = process_fear_greed_data(fng_raw, start_date, end_date)
     
     if fng_processed.empty:
         logger.error("Failed to process Fear & Greed Index data")
         return
     
-    # BTC 가격 수집 및 처리
-    btc_raw = fetch_btc_price(start_date, end_date)
+    # BTC 가격 처리
     btc_processed = process_btc_price_data(btc_raw, start_date, end_date)
     
     if btc_processed.empty:
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+그래프 렌더링 모듈
+04~12 단계의 보고서 그래프를 헤드리스(Agg)로, 변경된 것만, 병렬로 생성
+
+- save_figure(): 같은 디렉토리 임시 파일에 쓴 뒤 os.replace로 교체 (중단돼도 깨진 PNG가 남지 않음)
+- show_figure(): 화면 백엔드면 plt.show(), 헤드리스(Agg 등)면 plt.close()로 메모리만 해제
+- @cached_figure: 입력 데이터 해시 + 인자 + 스크립트/로컬 모듈 소스가 같고 출력 파일이 있으면
+  그리기를 건너뜀 (키는 output/.figure_cache/<파일명>.key에 그래프별로 저장)
+- FIGURE_JOBS: 마스터 데이터만으로 그릴 수 있는 그래프 목록, 프로세스 풀에서 병렬 렌더링
+
+실행 방법:
+  python figure_renderer.py                  # 변경된 그래프만 병렬 렌더링
+  python figure_renderer.py --workers 4
+  python figure_renderer.py --force          # 캐시 무시하고 전부 다시 그리기
+  python figure_renderer.py --only 03_correlation_heatmap_full
+  FIGURE_FORCE=1 python 05_correlation_heatmap.py   # 단계 스크립트에서 캐시 무시
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import inspect
+import io
+import logging
+import os
+import pickle
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path("output/.figure_cache")
+FORCE_ENV = 'FIGURE_FORCE'
+HEADLESS_BACKENDS = {'agg', 'pdf', 'svg', 'ps', 'cairo', 'template'}
+ROOT_DIR = Path(__file__).resolve().parent
+
+# 병렬 렌더링 대상: 그래프 이름 -> 스크립트, 함수, 입력 테이블, feature_store 피처, 전처리 함수, 추가 인자
+# prepare 함수가 DataFrame을 반환하면 이후 단계의 입력으로 사용 (그 외 반환값은 무시)
+FIGURE_JOBS = {
+    '01_btc_price_timeseries': {
+        'script': '04_price_visualization.py',
+        'function': 'plot_btc_price_timeseries',
+        'features': ['price_change_pct', 'MA7'],
+    },
+    '02_btc_price_vs_sns': {
+        'script': '04_price_visualization.py',
+        'function': 'plot_price_with_volume',
+        'features': ['price_change_pct', 'MA7'],
+    },
+    '03_correlation_heatmap_full': {
+        'script': '05_correlation_heatmap.py',
+        'function': 'create_correlation_heatmap_full',
+    },
+    '04_correlation_heatmap_key_vars': {
+        'script': '05_correlation_heatmap.py',
+        'function': 'create_correlation_heatmap_key_vars',
+    },
+    '05_btc_correlation_bar': {
+        'script': '05_correlation_heatmap.py',
+        'function': 'create_btc_correlation_bar_chart',
+    },
+    '06_political_themes_timeseries': {
+        'script': '06_political_themes_analysis.py',
+        'function': 'plot_political_themes_timeseries',
+        'prepare': ['attach_theme_counts', 'add_theme_features'],
+    },
+    '07_political_themes_lag_correlation': {
+        'script': '06_political_themes_analysis.py',
+        'function': 'create_lag_correlation_analysis',
+        'prepare': ['attach_theme_counts', 'add_theme_features'],
+    },
+    '14_open_interest_analysis': {
+        'script': '10_open_interest_analysis.py',
+        'function': 'plot_oi_analysis',
+        'features': ['OI_change_pct', 'OI_change_abs', 'price_change_pct', 'price_volatility'],
+        'prepare': ['load_and_analyze_oi_data', 'detect_oi_spikes'],
+    },
+    '18_network_simplified': {
+        'script': '12_network_analysis.py',
+        'function': 'create_simplified_network',
+    },
+}
+
+
+def is_headless():
+    """현재 matplotlib 백엔드가 화면 없이 파일만 쓰는 백엔드인지 여부"""
+    return matplotlib.get_backend().lower() in HEADLESS_BACKENDS
+
+
+def save_figure(output_file, fig=None, **savefig_kwargs):
+    """
+    그래프를 원자적으로 저장 (plt.savefig 대체).
+
+    Args:
+        output_file: 저장 경로 (확장자로 형식 결정)
+        fig: 저장할 Figure (None이면 현재 Figure)
+        **savefig_kwargs: savefig에 전달할 인자 (dpi, bbox_inches 등)
+    """
+    import matplotlib.pyplot as plt
+
+    fig = fig or plt.gcf()
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    # 같은 디렉토리의 임시 파일에 쓴 뒤 교체 (병렬 워커끼리도 서로의 임시 파일을 건드리지 않음)
+    tmp_file = output_file.with_name(f".{output_file.stem}.{os.getpid()}.tmp{output_file.suffix}")
+    try:
+        fig.savefig(tmp_file, **savefig_kwargs)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+
+def show_figure(fig=None):
+    """
+    화면 백엔드면 그래프를 표시하고, 헤드리스면 닫아서 메모리 해제 (plt.show 대체).
+
+    Args:
+        fig: 대상 Figure (None이면 현재 Figure)
+    """
+    import matplotlib.pyplot as plt
+
+    if is_headless():
+        plt.close(fig or plt.gcf())
+    else:
+        plt.show()
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path, mtime):
+    """소스 파일 내용 해시 (경로 + 수정 시각 기준 메모이즈)"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _source_files(func):
+    """그래프 함수의 스크립트와, 그 스크립트가 사용하는 저장소 내 로컬 모듈 파일 목록"""
+    files = {inspect.getsourcefile(func)}
+    for value in func.__globals__.values():
+        if isinstance(value, types.ModuleType):
+            source = getattr(value, '__file__', None)
+        elif callable(value) and getattr(value, '__module__', None) in sys.modules:
+            source = getattr(sys.modules[value.__module__], '__file__', None)
+        else:
+            continue
+        if source and Path(source).resolve().parent == ROOT_DIR:
+            files.add(source)
+    return sorted(str(Path(f).resolve()) for f in files if f)
+
+
+def _hash_value(h, value):
+    """인자 값을 해시에 반영 (DataFrame/Series는 내용 해시)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr(value.columns if isinstance(value, pd.DataFrame) else value.name).encode())
+        h.update(repr(value.dtypes).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:
+            # list 등 해시할 수 없는 객체 컬럼은 직렬화해서 반영
+            h.update(pickle.dumps(value))
+    elif isinstance(value, np.ndarray):
+        h.update(f"{value.dtype}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode())
+        if all(isinstance(item, (str, int, float, bool, type(None))) for item in value):
+            # 키워드 목록 등 스칼라 목록은 한 번에 반영
+            h.update(repr(value).encode())
+        else:
+            for item in value:
+                _hash_value(h, item)
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}".encode())
+        for k in sorted(value, key=repr):
+            _hash_value(h, k)
+            _hash_value(h, value[k])
+    else:
+        h.update(repr(value).encode())
+
+
+def figure_key(func, args=(), kwargs=None, ignore=()):
+    """
+    그래프 캐시 키: 소스 코드 + 입력 인자 + matplotlib 버전의 sha256.
+
+    Args:
+        func: 그래프 함수
+        args: 위치 인자
+        kwargs: 키워드 인자
+        ignore: 키에서 제외할 인자 이름 (예: 입력 데이터에서 파생되는 서비스 객체)
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    h = hashlib.sha256()
+    h.update(f"{func.__qualname__}|matplotlib {matplotlib.__version__}".encode())
+    for path in _source_files(func):
+        h.update(_file_digest(path, os.stat(path).st_mtime_ns).encode())
+
+    bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+    bound.apply_defaults()
+    for name, value in bound.arguments.items():
+        if name in ignore:
+            continue
+        h.update(name.encode())
+        _hash_value(h, value)
+    return h.hexdigest()
+
+
+def _key_path(output_file):
+    return CACHE_DIR / f"{Path(output_file).name}.key"
+
+
+def _is_fresh(output_file, key):
+    key_path = _key_path(output_file)
+    return (Path(output_file).exists() and key_path.exists()
+            and key_path.read_text().strip() == key)
+
+
+def _write_key(output_file, key):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key_path = _key_path(output_file)
+    tmp_path = key_path.with_name(f".{key_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(key)
+    os.replace(tmp_path, key_path)
+
+
+def cached_figure(*outputs, output_arg=None, ignore=()):
+    """
+    입력과 코드가 바뀌지 않았으면 그래프 함수를 건너뛰는 데코레이터.
+    건너뛴 경우 None을 반환하므로, 반환값이 이후 분석에 쓰이는 함수에는 사용하지 않음
+
+    Args:
+        *outputs: 함수가 저장하는 그래프 파일 경로
+        output_arg: 출력 경로를 인자로 받는 경우 그 인자 이름
+        ignore: 캐시 키에서 제외할 인자 이름
+
+    Returns:
+        callable: 데코레이터 (래퍼의 last_status 속성에 'cached' 또는 'rendered' 기록)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            paths = [Path(p) for p in outputs]
+            if output_arg is not None:
+                bound = inspect.signature(func).bind(*args, **kwargs)
+                bound.apply_defaults()
+                paths.append(Path(bound.arguments[output_arg]))
+
+            key = figure_key(func, args, kwargs, ignore)
+            if os.environ.get(FORCE_ENV) != '1' and all(_is_fresh(p, key) for p in paths):
+                print(f"\n⏭️  입력 변경 없음, 기존 그래프 사용: {', '.join(str(p) for p in paths)}")
+                wrapper.last_status = 'cached'
+                return None
+
+            result = func(*args, **kwargs)
+            for path in paths:
+                _write_key(path, key)
+            wrapper.last_status = 'rendered'
+            return result
+
+        wrapper.last_status = None
+        return wrapper
+    return decorator
+
+
+def _load_script(script):
+    """숫자로 시작하는 단계 스크립트를 모듈로 로드 (main은 실행되지 않음)"""
+    path = ROOT_DIR / script
+    name = f"stage_{path.stem}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _render_job(name, force=False):
+    """워커 프로세스에서 그래프 하나 렌더링, (이름, 상태) 반환"""
+    matplotlib.use('Agg')
+    if force:
+        os.environ[FORCE_ENV] = '1'
+    from feature_store import load_features
+
+    job = FIGURE_JOBS[name]
+    module = _load_script(job['script'])
+    # 단계 스크립트의 진행 출력은 워커마다 섞이므로 버림
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = load_features(job.get('table', 'master_data_integrated'), job.get('features', []))
+        for prepare in job.get('prepare', []):
+            result = getattr(module, prepare)(df)
+            if isinstance(result, pd.DataFrame):
+                df = result
+        func = getattr(module, job['function'])
+        func(df, **job.get('kwargs', {}))
+    return name, getattr(func, 'last_status', None) or 'rendered'
+
+
+def render_jobs(names=None, workers=None, force=False):
+    """
+    FIGURE_JOBS의 그래프를 프로세스 풀에서 병렬 렌더링.
+
+    Args:
+        names: 렌더링할 그래프 이름 목록 (None이면 전체)
+        workers: 워커 프로세스 수 (None이면 CPU 수)
+        force: True면 캐시를 무시하고 다시 그리기
+
+    Returns:
+        dict: 그래프 이름 -> 'rendered' / 'cached' / 'failed'
+    """
+    names = list(FIGURE_JOBS) if names is None else list(names)
+    unknown = [n for n in names if n not in FIGURE_JOBS]
+    if unknown:
+        raise KeyError(f"등록되지 않은 그래프: {unknown} (사용 가능: {list(FIGURE_JOBS)})")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_render_job, name, force): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                _, status = future.result()
+            except Exception as e:
+                logger.error(f"❌ {name}: {e}")
+                status = 'failed'
+            else:
+                logger.info(f"{'✅' if status == 'rendered' else '⏭️ '} {name}: {status}")
+            results[name] = status
+    return results
+
+
+def main():
+    # 로깅 설정 (CLI 실행 시에만; import 한 스테이지/대시보드의 루트 로거는 건드리지 않음)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
+    parser = argparse.ArgumentParser(description="보고서 그래프 병렬 렌더링 (변경된 것만)")
+    parser.add_argument('--only', nargs='+', default=None, help="렌더링할 그래프 이름")
+    parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수")
+    parser.add_argument('--force', action='store_true', help="캐시 무시하고 전부 다시 그리기")
+    args = parser.parse_args()
+
+    results = render_jobs(args.only, args.workers, args.force)
+    counts = pd.Series(results).value_counts()
+    logger.info(f"완료: {counts.to_dict()}")
+    if counts.get('failed', 0):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
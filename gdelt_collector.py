@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GDELT DOC API 기사 수집 스크립트 (gdelt_collect_stage1 노트북의 수집 단계)
+하루 단위로 비트코인 관련 기사 목록을 받아 data/raw/gdelt_articles_YYYY-MM-DD.csv로 저장
+
+- 요청 간격(5초에 1번)과 429/5xx 재시도는 api_collector가 처리 (요청마다 time.sleep 하지 않음)
+- 이미 저장된 날짜는 건너뛰고, 받은 페이지는 체크포인트에 기록해 중단 후 다시 실행하면 이어서 수집
+
+실행 방법:
+  python gdelt_collector.py
+  python gdelt_collector.py --start 2025-09-01 --end 2025-10-31
+"""
+
+import argparse
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from api_collector import Checkpoint, default_collector
+from response_cache import period_ttl
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GDELT_DOC = "https://api.gdeltproject.org/api/v2/doc/doc"
+RAW_DIR = Path("data/raw")
+CHECKPOINT_PATH = RAW_DIR / ".gdelt_checkpoint.jsonl"
+
+QUERY = "(bitcoin OR btc)"
+SOURCE_LANG = "eng"
+MAX_RECORDS = 250
+SORT = "HybridRel"
+MAX_PAGES_PER_DAY = 40  # 하루 최대 수집량 제한(안전장치)
+
+
+def day_job(day, startrecord=1):
+    """하루치 요청 (url, params, ttl): 끝난 날짜의 응답은 캐시에 영구 보관"""
+    return GDELT_DOC, day_params(day, startrecord), period_ttl(day.replace(hour=23, minute=59, second=59))
+
+
+def day_params(day, startrecord=1):
+    """하루치 artlist 요청 파라미터"""
+    start = day.replace(hour=0, minute=0, second=0)
+    end = day.replace(hour=23, minute=59, second=59)
+    return {
+        "query": QUERY,
+        "mode": "artlist",
+        "format": "json",
+        "maxrecords": MAX_RECORDS,
+        "startdatetime": start.strftime("%Y%m%d%H%M%S"),
+        "enddatetime": end.strftime("%Y%m%d%H%M%S"),
+        "sort": SORT,
+        "sourcelang": SOURCE_LANG,
+        "startrecord": startrecord,
+    }
+
+
+def normalize_article(a, day):
+    """
+    GDELT 원본 기사 JSON을 분석/병합용 스키마로 정규화.
+
+    Args:
+        a: 기사 JSON
+        day: 수집 날짜 (UTC)
+
+    Returns:
+        dict: published_at_utc, date_day, title, url, domain, source, sourceCountry, language
+    """
+    url = a.get("url")
+    published_raw = a.get("seendate") or a.get("sourceCollectionDate") or a.get("date") or a.get("datetime")
+
+    published_at_utc = None
+    if isinstance(published_raw, str):
+        for fmt in ("%Y%m%d%H%M%S", "%Y%m%dT%H%M%SZ"):
+            try:
+                published_at_utc = datetime.strptime(published_raw, fmt).replace(tzinfo=timezone.utc).isoformat()
+                break
+            except ValueError:
+                pass
+    # 파싱 실패 시 해당 날짜 00:00 UTC로 대체
+    if not published_at_utc:
+        published_at_utc = day.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+    return {
+        "published_at_utc": published_at_utc,
+        "date_day": day.date().isoformat(),
+        "title": (a.get("title") or "").strip(),
+        "url": url,
+        "domain": urlparse(url).netloc.lower() if isinstance(url, str) else None,
+        "source": a.get("source") or a.get("sourceName"),
+        "sourceCountry": a.get("sourceCountry"),
+        "language": a.get("language"),
+    }
+
+
+def _page_key(day, page):
+    """체크포인트 key (날짜:페이지)"""
+    return f"{day.date()}:{page}"
+
+
+def collect_days(days, workers=4, collector=None, checkpoint=None):
+    """
+    여러 날짜의 기사를 수집 (첫 페이지를 모두 요청한 뒤, 기사 수에 따라 나머지 페이지 요청).
+
+    Args:
+        days: 수집할 날짜 목록 (UTC datetime)
+        workers: 동시 요청 수
+        collector: ApiCollector (None이면 기본 수집기)
+        checkpoint: Checkpoint
+
+    Returns:
+        dict: 날짜 -> 기사 DataFrame (첫 페이지 또는 추가 페이지가 실패한 날짜는 제외)
+    """
+    collector = collector or default_collector()
+
+    first = collector.fetch_all({_page_key(day, 1): day_job(day) for day in days},
+                                workers=workers, checkpoint=checkpoint)
+
+    more = {}
+    for day in days:
+        data = first.get(_page_key(day, 1))
+        if data is None:
+            continue
+        total = int(data.get("totalArticles", len(data.get("articles") or [])) or 0)
+        pages = min(max(1, math.ceil(total / MAX_RECORDS)), MAX_PAGES_PER_DAY)
+        for page in range(2, pages + 1):
+            more[_page_key(day, page)] = day_job(day, 1 + (page - 1) * MAX_RECORDS)
+    rest = collector.fetch_all(more, workers=workers, checkpoint=checkpoint) if more else {}
+
+    results = {}
+    for day in days:
+        day_keys = [_page_key(day, 1)] + [k for k in more if k.startswith(f"{day.date()}:")]
+        responses = [first.get(k, rest.get(k)) for k in day_keys]
+        if any(r is None for r in responses):
+            continue
+        rows = [normalize_article(a, day) for r in responses for a in (r.get("articles") or [])]
+        df = pd.DataFrame(rows, columns=["published_at_utc", "date_day", "title", "url", "domain",
+                                         "source", "sourceCountry", "language"])
+        df = df.dropna(subset=["url"])
+        df["title"] = df["title"].fillna("").astype(str)
+        results[day] = df
+    return results
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='Collect daily GDELT article lists')
+    parser.add_argument('--start', default='2025-09-01', help='Start date (YYYY-MM-DD, default: 2025-09-01)')
+    parser.add_argument('--end', default='2025-10-31', help='End date (YYYY-MM-DD, default: 2025-10-31)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent requests (default: 4)')
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    end = datetime.strptime(args.end, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    # 이미 저장된 날짜는 건너뜀
+    pending = [day for day in days if not (RAW_DIR / f"gdelt_articles_{day.date()}.csv").exists()]
+    logger.info(f"{len(days)} days, {len(days) - len(pending)} already saved, {len(pending)} to collect")
+    if not pending:
+        return
+
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    checkpoint = Checkpoint(CHECKPOINT_PATH)
+    results = collect_days(pending, workers=args.workers, checkpoint=checkpoint)
+    for day, df in sorted(results.items()):
+        path = RAW_DIR / f"gdelt_articles_{day.date()}.csv"
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        logger.info(f"{day.date()} -> {len(df)} articles")
+
+    failed = len(pending) - len(results)
+    if failed:
+        logger.warning(f"{failed} day(s) failed; re-run to resume from {CHECKPOINT_PATH}")
+    else:
+        checkpoint.clear()
+
+
+if __name__ == "__main__":
+    main()
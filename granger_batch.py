@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Granger 인과관계 일괄 검정 모듈
+지표 x target x 시차 조합을 statsmodels.grangercausalitytests 반복 호출 없이 한 번에 검정
+
+- 제한 모형(target 자기 시차 + 상수)은 (target, 결측 패턴, 시차)마다 한 번만 적합해 모든 지표가 공유
+- 비제한 모형은 지표 시차 행렬을 제한 모형 설계에 대해 잔차화한 뒤
+  (지표, 시차, 시차) Gram 행렬 묶음으로 SSR을 한 번에 계산 (Frisch-Waugh)
+- 결측 패턴이 같은 지표끼리 묶어 처리하고, 묶음은 프로세스 풀에 분산
+- 결과는 tidy 표(target, indicator, lag, F/chi2 통계량, p-value)로 반환하고
+  입력 데이터 해시 + 설정을 key로 output/.analysis_cache에 캐시
+
+검정 방향: indicator -> target (귀무가설: indicator의 과거 값이 target 예측에 기여하지 않음)
+통계량은 grangercausalitytests의 ssr_ftest / ssr_chi2test와 동일 (쌍별 결측 제거 후 시차 구성)
+
+실행 방법 (Master DataFrame 전체 컬럼 -> BTC 가격 변화율 screening):
+  python granger_batch.py
+  python granger_batch.py --target price_change_pct --max-lag 5 --workers 4
+"""
+
+import argparse
+import logging
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from data_store import load_table
+from feature_store import FEATURES, load_features
+from response_cache import ANALYSIS_CACHE_DIR, ResponseCache, data_fingerprint, process_pool
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = Path("output/visualizations")
+RESULT_COLUMNS = ['target', 'indicator', 'lag', 'nobs', 'f_stat', 'df_num', 'df_denom',
+                  'p_value', 'chi2_stat', 'chi2_p_value']
+# grangercausalitytests를 호출하던 기존 분석과 같은 최소 표본 수
+MIN_OBS = 10
+
+
+def _lag_block(values, lag):
+    """(시점, ...) 배열의 1..lag 시차 값을 마지막 축에 쌓은 (시점 - lag, ..., lag) 배열"""
+    n = values.shape[0]
+    return np.stack([values[lag - k:n - k] for k in range(1, lag + 1)], axis=-1)
+
+
+def _granger_group(y, x, lags, min_obs):
+    """
+    결측 패턴이 같은 지표 묶음의 Granger 검정 (결측 행은 이미 제거된 상태).
+
+    Args:
+        y: (시점,) target
+        x: (시점, 지표) 지표 행렬
+        lags: 시차 목록
+        min_obs: 최소 표본 수
+
+    Returns:
+        dict: 통계량 이름 -> (시차, 지표) 배열
+    """
+    n, n_vars = x.shape
+    shape = (len(lags), n_vars)
+    out = {name: np.full(shape, np.nan) for name in ('nobs', 'f_stat', 'df_denom', 'p_value',
+                                                     'chi2_stat', 'chi2_p_value')}
+    # 상수 지표는 비제한 모형이 제한 모형과 같아 검정 불가
+    constant = np.ptp(x, axis=0) == 0 if n else np.ones(n_vars, dtype=bool)
+
+    for i, lag in enumerate(lags):
+        nobs = n - lag
+        df_denom = nobs - 2 * lag - 1
+        if n < min_obs or df_denom <= 0:
+            continue
+
+        # 제한 모형: 상수 + target 자기 시차 (모든 지표가 공유)
+        target = y[lag:]
+        restricted = np.column_stack([np.ones(nobs), _lag_block(y, lag)])
+        projector = np.linalg.pinv(restricted)                      # (k, nobs)
+        resid = target - restricted @ (projector @ target)
+        ssr_r = resid @ resid
+
+        # 비제한 모형: 지표 시차를 제한 모형 설계에 대해 잔차화 -> 추가 설명력만 계산
+        x_lags = _lag_block(x, lag).transpose(1, 0, 2)              # (지표, nobs, lag)
+        x_resid = x_lags - restricted @ (projector @ x_lags)
+        gram = x_resid.transpose(0, 2, 1) @ x_resid                 # (지표, lag, lag)
+        cross = x_resid.transpose(0, 2, 1) @ resid                  # (지표, lag)
+        explained = np.einsum('vi,vij,vj->v', cross, np.linalg.pinv(gram), cross)
+        ssr_u = np.maximum(ssr_r - explained, 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_stat = (ssr_r - ssr_u) / lag / (ssr_u / df_denom)
+            chi2_stat = nobs * (ssr_r - ssr_u) / ssr_u
+        f_stat[constant] = np.nan
+        chi2_stat[constant] = np.nan
+
+        out['nobs'][i] = nobs
+        out['df_denom'][i] = df_denom
+        out['f_stat'][i] = f_stat
+        out['p_value'][i] = stats.f.sf(f_stat, lag, df_denom)
+        out['chi2_stat'][i] = chi2_stat
+        out['chi2_p_value'][i] = stats.chi2.sf(chi2_stat, lag)
+    return out
+
+
+def _run_task(task):
+    """프로세스 풀 작업 단위: (target 이름, 지표 이름 목록, y, x, lags, min_obs) -> tidy DataFrame"""
+    target, indicators, y, x, lags, min_obs = task
+    out = _granger_group(y, x, lags, min_obs)
+    return pd.DataFrame({
+        'target': target,
+        'indicator': np.tile(indicators, len(lags)),
+        'lag': np.repeat(lags, len(indicators)),
+        'df_num': np.repeat(lags, len(indicators)),
+        **{name: values.ravel() for name, values in out.items()},
+    })
+
+
+def _build_tasks(frame, targets, indicators, lags, min_obs, workers):
+    """(target, 결측 패턴) 묶음별 작업 생성 (큰 묶음은 워커 수만큼 나눔)"""
+    tasks = []
+    for target in targets:
+        columns = [c for c in indicators if c != target]
+        y_all = frame[target].to_numpy(dtype=float)
+        x_all = frame[columns].to_numpy(dtype=float)
+        valid = ~np.isnan(x_all) & ~np.isnan(y_all)[:, None]
+
+        groups = {}
+        for j, column in enumerate(columns):
+            groups.setdefault(valid[:, j].tobytes(), []).append(j)
+        for members in groups.values():
+            rows = valid[:, members[0]]
+            step = max(1, math.ceil(len(members) / workers))
+            for start in range(0, len(members), step):
+                chunk = members[start:start + step]
+                tasks.append((target, [columns[j] for j in chunk], y_all[rows],
+                              x_all[np.ix_(rows, chunk)], lags, min_obs))
+    return tasks
+
+
+def granger_batch(df, targets, indicators=None, lags=range(1, 4), min_obs=MIN_OBS,
+                  workers=None, cache=True):
+    """
+    지표 x target x 시차 Granger 인과관계 일괄 검정.
+
+    Args:
+        df: 시계열 DataFrame (행 순서 = 시간 순서)
+        targets: 결과 변수 컬럼명 또는 목록 (예: 'BTC_Change_Pct')
+        indicators: 원인 후보 컬럼 목록 (None이면 모든 숫자 컬럼, target 자신은 제외)
+        lags: 검정할 시차 목록 (int면 1..lags)
+        min_obs: 쌍별 결측 제거 후 최소 표본 수 (부족하면 통계량 NaN)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        cache: True면 output/.analysis_cache에 결과 캐시 (ResponseCache 객체도 가능)
+
+    Returns:
+        pd.DataFrame: target, indicator, lag, nobs, f_stat, df_num, df_denom, p_value,
+                      chi2_stat, chi2_p_value (p_value 오름차순)
+    """
+    targets = [targets] if isinstance(targets, str) else list(targets)
+    if indicators is None:
+        indicators = list(df.select_dtypes(include='number').columns)
+    indicators = list(indicators)
+    lags = list(range(1, lags + 1)) if isinstance(lags, int) else sorted(lags)
+    columns = list(dict.fromkeys(targets + indicators))
+    frame = df[columns].astype(float)
+
+    params = {'data': data_fingerprint(frame), 'targets': targets, 'indicators': indicators,
+              'lags': lags, 'min_obs': min_obs}
+    store = None
+    if cache:
+        store = cache if isinstance(cache, ResponseCache) else ResponseCache(ANALYSIS_CACHE_DIR)
+        cached = store.get('granger_batch', params)
+        if cached is not None:
+            return cached
+
+    workers = workers or os.cpu_count() or 1
+    tasks = _build_tasks(frame, targets, indicators, lags, min_obs, workers)
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        parts = [_run_task(task) for task in tasks]
+    else:
+        with process_pool(workers) as pool:
+            parts = list(pool.map(_run_task, tasks))
+
+    result = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=RESULT_COLUMNS)
+    result = result[RESULT_COLUMNS].astype({'lag': int, 'df_num': int, 'nobs': 'Int64', 'df_denom': 'Int64'})
+    result = result.sort_values(['p_value', 'target', 'indicator', 'lag'], na_position='last',
+                                ignore_index=True)
+
+    if store is not None:
+        store.put('granger_batch', params, result)
+    return result
+
+
+def best_lags(results, alpha=0.05):
+    """
+    (target, indicator)별 p-value가 가장 작은 시차.
+
+    Args:
+        results: granger_batch 결과
+        alpha: 유의수준
+
+    Returns:
+        pd.DataFrame: results 컬럼 + significant (p_value < alpha), p_value 오름차순
+    """
+    valid = results.dropna(subset=['p_value'])
+    best = valid.loc[valid.groupby(['target', 'indicator'])['p_value'].idxmin()]
+    best = best.assign(significant=best['p_value'] < alpha)
+    return best.sort_values('p_value', ignore_index=True)
+
+
+def main():
+    """메인 실행 함수: Master DataFrame 전체 컬럼을 가격 변화율에 대해 screening"""
+    parser = argparse.ArgumentParser(description='Granger causality screening of master columns')
+    parser.add_argument('--target', default='price_change_pct',
+                        help='Target column (default: price_change_pct, derived from BTC_Price)')
+    parser.add_argument('--max-lag', type=int, default=3, help='Maximum lag in days (default: 3)')
+    parser.add_argument('--alpha', type=float, default=0.05, help='Significance level (default: 0.05)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached results')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.target in FEATURES:
+        df = load_features('master_data_integrated', [args.target])
+    else:
+        df = load_table('master_data_integrated')
+
+    indicators = [c for c in df.select_dtypes(include='number').columns if c != args.target]
+    results = granger_batch(df, args.target, indicators, lags=args.max_lag,
+                            workers=args.workers, cache=not args.no_cache)
+    best = best_lags(results, args.alpha)
+    logger.info(f"{len(indicators)} indicators x {args.max_lag} lags -> "
+                f"{int(best['significant'].sum())} significant (p < {args.alpha})")
+    print(best[['indicator', 'lag', 'nobs', 'f_stat', 'p_value', 'significant']].head(15).to_string(index=False))
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    results.to_csv(OUTPUT_DIR / "granger_screening.csv", index=False, encoding='utf-8-sig')
+    logger.info(f"Saved {OUTPUT_DIR / 'granger_screening.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+장중(분봉/시간봉) 가격 저장소 모듈
+Binance klines를 1m/1h 등 장중 간격으로 페이지 단위 수집해 월별 압축 Parquet으로 저장하고,
+필요한 구간만 읽어 임의 주기(1h, 4h, 1D 등)로 리샘플링
+
+- 저장 위치: data/intraday/{symbol}/{interval}/{YYYY-MM}.parquet (시각은 UTC, tz 없는 datetime64)
+- 수집: 요청당 최대 1000봉, 저장된 마지막 봉 다음 시각부터 페이지를 동시에 요청 (api_collector)
+  중단되면 체크포인트에 남은 페이지는 다시 받지 않음
+- pyarrow가 없으면 data_store와 같이 CSV로 대체
+- daily_intraday_features(): 일봉에서는 보이지 않는 장중 변동성/낙폭을 일별 컬럼으로 요약
+  (03_data_integration.py에서 Master DataFrame에 병합)
+
+실행 방법:
+  python intraday_store.py --interval 1h --start 2025-09-01 --end 2025-10-31
+  python intraday_store.py --interval 1m --start 2025-10-09 --end 2025-10-12
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from api_collector import Checkpoint, default_collector
+from data_store import HAS_PYARROW, PARQUET_COMPRESSION
+from response_cache import period_ttl
+
+logger = logging.getLogger(__name__)
+
+INTRADAY_DIR = Path("data/intraday")
+KLINES_URL = "https://api.binance.com/api/v3/klines"
+DEFAULT_SYMBOL = "BTCUSDT"
+KLINES_LIMIT = 1000
+
+# Binance 간격 -> 밀리초
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+    'taker_buy_quote', 'ignore'
+]
+BAR_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume',
+               'quote_volume', 'trades', 'taker_buy_base']
+
+# 리샘플링 집계 규칙 (OHLCV)
+RESAMPLE_AGG = {
+    'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+    'volume': 'sum', 'quote_volume': 'sum', 'trades': 'sum', 'taker_buy_base': 'sum',
+}
+
+
+def _to_ms(value):
+    """날짜/시각을 UTC 밀리초 타임스탬프로 변환 (tz 없는 값은 UTC로 간주)"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+def _end_of_range(end):
+    """종료 날짜가 시각 없는 날짜면 그날 마지막 시각까지 포함"""
+    ts = pd.Timestamp(end)
+    if ts == ts.normalize():
+        ts = ts + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)
+    return ts
+
+
+def klines_to_bars(rows):
+    """
+    Binance klines 응답(list of list)을 봉 DataFrame으로 변환.
+
+    Args:
+        rows: klines API 응답 행 목록
+
+    Returns:
+        pd.DataFrame: BAR_COLUMNS (timestamp는 봉 시작 시각, UTC)
+    """
+    raw = pd.DataFrame(rows, columns=KLINE_COLUMNS)
+    bars = pd.DataFrame({
+        'timestamp': pd.to_datetime(pd.to_numeric(raw['open_time']), unit='ms'),
+    })
+    for col in ['open', 'high', 'low', 'close', 'volume', 'quote_volume', 'taker_buy_base']:
+        bars[col] = pd.to_numeric(raw[col])
+    bars['trades'] = pd.to_numeric(raw['trades']).astype(np.int64)
+    return bars[BAR_COLUMNS]
+
+
+def fetch_klines(start, end, interval='1h', symbol=DEFAULT_SYMBOL, collector=None,
+                 timeout=30, workers=4, checkpoint=None):
+    """
+    Binance klines를 페이지 단위로 수집.
+    간격이 고정이므로 페이지(최대 1000봉) 시작 시각을 미리 계산해 동시에 요청하고,
+    속도는 api_collector의 호스트별 제한으로 조절
+
+    Args:
+        start: 시작 시각 (포함)
+        end: 종료 시각 (포함, 날짜만 주면 그날 끝까지)
+        interval: Binance 간격 ('1m', '1h', '1d' 등)
+        symbol: 거래쌍
+        collector: ApiCollector (None이면 프로세스 공유 기본 수집기)
+        timeout: 요청 타임아웃(초)
+        workers: 동시 요청 수
+        checkpoint: api_collector.Checkpoint (중단된 백필 재개용)
+
+    Returns:
+        pd.DataFrame: BAR_COLUMNS, 시각순 (실패한 페이지가 있으면 그 앞까지만)
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"지원하지 않는 interval: {interval} (사용 가능: {list(INTERVAL_MS)})")
+    step = INTERVAL_MS[interval]
+    start_ms, end_ms = _to_ms(start), _to_ms(_end_of_range(end))
+    collector = collector or default_collector()
+
+    page_span = step * KLINES_LIMIT
+    jobs = {}
+    for page_start in range(start_ms, end_ms + 1, page_span):
+        page_end = min(page_start + page_span - 1, end_ms)
+        params = {"symbol": symbol, "interval": interval, "startTime": page_start,
+                  "endTime": page_end, "limit": KLINES_LIMIT}
+        # 이미 끝난 페이지는 응답 캐시에 영구 보관, 진행 중인 마지막 페이지만 다시 요청
+        ttl = period_ttl(pd.Timestamp(page_end, unit='ms'))
+        jobs[f"{symbol}:{interval}:{page_start}"] = (KLINES_URL, params, ttl)
+    logger.info(f"Fetching {symbol} {interval} klines: {len(jobs)} page(s)")
+
+    results = collector.fetch_all(jobs, workers=workers, checkpoint=checkpoint, timeout=timeout)
+    pages = []
+    for key in jobs:
+        if key not in results:
+            # 빈 구간이 저장소에 남지 않도록 실패한 페이지 앞까지만 반환 (다시 실행하면 이어서 수집)
+            logger.error(f"Missing page {key}; keeping bars before it only")
+            break
+        if results[key]:
+            pages.append(klines_to_bars(results[key]))
+
+    if not pages:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    bars = pd.concat(pages, ignore_index=True)
+    return bars.drop_duplicates('timestamp').sort_values('timestamp').reset_index(drop=True)
+
+
+def _partition_dir(symbol, interval):
+    return INTRADAY_DIR / symbol / interval
+
+
+def _month_path(symbol, interval, month):
+    """월 파티션 파일 경로 (month: 'YYYY-MM')"""
+    suffix = '.parquet' if HAS_PYARROW else '.csv'
+    return _partition_dir(symbol, interval) / f"{month}{suffix}"
+
+
+def _read_partition(path, columns=None):
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, parse_dates=['timestamp'])
+
+
+def save_bars(bars, interval, symbol=DEFAULT_SYMBOL):
+    """
+    봉 데이터를 월별 파티션에 병합 저장 (같은 시각은 새 데이터로 교체).
+
+    Args:
+        bars: BAR_COLUMNS DataFrame
+        interval: Binance 간격
+        symbol: 거래쌍
+
+    Returns:
+        list: 저장한 파일 경로 목록
+    """
+    if bars.empty:
+        return []
+    _partition_dir(symbol, interval).mkdir(parents=True, exist_ok=True)
+    months = bars['timestamp'].dt.strftime('%Y-%m')
+    paths = []
+    for month, chunk in bars.groupby(months, sort=True):
+        path = _month_path(symbol, interval, month)
+        if path.exists():
+            chunk = pd.concat([_read_partition(path), chunk], ignore_index=True)
+            chunk = chunk.drop_duplicates('timestamp', keep='last')
+        chunk = chunk.sort_values('timestamp')[BAR_COLUMNS].reset_index(drop=True)
+        if path.suffix == '.parquet':
+            chunk.to_parquet(path, index=False, compression=PARQUET_COMPRESSION)
+        else:
+            chunk.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def load_bars(start=None, end=None, interval='1h', symbol=DEFAULT_SYMBOL, columns=None):
+    """
+    저장된 봉 중 구간에 걸친 월 파티션만 읽기.
+
+    Args:
+        start: 시작 시각, 포함 (None이면 처음부터)
+        end: 종료 시각, 포함 (날짜만 주면 그날 끝까지, None이면 끝까지)
+        interval: Binance 간격
+        symbol: 거래쌍
+        columns: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+
+    Returns:
+        pd.DataFrame: 시각순 봉 데이터 (저장된 데이터가 없으면 빈 DataFrame)
+    """
+    read_columns = None if columns is None else ['timestamp'] + [c for c in columns if c != 'timestamp']
+    start = pd.Timestamp(start) if start is not None else None
+    end = _end_of_range(end) if end is not None else None
+
+    paths = sorted(_partition_dir(symbol, interval).glob('*.parquet' if HAS_PYARROW else '*.csv'))
+    first = start.strftime('%Y-%m') if start is not None else None
+    last = end.strftime('%Y-%m') if end is not None else None
+    paths = [p for p in paths
+             if (first is None or p.stem >= first) and (last is None or p.stem <= last)]
+    if not paths:
+        return pd.DataFrame(columns=read_columns or BAR_COLUMNS)
+
+    bars = pd.concat([_read_partition(p, read_columns) for p in paths], ignore_index=True)
+    if start is not None:
+        bars = bars[bars['timestamp'] >= start]
+    if end is not None:
+        bars = bars[bars['timestamp'] <= end]
+    return bars.reset_index(drop=True)
+
+
+def update_bars(start, end, interval='1h', symbol=DEFAULT_SYMBOL, collector=None, workers=4):
+    """
+    구간의 봉을 저장소에 채우기 (저장된 마지막 봉 이후만 새로 요청).
+    받은 페이지는 체크포인트에 기록되므로 중단 후 다시 실행하면 남은 페이지만 요청
+
+    Args:
+        start: 시작 시각
+        end: 종료 시각 (날짜만 주면 그날 끝까지)
+        interval: Binance 간격
+        symbol: 거래쌍
+        collector: ApiCollector (None이면 기본 수집기)
+        workers: 동시 요청 수
+
+    Returns:
+        pd.DataFrame: 구간의 전체 봉 (저장분 + 새로 받은 봉)
+    """
+    step = pd.Timedelta(milliseconds=INTERVAL_MS[interval])
+    stored = load_bars(start, end, interval, symbol, columns=['timestamp'])
+    fetch_from = pd.Timestamp(start)
+    if not stored.empty and stored['timestamp'].iloc[0] <= fetch_from + step:
+        fetch_from = stored['timestamp'].iloc[-1] + step
+
+    if fetch_from <= _end_of_range(end):
+        checkpoint = Checkpoint(_partition_dir(symbol, interval) / '.checkpoint.jsonl')
+        new_bars = fetch_klines(fetch_from, end, interval, symbol, collector=collector,
+                                workers=workers, checkpoint=checkpoint)
+        saved = save_bars(new_bars, interval, symbol)
+        checkpoint.clear()
+        logger.info(f"Saved {len(new_bars)} new {interval} bars to {len(saved)} partition(s)")
+    else:
+        logger.info(f"{symbol} {interval} bars already stored for {start} ~ {end}")
+    return load_bars(start, end, interval, symbol)
+
+
+def resample_bars(bars, rule='1D'):
+    """
+    봉 데이터를 더 긴 주기로 리샘플링 (OHLCV 집계, 봉이 없는 구간은 제외).
+
+    Args:
+        bars: BAR_COLUMNS DataFrame (일부 컬럼만 있어도 됨)
+        rule: pandas 주기 문자열 ('15min', '1h', '4h', '1D' 등)
+
+    Returns:
+        pd.DataFrame: timestamp(구간 시작 시각) + 집계 컬럼
+    """
+    agg = {col: how for col, how in RESAMPLE_AGG.items() if col in bars.columns}
+    resampled = bars.set_index('timestamp').resample(rule, label='left', closed='left').agg(agg)
+    if 'close' in resampled.columns:
+        resampled = resampled[resampled['close'].notna()]
+    return resampled.reset_index()
+
+
+def daily_intraday_features(bars, prefix='btc_intraday_'):
+    """
+    장중 봉으로 일별 변동성 피처 계산 (UTC 날짜 기준).
+
+    - range_pct: (고가 - 저가) / 시가 x 100
+    - realized_vol_pct: 봉 로그수익률 제곱합의 제곱근 x 100
+    - max_drawdown_pct: 그날 장중 고점 대비 최대 낙폭 (종가 기준, 음수)
+    - max_bar_drop_pct: 봉 하나의 최대 하락률 (음수)
+    - volume: 거래량 합계
+
+    Args:
+        bars: 봉 DataFrame (timestamp, open, high, low, close, volume)
+        prefix: 결과 컬럼 접두사
+
+    Returns:
+        pd.DataFrame: date + 피처 컬럼 (봉이 없으면 빈 DataFrame)
+    """
+    names = ['range_pct', 'realized_vol_pct', 'max_drawdown_pct', 'max_bar_drop_pct', 'volume']
+    if bars.empty:
+        return pd.DataFrame(columns=['date'] + [prefix + n for n in names])
+
+    bars = bars.sort_values('timestamp')
+    date = bars['timestamp'].dt.normalize()
+    close = bars['close']
+    # 첫 봉은 같은 날 직전 봉이 없으므로 시가 대비 수익률 사용
+    prev_close = close.groupby(date).shift(1).fillna(bars['open'])
+    log_ret = np.log(close / prev_close)
+    drawdown = close / close.groupby(date).cummax() - 1
+
+    frame = pd.DataFrame({
+        'date': date,
+        'open': bars['open'], 'high': bars['high'], 'low': bars['low'],
+        'sq_ret': log_ret ** 2,
+        'drawdown': drawdown,
+        'bar_ret': close / prev_close - 1,
+        'volume': bars['volume'],
+    })
+    daily = frame.groupby('date').agg(
+        open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+        sq_ret=('sq_ret', 'sum'), drawdown=('drawdown', 'min'),
+        bar_ret=('bar_ret', 'min'), volume=('volume', 'sum'),
+    )
+    features = pd.DataFrame({
+        'range_pct': (daily['high'] - daily['low']) / daily['open'] * 100,
+        'realized_vol_pct': np.sqrt(daily['sq_ret']) * 100,
+        'max_drawdown_pct': daily['drawdown'] * 100,
+        'max_bar_drop_pct': daily['bar_ret'] * 100,
+        'volume': daily['volume'],
+    }, index=daily.index)
+    return features.add_prefix(prefix).reset_index()
+
+
+def main():
+    """장중 봉 수집 CLI"""
+    parser = argparse.ArgumentParser(description='Fetch intraday Binance klines into the columnar store')
+    parser.add_argument('--symbol', default=DEFAULT_SYMBOL, help=f'Trading pair (default: {DEFAULT_SYMBOL})')
+    parser.add_argument('--interval', default='1h', choices=list(INTERVAL_MS),
+                        help='Kline interval (default: 1h)')
+    parser.add_argument('--start', default='2025-09-01', help='Start date (YYYY-MM-DD, default: 2025-09-01)')
+    parser.add_argument('--end', default='2025-10-31', help='End date (YYYY-MM-DD, default: 2025-10-31)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent requests (default: 4)')
+    parser.add_argument('--resample', default=None,
+                        help='Print a resampled summary at this frequency (e.g. 4h, 1D)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    bars = update_bars(args.start, args.end, args.interval, args.symbol, workers=args.workers)
+    logger.info(f"{args.symbol} {args.interval}: {len(bars)} bars in {args.start} ~ {args.end}")
+
+    if args.resample and not bars.empty:
+        print(resample_bars(bars, args.resample).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
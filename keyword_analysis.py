@@ -0,0 +1,118 @@
+"""
+커뮤니티 키워드 집계 모듈
+쉼표로 구분된 keywords 컬럼을 행 반복 없이 벡터화 문자열 연산(str.split + explode)으로 펼치고,
+키워드 x (감성, 참여도, 날짜 등) 집계를 groupby 한 번으로 계산
+
+07_sentiment_analysis.py, 11_wordcloud_generation.py에서 공통으로 사용
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def explode_keywords(df, column='keywords', sep=',', columns=None):
+    """
+    키워드 컬럼을 (행, 키워드) 긴 형식으로 펼치기.
+    커뮤니티 데이터는 같은 키워드 문자열이 반복되므로 고유 문자열만 분리한 뒤
+    행 단위로는 정수 코드 배열 연산으로 펼침
+
+    Args:
+        df: 커뮤니티 레코드 DataFrame
+        column: 키워드 컬럼명
+        sep: 키워드 구분자
+        columns: 키워드 행에 함께 붙일 원본 컬럼 목록 (None이면 없음)
+
+    Returns:
+        pd.DataFrame: keyword(categorical) + columns, 인덱스는 원본 행 위치 (0부터)
+                      (기존 루프와 같이 'a,,b'의 빈 키워드 ''도 하나의 키워드로 유지)
+    """
+    codes, uniques = pd.factorize(df[column])                 # 결측치는 -1
+
+    # 키워드 문자열이 하나도 없으면 (빈 DataFrame, 전부 결측) 빈 결과
+    if len(uniques) == 0:
+        long_df = pd.DataFrame({'keyword': pd.Categorical([], categories=[])},
+                               index=np.array([], dtype=np.int64))
+        for col in columns or []:
+            long_df[col] = df[col].to_numpy()[:0]
+        return long_df
+
+    # 고유 문자열만 분리: split.index = 고유 문자열 번호
+    split = pd.Series(uniques, dtype=object).astype(str).str.split(sep).explode().str.strip()
+    keyword_codes, vocab = pd.factorize(split, sort=True)
+    per_unique = np.bincount(split.index.to_numpy(dtype=np.int64), minlength=len(uniques))
+    offsets = np.concatenate([[0], np.cumsum(per_unique)])
+
+    # 행마다 해당 고유 문자열의 키워드 구간을 복제
+    row_counts = np.where(codes >= 0, per_unique[np.maximum(codes, 0)], 0)
+    positions = np.repeat(np.arange(len(df)), row_counts)
+    row_starts = np.cumsum(row_counts) - row_counts
+    within = np.arange(len(positions)) - np.repeat(row_starts, row_counts)
+    keyword = pd.Categorical.from_codes(keyword_codes[offsets[codes[positions]] + within],
+                                        categories=vocab)
+
+    long_df = pd.DataFrame({'keyword': keyword}, index=positions)
+    for col in columns or []:
+        # 원본 컬럼을 행 위치로 한 번에 복제 (join 없이)
+        long_df[col] = df[col].to_numpy()[positions]
+    return long_df
+
+
+def summarize_keywords(df, values=None, by=None, min_count=1, count_column=None,
+                       column='keywords', sep=','):
+    """
+    키워드별(또는 키워드 x by별) 등장 횟수와 평균값을 한 번의 groupby로 집계.
+
+    Args:
+        df: 커뮤니티 레코드 DataFrame
+        values: {결과 컬럼명: 원본 컬럼명} 평균을 낼 컬럼 (예: {'avg_sentiment': 'sentiment_score'})
+        by: 키워드와 함께 묶을 컬럼명 또는 목록 (예: 'date', 'platform')
+        min_count: 결과에 남길 최소 등장 횟수
+        count_column: count를 셀 원본 컬럼 (결측 제외, groupby(...).count()와 동일).
+                      None이면 키워드 등장 행 수
+        column: 키워드 컬럼명
+        sep: 키워드 구분자
+
+    Returns:
+        pd.DataFrame: keyword, [by...], count, [values...] 컬럼
+                      (count 내림차순, 동률은 키워드 이름순)
+    """
+    values = values or {}
+    by = [by] if isinstance(by, str) else list(by or [])
+
+    value_columns = list(dict.fromkeys(list(values.values()) + ([count_column] if count_column else [])))
+    long_df = explode_keywords(df, column, sep, columns=by + value_columns)
+    keys = ['keyword'] + by
+    grouped = long_df.groupby(keys, observed=True)
+
+    if count_column:
+        summary = grouped[count_column].count().rename('count').to_frame()
+    else:
+        summary = grouped.size().rename('count').to_frame()
+    if values:
+        means = grouped[list(dict.fromkeys(values.values()))].mean()
+        for out_name, src in values.items():
+            summary[out_name] = means[src]
+
+    summary = summary.reset_index()
+    summary['keyword'] = summary['keyword'].astype(str)
+    summary = summary[summary['count'] >= min_count]
+    return summary.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def keyword_lists_by_group(df, groups, column='keywords', sep=','):
+    """
+    그룹별 키워드 목록 (워드클라우드 입력용, 원본 등장 순서 유지).
+
+    Args:
+        df: 커뮤니티 레코드 DataFrame
+        groups: df와 같은 길이의 그룹 라벨 배열/Series
+        column: 키워드 컬럼명
+        sep: 키워드 구분자
+
+    Returns:
+        dict: 그룹 라벨 -> 키워드 문자열 list
+    """
+    long_df = explode_keywords(df, column, sep)
+    labels = np.asarray(groups)[long_df.index.to_numpy()]
+    keywords = long_df['keyword'].astype(str)
+    return {label: keywords[labels == label].tolist() for label in pd.unique(np.asarray(groups))}
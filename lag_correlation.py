@@ -0,0 +1,159 @@
+"""
+시차 상관(lag correlation) 계산 모듈
+여러 변수 x 여러 시차의 교차상관을 시차별 반복 없이 한 번의 벡터 연산으로 계산
+
+시차 규약 (모든 함수 공통):
+    lag_corr[k, x] = corr(x.shift(k), target)
+    k > 0 : x가 target보다 k일 선행 (x_t와 target_{t+k} 비교)
+    k < 0 : target이 x보다 |k|일 선행
+
+- 결측치는 pandas Series.corr와 동일하게 쌍별(pairwise) 제외
+- 시차마다 shift된 행렬을 (시차, 시점, 변수) 3차원 뷰로 쌓아 모멘트를 한 번에 계산
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+
+
+def _stacked_shifts(values, lags):
+    """
+    (시점, 변수) 배열을 시차별로 shift한 (시차, 시점, 변수) 뷰 생성 (복사 없음).
+    stacked[i] == values를 lags[i]만큼 shift한 것 (pandas shift와 동일하게 NaN 채움)
+    """
+    n = values.shape[0]
+    max_lag = max(abs(min(lags)), abs(max(lags)), 0)
+    padded = np.full((n + 2 * max_lag, values.shape[1]), np.nan)
+    padded[max_lag:max_lag + n] = values
+    # windows[s] == padded[s:s+n], shift(k)는 padded[max_lag-k : max_lag-k+n]
+    windows = sliding_window_view(padded, n, axis=0)  # (윈도우 수, 변수, 시점)
+    starts = max_lag - np.asarray(lags)
+    return windows[starts].transpose(0, 2, 1)
+
+
+def _masked_corr(x, y, min_periods, axis=-2):
+    """
+    NaN을 쌍별로 제외한 상관계수와 유효 표본 수.
+    x, y는 브로드캐스트 가능한 배열이며 axis가 시점 축
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=axis)
+    xv = np.where(valid, x, 0.0)
+    yv = np.where(valid, y, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx = xv.sum(axis=axis) / n
+        my = yv.sum(axis=axis) / n
+        dx = np.where(valid, x - np.expand_dims(mx, axis), 0.0)
+        dy = np.where(valid, y - np.expand_dims(my, axis), 0.0)
+        sxy = (dx * dy).sum(axis=axis)
+        sxx = (dx * dx).sum(axis=axis)
+        syy = (dy * dy).sum(axis=axis)
+        corr = sxy / np.sqrt(sxx * syy)
+
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[n < min_periods] = np.nan
+    return corr, n
+
+
+def correlation_pvalues(corr, n):
+    """
+    피어슨 상관계수의 양측 p-value (scipy.stats.pearsonr과 동일한 t 검정).
+
+    Args:
+        corr: 상관계수 배열
+        n: 같은 모양의 유효 표본 수 배열
+
+    Returns:
+        np.ndarray: p-value 배열 (n <= 2이면 NaN)
+    """
+    corr = np.asarray(corr, dtype=float)
+    dof = np.asarray(n, dtype=float) - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = corr * np.sqrt(dof / (1.0 - corr ** 2))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p = np.where(np.abs(corr) >= 1.0, 0.0, p)
+    return np.where(dof > 0, p, np.nan)
+
+
+def lag_correlation_matrix(df, target, columns=None, lags=range(-5, 6),
+                           pvalues=False, min_periods=3):
+    """
+    target과 여러 변수의 시차 x 변수 교차상관 행렬.
+
+    Args:
+        df: 시계열 DataFrame (행 순서 = 시간 순서)
+        target: 기준 컬럼명 (예: 'BTC_Price')
+        columns: 시차를 적용할 변수 목록 (None이면 target을 제외한 모든 숫자 컬럼)
+        lags: 시차 목록, 규약은 모듈 설명 참고 (양수 = 변수가 선행)
+        pvalues: True면 p-value와 표본 수도 함께 반환
+        min_periods: 상관계수를 계산할 최소 유효 표본 수
+
+    Returns:
+        pd.DataFrame: 시차(index) x 변수(columns) 상관계수
+        pvalues=True면 (상관계수, p-value, 표본 수) DataFrame 튜플
+    """
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != target]
+    columns = list(columns)
+    lags = list(lags)
+
+    x = df[columns].to_numpy(dtype=float)
+    y = df[target].to_numpy(dtype=float)[:, None]
+
+    stacked = _stacked_shifts(x, lags)                       # (시차, 시점, 변수)
+    corr, n = _masked_corr(stacked, y[None, :, :], min_periods)
+
+    index = pd.Index(lags, name='lag')
+    corr_df = pd.DataFrame(corr, index=index, columns=columns)
+    if not pvalues:
+        return corr_df
+
+    p_df = pd.DataFrame(correlation_pvalues(corr, n), index=index, columns=columns)
+    n_df = pd.DataFrame(n, index=index, columns=columns)
+    return corr_df, p_df, n_df
+
+
+def cross_lag_correlation(df, columns, lags=range(-5, 6), min_periods=3):
+    """
+    모든 변수 쌍의 시차 교차상관 (네트워크 분석용).
+
+    Args:
+        df: 시계열 DataFrame
+        columns: 변수 목록
+        lags: 시차 목록
+        min_periods: 최소 유효 표본 수
+
+    Returns:
+        np.ndarray: (시차, 변수, 변수) 배열, [k, i, j] = corr(columns[i].shift(k), columns[j])
+    """
+    x = df[list(columns)].to_numpy(dtype=float)
+    stacked = _stacked_shifts(x, list(lags))                 # (시차, 시점, i)
+    corr, _ = _masked_corr(stacked[:, :, :, None], x[None, :, None, :], min_periods, axis=1)
+    return corr
+
+
+def best_lags(corr_df, lag_range=None):
+    """
+    변수별로 |상관계수|가 최대인 시차 선택.
+
+    Args:
+        corr_df: lag_correlation_matrix 결과 (시차 x 변수)
+        lag_range: (최소, 최대) 시차로 후보 제한 (None이면 전체)
+
+    Returns:
+        pd.DataFrame: 변수별 best_lag, correlation (|상관계수| 내림차순)
+    """
+    if lag_range is not None:
+        lo, hi = lag_range
+        corr_df = corr_df.loc[(corr_df.index >= lo) & (corr_df.index <= hi)]
+
+    filled = corr_df.abs().fillna(-1.0)
+    valid = filled.max() >= 0
+    best = filled.loc[:, valid].idxmax()
+    result = pd.DataFrame({
+        'best_lag': best,
+        'correlation': [corr_df.at[lag, col] for col, lag in best.items()],
+    })
+    return result.sort_values('correlation', key=np.abs, ascending=False)
@@ -0,0 +1,165 @@
+"""
+시차 상관 유의성 검정 모듈 (Monte-Carlo)
+7-9일 같은 짧은 구간의 시차 상관은 표본 분포를 알 수 없으므로,
+지표 시계열을 수천 번 재표본화해 지표 x 시차 셀마다 경험적 p-value와 신뢰구간을 계산
+
+- 귀무분포: 지표 행을 무작위 순열(permutation) 또는 순환 블록 재표본(block, 자기상관 보존)한 뒤
+  lag_correlation과 같은 규약으로 시차 상관 계산 (target은 고정)
+- 신뢰구간: (지표 시차값, target) 쌍을 블록 단위로 함께 재표본한 bootstrap 분포의 분위수
+- 재표본 묶음을 (묶음, 시차, 시점, 지표) 배열 한 번의 연산으로 처리하고, 묶음은 프로세스 풀에 분산
+  (묶음별 seed는 SeedSequence로 고정 -> 워커 수와 무관하게 같은 결과)
+- 결과는 입력 데이터 해시 + 설정을 key로 output/.analysis_cache에 캐시
+
+시차 규약은 lag_correlation과 동일 (양수 lag = 지표가 target보다 선행)
+"""
+
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from lag_correlation import _masked_corr, _stacked_shifts
+from response_cache import ANALYSIS_CACHE_DIR, ResponseCache, data_fingerprint, process_pool
+
+# 묶음 하나가 만드는 (재표본 x 시차 x 시점 x 지표) 원소 수 상한 (메모리 ~ 8배 바이트)
+CHUNK_ELEMENTS = 2_000_000
+RESULT_COLUMNS = ['lag', 'indicator', 'correlation', 'n', 'p_value',
+                  'null_low', 'null_high', 'ci_low', 'ci_high']
+
+
+def default_block_size(n):
+    """블록 길이 기본값 (n^(1/3), 최소 2)"""
+    return max(2, int(round(n ** (1 / 3))))
+
+
+def resample_index(rng, n_resamples, n, method='permutation', block_size=None):
+    """
+    재표본 시점 인덱스.
+
+    Args:
+        rng: np.random.Generator
+        n_resamples: 재표본 수
+        n: 시점 수
+        method: 'permutation' (무작위 순열) 또는 'block' (순환 블록, 복원 추출)
+        block_size: 블록 길이 (None이면 default_block_size)
+
+    Returns:
+        np.ndarray: (n_resamples, n) 정수 인덱스
+    """
+    if method == 'permutation':
+        return rng.permuted(np.broadcast_to(np.arange(n), (n_resamples, n)), axis=1)
+    if method != 'block':
+        raise ValueError(f"지원하지 않는 method: {method}")
+    block_size = block_size or default_block_size(n)
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_resamples, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    return idx.reshape(n_resamples, -1)[:, :n]
+
+
+def _null_chunk(x, y, lags, method, block_size, min_periods, n_resamples, seed):
+    """귀무분포 묶음: 지표 행을 재표본한 뒤 시차 상관 -> (재표본, 시차, 지표)"""
+    rng = np.random.default_rng(seed)
+    n, n_vars = x.shape
+    idx = resample_index(rng, n_resamples, n, method, block_size)
+    # (재표본, 시점, 지표) -> (시점, 재표본 x 지표): 재표본을 변수 축에 펼쳐 한 번에 shift
+    flat = x[idx].transpose(1, 0, 2).reshape(n, n_resamples * n_vars)
+    corr, _ = _masked_corr(_stacked_shifts(flat, lags), y[None, :, None], min_periods)
+    return corr.reshape(len(lags), n_resamples, n_vars).transpose(1, 0, 2)
+
+
+def _bootstrap_chunk(x, y, lags, block_size, min_periods, n_resamples, seed):
+    """bootstrap 묶음: (시차값, target) 쌍을 블록 재표본 -> (재표본, 시차, 지표)"""
+    rng = np.random.default_rng(seed)
+    idx = resample_index(rng, n_resamples, len(y), 'block', block_size)
+    stacked = _stacked_shifts(x, lags)                       # (시차, 시점, 지표)
+    corr, _ = _masked_corr(stacked[:, idx, :], y[idx][None, :, :, None], min_periods)
+    return corr.transpose(1, 0, 2)
+
+
+def _run_chunks(func, n_resamples, chunk_size, seed, workers):
+    """
+    재표본을 묶음으로 나눠 (프로세스 풀에서) 실행하고 재표본 축으로 합침.
+    func(n_resamples, seed)는 (재표본, 시차, 지표) 배열을 반환하는 모듈 수준 함수의 partial
+    """
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = seed.spawn(len(sizes))
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        return np.concatenate([func(size, child) for size, child in zip(sizes, seeds)])
+    with process_pool(workers) as pool:
+        return np.concatenate(list(pool.map(func, sizes, seeds)))
+
+
+def leadlag_significance(df, target, columns=None, lags=range(-3, 4), n_resamples=10_000,
+                         null='permutation', block_size=None, ci=0.95, seed=42,
+                         workers=None, min_periods=3, cache=True):
+    """
+    지표 x 시차 셀별 시차 상관의 경험적 p-value, 귀무분포 구간, bootstrap 신뢰구간.
+
+    Args:
+        df: 시계열 DataFrame (행 순서 = 시간 순서)
+        target: 기준 컬럼명 (예: 'BTC_Change_Pct')
+        columns: 지표 목록 (None이면 target을 제외한 모든 숫자 컬럼)
+        lags: 시차 목록 (양수 = 지표가 선행)
+        n_resamples: 재표본 수
+        null: 귀무분포 재표본 방식 ('permutation' 또는 'block')
+        block_size: 블록 길이 (None이면 n^(1/3))
+        ci: 신뢰수준
+        seed: 난수 seed (같은 seed면 워커 수와 무관하게 같은 결과)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        min_periods: 상관계수를 계산할 최소 유효 표본 수
+        cache: True면 output/.analysis_cache에 결과 캐시 (ResponseCache 객체도 가능)
+
+    Returns:
+        pd.DataFrame: lag, indicator, correlation, n, p_value, null_low, null_high, ci_low, ci_high
+                      (p_value는 양측: |귀무 상관| >= |관측 상관| 비율, (1 + 개수) / (1 + 재표본 수))
+    """
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != target]
+    columns, lags = list(columns), list(lags)
+    frame = df[columns + [target]].astype(float)
+    block_size = block_size or default_block_size(len(frame))
+
+    params = {'data': data_fingerprint(frame), 'target': target, 'lags': lags,
+              'n_resamples': n_resamples, 'null': null, 'block_size': block_size,
+              'ci': ci, 'seed': seed, 'min_periods': min_periods}
+    store = None
+    if cache:
+        store = cache if isinstance(cache, ResponseCache) else ResponseCache(ANALYSIS_CACHE_DIR)
+        cached = store.get('leadlag_significance', params)
+        if cached is not None:
+            return cached
+
+    x = frame[columns].to_numpy()
+    y = frame[target].to_numpy()
+    observed, n = _masked_corr(_stacked_shifts(x, lags), y[None, :, None], min_periods)
+
+    chunk_size = max(1, CHUNK_ELEMENTS // max(1, len(lags) * len(y) * len(columns)))
+    null_seed, boot_seed = np.random.SeedSequence(seed).spawn(2)
+    null_corr = _run_chunks(partial(_null_chunk, x, y, lags, null, block_size, min_periods),
+                            n_resamples, chunk_size, null_seed, workers)
+    boot_corr = _run_chunks(partial(_bootstrap_chunk, x, y, lags, block_size, min_periods),
+                            n_resamples, chunk_size, boot_seed, workers)
+
+    alpha = (1 - ci) / 2
+    with np.errstate(invalid='ignore'):
+        exceed = (np.abs(null_corr) >= np.abs(observed)[None] - 1e-12).sum(axis=0)
+    valid = (~np.isnan(null_corr)).sum(axis=0)
+    p_value = np.where(np.isnan(observed) | (valid == 0), np.nan, (1 + exceed) / (1 + valid))
+    null_low, null_high = np.nanquantile(null_corr, [alpha, 1 - alpha], axis=0)
+    ci_low, ci_high = np.nanquantile(boot_corr, [alpha, 1 - alpha], axis=0)
+
+    grid = {'correlation': observed, 'n': n, 'p_value': p_value, 'null_low': null_low,
+            'null_high': null_high, 'ci_low': ci_low, 'ci_high': ci_high}
+    result = pd.DataFrame({
+        'lag': np.repeat(lags, len(columns)),
+        'indicator': np.tile(columns, len(lags)),
+        **{name: values.ravel() for name, values in grid.items()},
+    })[RESULT_COLUMNS]
+
+    if store is not None:
+        store.put('leadlag_significance', params, result)
+    return result
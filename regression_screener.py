@@ -0,0 +1,174 @@
+"""
+회귀 모형 일괄 screening 모듈
+후보 변수마다 LinearRegression + stats.linregress를 따로 적합하지 않고,
+후보 변수의 교차곱(Gram) 행렬을 한 번 계산해 모든 단순 회귀와 k개 이하 변수 조합의 다중 회귀를 닫힌 형태로 계산
+
+- screen_single(): 모든 후보의 단순 회귀를 (시점, 후보) 배열 연산 한 번으로
+  (결측은 stats.linregress처럼 변수별 쌍 제거, 결과는 linregress와 동일)
+- screen_subsets(): 중심화 Gram 행렬의 부분 블록을 (모형 수, k, k) 묶음으로 한 번에 역행렬
+  -> R², 수정 R², F 검정, 계수, 표준오차, p-value (결측은 사용하는 모든 후보 기준 행 제거)
+- 공선성이 심한 조합(블록 조건수 > MAX_CONDITION)은 NaN
+
+사용 예 (Master DataFrame 전체 컬럼을 BTC_Price 설명력 순으로):
+  screen_single(df, 'BTC_Price').head(10)
+  screen_subsets(df, 'BTC_Price', max_size=2, top=20)
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# 부분 Gram 블록(상관 행렬 스케일)의 조건수가 이보다 크면 공선성으로 보고 NaN
+MAX_CONDITION = 1e10
+SINGLE_COLUMNS = ['variable', 'coefficient', 'intercept', 'r2', 'r_value', 'p_value',
+                  'std_err', 'mae', 'rmse', 'nobs']
+SUBSET_COLUMNS = ['size', 'variables', 'r2', 'adj_r2', 'f_stat', 'f_p_value', 'nobs',
+                  'intercept', 'coef', 'std_err', 'p_values']
+
+
+def _candidates(df, target, candidates):
+    """후보 목록 (None이면 target을 제외한 모든 숫자 컬럼)"""
+    if candidates is None:
+        candidates = df.select_dtypes(include='number').columns
+    return [c for c in candidates if c != target]
+
+
+def screen_single(df, target, candidates=None, min_obs=3):
+    """
+    모든 후보 변수의 단순 회귀 (target ~ 절편 + 변수).
+
+    Args:
+        df: DataFrame
+        target: 종속변수 컬럼명 (예: 'BTC_Price')
+        candidates: 독립변수 후보 목록 (None이면 모든 숫자 컬럼)
+        min_obs: 최소 유효 관측치 수 (미만이면 결과에서 제외)
+
+    Returns:
+        pd.DataFrame: variable, coefficient, intercept, r2, r_value, p_value, std_err, mae, rmse, nobs
+                      (r2 내림차순)
+    """
+    candidates = _candidates(df, target, candidates)
+    x = df[candidates].to_numpy(dtype=float)
+    y = df[target].to_numpy(dtype=float)[:, None]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 변수별 유효 행 기준 평균을 빼고 계산 (두 번 스캔, 큰 값의 상쇄 오차 방지)
+        mx = np.where(valid, x, 0.0).sum(axis=0) / n
+        my = np.where(valid, y, 0.0).sum(axis=0) / n
+        dx = np.where(valid, x - mx, 0.0)
+        dy = np.where(valid, y - my, 0.0)
+        sxx = (dx * dx).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = my - slope * mx
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        dof = n - 2
+        t_value = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * stats.t.sf(np.abs(t_value), dof)
+        std_err = np.sqrt((1 - r ** 2) * syy / sxx / dof)
+        resid = np.where(valid, dy - slope * dx, 0.0)
+        mae = np.abs(resid).sum(axis=0) / n
+        rmse = np.sqrt((resid ** 2).sum(axis=0) / n)
+
+    result = pd.DataFrame({
+        'variable': candidates,
+        'coefficient': slope,
+        'intercept': intercept,
+        'r2': r ** 2,
+        'r_value': r,
+        'p_value': p_value,
+        'std_err': std_err,
+        'mae': mae,
+        'rmse': rmse,
+        'nobs': n,
+    })[SINGLE_COLUMNS]
+    result = result[(n >= min_obs) & (sxx > 0)]
+    return result.sort_values('r2', ascending=False, ignore_index=True)
+
+
+def screen_subsets(df, target, candidates=None, max_size=2, min_size=1, top=None, min_obs=None):
+    """
+    k개 이하 변수 조합의 다중 회귀를 중심화 Gram 행렬 한 번으로 계산.
+
+    Args:
+        df: DataFrame
+        target: 종속변수 컬럼명
+        candidates: 독립변수 후보 목록 (None이면 모든 숫자 컬럼)
+        max_size: 조합의 최대 변수 수
+        min_size: 조합의 최소 변수 수
+        top: 수정 R² 상위 몇 개만 반환할지 (None이면 전체)
+        min_obs: 최소 관측치 수 (기본: max_size + 2)
+
+    Returns:
+        pd.DataFrame: size, variables (튜플), r2, adj_r2, f_stat, f_p_value, nobs, intercept,
+                      coef / std_err / p_values (variables 순서의 튜플), 수정 R² 내림차순
+    """
+    candidates = _candidates(df, target, candidates)
+    frame = df[candidates + [target]].astype(float).dropna()
+    # 표본 안에서 상수인 후보는 절편과 구별할 수 없으므로 제외
+    candidates = [c for c in candidates if frame[c].std() > 0]
+    n = len(frame)
+    if n < (min_obs or max_size + 2) or not candidates:
+        return pd.DataFrame(columns=SUBSET_COLUMNS)
+
+    values = frame[candidates + [target]].to_numpy()
+    means = values.mean(axis=0)
+    centered = values - means
+    gram = centered.T @ centered                        # (k + 1, k + 1), 마지막 행/열이 target
+    scale = np.sqrt(np.diag(gram))
+    x_mean, y_mean = means[:-1], means[-1]
+    syy = gram[-1, -1]
+    target_idx = len(candidates)
+
+    parts = []
+    for size in range(min_size, min(max_size, len(candidates)) + 1):
+        dof = n - size - 1
+        if dof <= 0:
+            break
+        subsets = np.array(list(combinations(range(len(candidates)), size)))
+        block = gram[subsets[:, :, None], subsets[:, None, :]]          # (모형, size, size)
+        cross = gram[subsets, target_idx]                               # (모형, size)
+
+        # 상관 행렬 스케일에서 조건수 확인 (단위가 다른 변수도 공정하게 비교, 대칭이라 고유값으로)
+        s = scale[subsets]
+        eig = np.linalg.eigvalsh(block / (s[:, :, None] * s[:, None, :]))
+        ok = eig[:, 0] * MAX_CONDITION > eig[:, -1]
+        inv = np.full(block.shape, np.nan)
+        inv[ok] = np.linalg.inv(block[ok])
+        coef = np.einsum('mij,mj->mi', inv, cross)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ssr = np.maximum(syy - np.einsum('mi,mi->m', coef, cross), 0.0)
+            r2 = 1 - ssr / syy
+            adj_r2 = 1 - (1 - r2) * (n - 1) / dof
+            f_stat = (r2 / size) / ((1 - r2) / dof)
+            std_err = np.sqrt(ssr[:, None] / dof * np.diagonal(inv, axis1=1, axis2=2))
+            p_values = 2 * stats.t.sf(np.abs(coef / std_err), dof)
+        intercept = y_mean - np.einsum('mi,mi->m', coef, x_mean[subsets])
+
+        names = np.array(candidates, dtype=object)[subsets]
+        parts.append(pd.DataFrame({
+            'size': size,
+            'variables': list(map(tuple, names)),
+            'r2': r2,
+            'adj_r2': adj_r2,
+            'f_stat': f_stat,
+            'f_p_value': stats.f.sf(f_stat, size, dof),
+            'nobs': n,
+            'intercept': intercept,
+            'coef': list(map(tuple, coef.tolist())),
+            'std_err': list(map(tuple, std_err.tolist())),
+            'p_values': list(map(tuple, p_values.tolist())),
+        }))
+
+    if not parts:
+        return pd.DataFrame(columns=SUBSET_COLUMNS)
+    result = pd.concat(parts, ignore_index=True)[SUBSET_COLUMNS]
+    result = result.sort_values('adj_r2', ascending=False, na_position='last', ignore_index=True)
+    return result if top is None else result.head(top)
@@ -0,0 +1,204 @@
+"""
+수집 응답 디스크 캐시 모듈
+수집 스크립트를 다시 실행할 때 바뀔 수 없는 과거 구간의 API/yfinance 응답을 다시 내려받지 않도록
+요청(네임스페이스 + 파라미터)별로 응답을 디스크에 보관
+
+- 내용 주소 저장: 응답은 내용 SHA-256 이름의 blob으로 한 번만 저장하고,
+  요청 SHA-256 이름의 참조 파일이 blob과 만료 시각을 가리킴 (같은 응답은 blob 공유)
+- TTL 정책: period_ttl(end) - 이미 끝난 과거 구간은 만료 없음(IMMUTABLE),
+  아직 진행 중인 구간(열린 꼬리)은 OPEN_TTL 후 다시 요청
+- 빈 응답(None, 빈 DataFrame)은 저장하지 않음 (일시적 실패가 캐시에 남지 않도록)
+- hits / misses 카운터로 캐시 효과 확인
+- 분석 엔진(leadlag_significance, granger_batch, walk_forward) 공용: 결과 캐시 경로(ANALYSIS_CACHE_DIR),
+  입력 데이터 지문(data_fingerprint), 프로세스 풀(process_pool)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path("data/.response_cache")
+# 분석 결과(재표본 분포, Granger 검정, 적합 모델) 캐시
+ANALYSIS_CACHE_DIR = Path("output/.analysis_cache")
+
+# 만료 없음 (닫힌 과거 구간)
+IMMUTABLE = float('inf')
+# 진행 중인 구간의 재요청 주기(초)
+OPEN_TTL = 3600
+# 구간 종료 후 데이터가 확정될 때까지의 여유 (일봉 마감, 지연 집계 등)
+SETTLE_TIME = pd.Timedelta(days=1)
+
+_MISSING = object()
+
+
+def period_ttl(end, open_ttl=OPEN_TTL, settle=SETTLE_TIME):
+    """
+    요청 구간 종료 시각에 따른 TTL.
+
+    Args:
+        end: 구간 종료 시각 (tz 없는 값은 UTC로 간주)
+        open_ttl: 진행 중인 구간의 TTL(초)
+        settle: 종료 후 확정까지의 여유
+
+    Returns:
+        float: 닫힌 과거 구간이면 IMMUTABLE, 아니면 open_ttl
+    """
+    end = pd.Timestamp(end)
+    if end.tzinfo is not None:
+        end = end.tz_convert('UTC').tz_localize(None)
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+    return IMMUTABLE if end + settle < now else open_ttl
+
+
+def data_fingerprint(frame):
+    """분석 결과 캐시 key용 입력 데이터 내용 해시 (컬럼명 + 값)"""
+    digest = hashlib.sha256(repr(list(frame.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def process_pool(workers):
+    """
+    분석 엔진 공용 프로세스 풀.
+    모듈 수준 코드가 있는 분석 스크립트에서 호출돼도 워커가 스크립트를 다시 실행하지 않도록
+    가능하면 fork 컨텍스트 사용 (없는 플랫폼은 기본 컨텍스트)
+
+    Args:
+        workers: 워커 프로세스 수
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _is_empty(value):
+    return value is None or getattr(value, 'empty', False)
+
+
+class ResponseCache:
+    """
+    요청별 응답 디스크 캐시 (스레드/프로세스 안전한 원자적 쓰기).
+
+    Args:
+        root: 캐시 디렉토리
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ResponseCache({str(self.root)!r}, hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def key(namespace, params=None):
+        """요청 key: (네임스페이스, 정렬된 파라미터)의 SHA-256"""
+        payload = json.dumps([namespace, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _ref_path(self, key):
+        return self.root / 'refs' / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest):
+        return self.root / 'blobs' / digest[:2] / f"{digest}.pkl"
+
+    @staticmethod
+    def _write(path, data):
+        """임시 파일에 쓴 뒤 교체 (동시에 읽는 쪽이 잘린 파일을 보지 않도록)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, namespace, params=None, default=None):
+        """
+        캐시된 응답 (없거나 만료됐으면 default).
+
+        Args:
+            namespace: 요청 구분 (URL, 'yfinance' 등)
+            params: 요청 파라미터 dict
+
+        Returns:
+            캐시된 응답 또는 default
+        """
+        ref_path = self._ref_path(self.key(namespace, params))
+        try:
+            ref = json.loads(ref_path.read_text(encoding='utf-8'))
+            expires = ref['expires']
+            if expires is not None and time.time() >= expires:
+                raise KeyError('expired')
+            value = pickle.loads(self._blob_path(ref['content']).read_bytes())
+        except (OSError, KeyError, ValueError, pickle.UnpicklingError, EOFError):
+            self._count(hit=False)
+            return default
+        self._count(hit=True)
+        return value
+
+    def put(self, namespace, params, value, ttl=IMMUTABLE):
+        """
+        응답 저장.
+
+        Args:
+            namespace: 요청 구분
+            params: 요청 파라미터 dict
+            value: 응답 (pickle 가능한 객체)
+            ttl: 유효 시간(초, IMMUTABLE이면 만료 없음)
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(blob).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            self._write(blob_path, blob)
+        now = time.time()
+        ref = {'namespace': str(namespace), 'content': digest, 'created': now,
+               'expires': None if ttl == IMMUTABLE else now + ttl}
+        self._write(self._ref_path(self.key(namespace, params)), json.dumps(ref).encode('utf-8'))
+
+    def cached(self, namespace, params, fetch, ttl=IMMUTABLE):
+        """
+        캐시에 있으면 반환하고, 없으면 fetch()를 호출해 저장 후 반환.
+
+        Args:
+            namespace: 요청 구분
+            params: 요청 파라미터 dict
+            fetch: 인자 없이 응답을 반환하는 함수 (네트워크 요청)
+            ttl: 유효 시간(초)
+
+        Returns:
+            응답
+        """
+        value = self.get(namespace, params, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = fetch()
+        if not _is_empty(value):
+            self.put(namespace, params, value, ttl)
+        return value
+
+    def stats(self):
+        """hit / miss 수와 저장된 참조/blob 수"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': sum(1 for _ in (self.root / 'refs').glob('*/*.json')),
+            'blobs': sum(1 for _ in (self.root / 'blobs').glob('*/*.pkl')),
+        }
@@ -0,0 +1,283 @@
+"""
+이동/확장 구간 OLS 회귀 모듈
+구간마다 LinearRegression을 다시 적합하지 않고, 관측치 하나가 들어오고 나갈 때
+Gram 행렬(X'X)과 X'y를 rank-one 갱신해 전 구간의 계수 경로를 한 번에 계산
+
+- rolling_ols(): 행별 외적(x x')의 누적합(prefix sum) 두 행의 차이로 모든 구간의 충분통계량을 만들고,
+  (구간, k, k) 묶음 역행렬 한 번으로 계수, 표준오차, p-value, R² 경로 계산 (window=None이면 확장 구간)
+- RecursiveOLS: 실시간/시간봉용 스트리밍 추정기. Sherman-Morrison 공식으로 (X'X)^-1과 계수를
+  관측치마다 O(k²)에 갱신 (이동 구간이면 가장 오래된 관측치를 downdate)
+- 결측 행은 구간에서 제외하고, 구간 안에서 설계 행렬이 특이(상수 컬럼 등)하면 NaN
+
+큰 값(BTC 가격, M2 등)의 상쇄 오차를 줄이기 위해 전체 평균/표준편차로 표준화한 뒤 누적하고
+계수는 원래 스케일로 되돌림 (OLS는 아핀 변환에 대해 동변이라 결과는 동일)
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# 표준화된 Gram 행렬의 조건수가 이보다 크면 특이 구간으로 보고 NaN
+MAX_CONDITION = 1e10
+
+
+def _as_frame(X):
+    """X를 DataFrame으로 (1차원 배열/Series는 컬럼 하나)"""
+    if isinstance(X, pd.DataFrame):
+        return X
+    if isinstance(X, pd.Series):
+        return X.to_frame()
+    values = np.asarray(X, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return pd.DataFrame(values, columns=[f"x{i}" for i in range(values.shape[1])])
+
+
+def _scale(values, valid, center):
+    """유효 행 기준 평균/표준편차 (상수 컬럼은 표준편차 1)"""
+    if not valid.any():
+        return np.zeros(values.shape[1:]), np.ones(values.shape[1:])
+    mean = values[valid].mean(axis=0) if center else np.zeros(values.shape[1:])
+    std = values[valid].std(axis=0)
+    return mean, np.where(std > 0, std, 1.0)
+
+
+def rolling_ols(X, y, window=None, min_periods=None, add_intercept=True):
+    """
+    이동(window) 또는 확장(window=None) 구간 OLS의 전체 계수 경로.
+
+    Args:
+        X: 독립변수 (DataFrame, Series 또는 (시점, k) 배열)
+        y: 종속변수 (시점,)
+        window: 구간 길이(행 수), None이면 처음부터 해당 시점까지 (확장 구간)
+        min_periods: 계수를 계산할 최소 유효 관측치 수 (기본: 모수 개수 + 1)
+        add_intercept: 절편 포함 여부
+
+    Returns:
+        dict: 구간 끝 시점을 index로 하는
+            coef, std_err, t_value, p_value (DataFrame: [const] + 변수),
+            r2, adj_r2, sigma (잔차 표준편차), nobs (Series)
+    """
+    X = _as_frame(X)
+    names = (['const'] if add_intercept else []) + [str(c) for c in X.columns]
+    index = X.index
+    x = X.to_numpy(dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_rows, k = x.shape
+    p = k + int(add_intercept)
+    min_periods = max(p + 1, min_periods or 0)
+
+    valid = np.isfinite(x).all(axis=1) & np.isfinite(y)
+    x_mean, x_std = _scale(x, valid, add_intercept)
+    y_mean, y_std = _scale(y[:, None], valid, add_intercept)
+    z = np.where(valid[:, None], (x - x_mean) / x_std, 0.0)
+    t = np.where(valid, (y - y_mean[0]) / y_std[0], 0.0)
+    design = np.column_stack([valid.astype(float), z]) if add_intercept else z
+
+    # 누적합: [i] = 0..i-1행의 합 -> 구간 [a, b)의 합 = [b] - [a]
+    def prefix(values):
+        out = np.zeros((n_rows + 1,) + values.shape[1:])
+        np.cumsum(values, axis=0, out=out[1:])
+        return out
+
+    gram = prefix(design[:, :, None] * design[:, None, :])
+    cross = prefix(design * t[:, None])
+    tt = prefix(t * t)
+    ts = prefix(t)
+    count = prefix(valid.astype(float))
+
+    end = np.arange(1, n_rows + 1)
+    start = np.zeros(n_rows, dtype=int) if window is None else np.maximum(end - window, 0)
+    A = gram[end] - gram[start]
+    b = cross[end] - cross[start]
+    syy = tt[end] - tt[start]
+    sy = ts[end] - ts[start]
+    n = count[end] - count[start]
+
+    ok = n >= min_periods
+    ok[ok] = np.linalg.cond(A[ok]) < MAX_CONDITION
+    inv = np.full((n_rows, p, p), np.nan)
+    inv[ok] = np.linalg.inv(A[ok])
+    beta = np.einsum('nij,nj->ni', inv, b)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ssr = np.maximum(syy - np.einsum('ni,ni->n', beta, b), 0.0)
+        tss = syy - sy ** 2 / n if add_intercept else syy
+        dof = n - p
+        r2 = 1 - ssr / tss
+        adj_r2 = 1 - (1 - r2) * (n - int(add_intercept)) / dof
+        sigma2 = ssr / dof
+
+    # 표준화 스케일 -> 원래 스케일: coef = M beta (+ 절편 평행이동), cov = M cov_z M'
+    transform = np.diag(np.r_[[y_std[0]] if add_intercept else [], y_std[0] / x_std])
+    if add_intercept:
+        transform[0, 1:] = -y_std[0] * x_mean / x_std
+    coef = beta @ transform.T
+    if add_intercept:
+        coef[:, 0] += y_mean[0]
+    cov = transform @ (sigma2[:, None, None] * inv) @ transform.T
+    std_err = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 0.0))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_value = coef / std_err
+    p_value = 2 * stats.t.sf(np.abs(t_value), dof[:, None])
+
+    frame = lambda values: pd.DataFrame(values, index=index, columns=names)
+    series = lambda values: pd.Series(values, index=index)
+    return {
+        'coef': frame(coef),
+        'std_err': frame(std_err),
+        't_value': frame(t_value),
+        'p_value': frame(p_value),
+        'r2': series(np.where(ok, r2, np.nan)),
+        'adj_r2': series(np.where(ok, adj_r2, np.nan)),
+        'sigma': series(np.where(ok, np.sqrt(sigma2), np.nan)),
+        'nobs': series(n.astype(int)),
+    }
+
+
+class RecursiveOLS:
+    """
+    관측치 단위로 갱신하는 재귀 최소제곱(RLS) 추정기 (스트리밍용).
+
+    (X'X)^-1과 계수를 Sherman-Morrison 공식으로 갱신하므로 관측치당 O(k²).
+    설계 행렬이 처음 정칙이 될 때와 refresh번 갱신마다 누적 통계량으로 정확히 다시 풀어
+    부동소수 오차가 쌓이지 않도록 함. 절편이 있으면 첫 관측치를 기준점으로 빼고 누적
+    (CorrelationService의 offset과 같은 이유, 계수는 원래 좌표로 되돌려 반환).
+
+    Args:
+        n_features: 독립변수 개수
+        window: 이동 구간 길이 (None이면 확장 구간)
+        add_intercept: 절편 포함 여부
+        refresh: 정확한 재계산 주기 (갱신 횟수)
+    """
+
+    def __init__(self, n_features, window=None, add_intercept=True, refresh=500):
+        self.window = window
+        self.add_intercept = add_intercept
+        self.refresh = refresh
+        self.n_params = n_features + int(add_intercept)
+        self._gram = np.zeros((self.n_params, self.n_params))
+        self._cross = np.zeros(self.n_params)
+        self._syy = 0.0
+        self._sy = 0.0
+        self._buffer = deque()
+        self._inv = None
+        self._beta = None
+        self._updates = 0
+        self._x_offset = None
+        self._y_offset = 0.0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __repr__(self):
+        return f"RecursiveOLS(n_params={self.n_params}, nobs={len(self)}, window={self.window})"
+
+    def _row(self, x, y):
+        """기준점을 뺀 설계 행과 target"""
+        x = np.asarray(x, dtype=float).ravel()
+        if not self.add_intercept:
+            return x, y
+        if self._x_offset is None:
+            self._x_offset, self._y_offset = x.copy(), y
+        return np.r_[1.0, x - self._x_offset], y - self._y_offset
+
+    def _solve(self):
+        """누적 통계량으로 정확히 다시 풀기 (특이하면 None)"""
+        self._updates = 0
+        scale = np.sqrt(np.diag(self._gram))
+        if len(self) <= self.n_params or not (scale > 0).all() or \
+                np.linalg.cond(self._gram / np.outer(scale, scale)) >= MAX_CONDITION:
+            self._inv = self._beta = None
+            return
+        self._inv = np.linalg.inv(self._gram)
+        self._beta = self._inv @ self._cross
+
+    def _rank_one(self, row, target, sign):
+        """(X'X)^-1, beta에 관측치 하나를 추가(sign=1) 또는 제거(sign=-1)"""
+        pr = self._inv @ row
+        denom = 1.0 + sign * row @ pr
+        if abs(denom) < 1e-12:
+            self._solve()
+            return
+        self._inv -= sign * np.outer(pr, pr) / denom
+        self._beta += sign * (self._inv @ row) * (target - row @ self._beta)
+
+    def _accumulate(self, row, target, sign):
+        self._gram += sign * np.outer(row, row)
+        self._cross += sign * row * target
+        self._syy += sign * target * target
+        self._sy += sign * target
+
+    def update(self, x, y):
+        """
+        관측치 하나 추가 (이동 구간이 가득 찼으면 가장 오래된 관측치 제거).
+
+        Args:
+            x: 독립변수 값 (길이 n_features)
+            y: 종속변수 값 (결측이면 무시)
+
+        Returns:
+            np.ndarray: 갱신된 계수 (아직 추정 불가면 None)
+        """
+        if not (np.isfinite(np.asarray(x, dtype=float)).all() and np.isfinite(y)):
+            return self.coef
+        row, target = self._row(x, float(y))
+        changes = [(row, target, 1.0)]
+        self._buffer.append((row, target))
+        if self.window is not None and len(self._buffer) > self.window:
+            old_row, old_y = self._buffer.popleft()
+            changes.append((old_row, old_y, -1.0))
+
+        for r, target, sign in changes:
+            self._accumulate(r, target, sign)
+        self._updates += 1
+        if self._inv is None or self._updates >= self.refresh:
+            self._solve()
+        else:
+            for r, target, sign in changes:
+                self._rank_one(r, target, sign)
+                if self._inv is None:
+                    break
+        return self.coef
+
+    def _restore(self):
+        """기준점 좌표 -> 원래 좌표 변환 벡터 (절편 = c @ beta + y 기준점)"""
+        return np.r_[1.0, -self._x_offset]
+
+    @property
+    def coef(self):
+        """현재 계수 ([절편] + 변수 순서)"""
+        if self._beta is None:
+            return None
+        coef = self._beta.copy()
+        if self.add_intercept:
+            coef[0] = self._restore() @ self._beta + self._y_offset
+        return coef
+
+    def summary(self):
+        """
+        현재 구간의 계수, 표준오차, R².
+
+        Returns:
+            dict: coef, std_err, r2, nobs (추정 불가면 coef/std_err/r2는 None)
+        """
+        n = len(self)
+        if self._beta is None:
+            return {'coef': None, 'std_err': None, 'r2': None, 'nobs': n}
+        ssr = max(self._syy - self._beta @ self._cross, 0.0)
+        tss = self._syy - self._sy ** 2 / n if self.add_intercept else self._syy
+        sigma2 = ssr / (n - self.n_params)
+        variance = sigma2 * np.diag(self._inv)
+        if self.add_intercept:
+            c = self._restore()
+            variance[0] = sigma2 * c @ self._inv @ c
+        return {
+            'coef': self.coef,
+            'std_err': np.sqrt(np.maximum(variance, 0.0)),
+            'r2': 1 - ssr / tss if tss > 0 else np.nan,
+            'nobs': n,
+        }
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분(incremental) 파이프라인 실행기
+00~14 단계 스크립트의 입력/출력을 선언하고, 입력 지문(내용 해시 + mtime)이
+바뀐 단계만 다시 실행. 서로 의존하지 않는 단계(04/05/06/10/12 등)는
+별도 워커 프로세스에서 병렬 실행
+
+실행 방법:
+  python run_pipeline.py                    # 변경된 단계만 실행
+  python run_pipeline.py --dry-run          # 실행 계획만 출력
+  python run_pipeline.py --force 03         # 03과 그 하위 단계 강제 재실행
+  python run_pipeline.py --only 04 05       # 지정 단계만 대상으로 실행
+  python run_pipeline.py --workers 4
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+STATE_FILE = Path(".pipeline_state.json")
+LOG_DIR = Path("output/logs")
+
+PROCESSED = "data/processed"
+CLEANED = "data/processed/cleaned"
+MASTER = [
+    "data/processed/integrated/master_data_integrated.parquet",
+    "data/processed/integrated/master_data_integrated.csv",
+]
+VIS = "output/visualizations"
+COMMUNITY_RECORDS = "data/Community_data/FINAL_10K_RECORDS.csv"
+# 04~12 단계가 공통으로 import 하는 로컬 모듈
+# (figure_renderer -> feature_store -> data_store)
+ANALYSIS_LIBS = ["data_store.py", "feature_store.py", "figure_renderer.py"]
+# walk_forward 가 import 하는 로컬 모듈
+WALK_FORWARD_LIBS = ["walk_forward.py", "response_cache.py"]
+
+# 단계 선언: 스크립트, 입력, 출력 (glob 패턴 허용)
+# 스크립트 파일 자체도 입력으로 취급하므로 코드가 바뀌면 해당 단계가 다시 실행됨
+STAGES = {
+    '00': {
+        'script': 'features_daily_builder.py',
+        'inputs': ["data/news/bitcoin_news_*.csv"],
+        'outputs': [f"{PROCESSED}/features_daily.csv"],
+    },
+    '01': {
+        'script': '01_data_loading_validation.py',
+        'inputs': [
+            f"{PROCESSED}/bitcoin_news_merged_0.csv",
+            f"{PROCESSED}/features_daily.csv",
+            f"{PROCESSED}/gdelt_articles_modified_0.csv",
+            f"{PROCESSED}/merged_정형데이터/*.csv",
+            f"{PROCESSED}/SNS_Youtube_data/FINAL_SNS_YOUTUBE.csv",
+        ],
+        'outputs': [],
+    },
+    '02': {
+        'script': '02_data_cleaning_standardization.py',
+        'inputs': [
+            f"{PROCESSED}/bitcoin_news_merged_0.csv",
+            f"{PROCESSED}/features_daily.csv",
+            f"{PROCESSED}/gdelt_articles_modified_0.csv",
+            f"{PROCESSED}/merged_정형데이터/*.csv",
+            f"{PROCESSED}/SNS_Youtube_data/FINAL_SNS_YOUTUBE.csv",
+            "date_parsing.py",
+            "data_store.py",
+        ],
+        'outputs': [
+            f"{CLEANED}/*_cleaned.parquet",
+            f"{CLEANED}/m2_inflation_daily_expanded.parquet",
+        ],
+    },
+    '03': {
+        'script': '03_data_integration.py',
+        'inputs': [
+            f"{CLEANED}/features_daily_cleaned.parquet",
+            f"{CLEANED}/daily_data_cleaned.parquet",
+            f"{CLEANED}/m2_inflation_daily_expanded.parquet",
+            f"{CLEANED}/sns_youtube_cleaned.parquet",
+            "data/intraday/*/*/*.parquet",
+            "data_store.py",
+            "intraday_store.py",
+            "feature_store.py",
+        ],
+        'outputs': MASTER + ["data/processed/integrated/master_data_summary.txt"],
+    },
+    '04': {
+        'script': '04_price_visualization.py',
+        'inputs': MASTER + ANALYSIS_LIBS,
+        'outputs': [f"{VIS}/01_btc_price_timeseries.png", f"{VIS}/02_btc_price_vs_sns.png"],
+    },
+    '05': {
+        'script': '05_correlation_heatmap.py',
+        'inputs': MASTER + ANALYSIS_LIBS + ["correlation_service.py"],
+        'outputs': [
+            f"{VIS}/03_correlation_heatmap_full.png",
+            f"{VIS}/04_correlation_heatmap_key_vars.png",
+            f"{VIS}/05_btc_correlation_bar.png",
+        ],
+    },
+    '06': {
+        'script': '06_political_themes_analysis.py',
+        'inputs': MASTER + ANALYSIS_LIBS + ["data/news/bitcoin_news_*.csv", "theme_matrix.py",
+                                            "features_daily_builder.py", "lag_correlation.py"],
+        'outputs': [
+            f"{VIS}/06_political_themes_timeseries.png",
+            f"{VIS}/07_political_themes_lag_correlation.png",
+        ],
+    },
+    '07': {
+        'script': '07_sentiment_analysis.py',
+        'inputs': MASTER + ANALYSIS_LIBS + [COMMUNITY_RECORDS, "keyword_analysis.py"],
+        'outputs': [
+            f"{VIS}/08_sentiment_analysis.png",
+            f"{VIS}/09_keyword_sentiment.png",
+            f"{VIS}/sentiment_daily_analysis.csv",
+            f"{VIS}/keyword_sentiment_summary.csv",
+        ],
+    },
+    '08': {
+        'script': '08_sentiment_price_regression.py',
+        'inputs': MASTER + ANALYSIS_LIBS + WALK_FORWARD_LIBS + [
+            f"{VIS}/sentiment_daily_analysis.csv", "rolling_regression.py", "regression_screener.py",
+        ],
+        'outputs': [
+            f"{VIS}/10_sentiment_price_regression.png",
+            f"{VIS}/11_regression_residuals.png",
+            f"{VIS}/regression_simple_results.csv",
+            f"{VIS}/regression_multiple_coefficients.csv",
+            f"{VIS}/regression_rolling_coefficients.csv",
+            f"{VIS}/regression_walk_forward_metrics.csv",
+        ],
+    },
+    '09': {
+        'script': '09_macroeconomic_regression.py',
+        'inputs': MASTER + ANALYSIS_LIBS + WALK_FORWARD_LIBS + [
+            "rolling_regression.py", "regression_screener.py", "collinearity.py",
+        ],
+        'outputs': [
+            f"{VIS}/12_macroeconomic_regression.png",
+            f"{VIS}/13_macro_variable_importance.png",
+            f"{VIS}/macro_simple_regression.csv",
+            f"{VIS}/macro_variable_importance.csv",
+            f"{VIS}/macro_regression_coefficients.csv",
+            f"{VIS}/macro_rolling_coefficients.csv",
+            f"{VIS}/macro_walk_forward_metrics.csv",
+        ],
+    },
+    '10': {
+        'script': '10_open_interest_analysis.py',
+        'inputs': MASTER + ANALYSIS_LIBS + ["anomaly_detection.py"],
+        'outputs': [f"{VIS}/14_open_interest_analysis.png", f"{VIS}/open_interest_analysis.csv"],
+    },
+    '11': {
+        'script': '11_wordcloud_generation.py',
+        'inputs': ANALYSIS_LIBS + [COMMUNITY_RECORDS, "keyword_analysis.py"],
+        'outputs': [
+            f"{VIS}/15_wordcloud_combined.png",
+            f"{VIS}/16_keyword_frequency_comparison.png",
+            f"{VIS}/keyword_frequency_by_sentiment.csv",
+        ],
+    },
+    '12': {
+        'script': '12_network_analysis.py',
+        'inputs': MASTER + ANALYSIS_LIBS + ["lag_correlation.py", "correlation_service.py"],
+        'outputs': [
+            f"{VIS}/17_network_full.png",
+            f"{VIS}/18_network_simplified.png",
+            f"{VIS}/network_centrality.csv",
+            f"{VIS}/correlation_matrix.csv",
+            f"{VIS}/network_lead_lag.csv",
+        ],
+    },
+    '14': {
+        'script': '14_generate_report.py',
+        'inputs': MASTER + [f"{VIS}/*.png"],
+        'outputs': ["output/reports/Bitcoin_Crash_Analysis_Report_*.pdf"],
+    },
+}
+
+
+# ============================================================================
+# 지문(fingerprint)
+# ============================================================================
+
+def load_state():
+    """이전 실행 상태 로드"""
+    if STATE_FILE.exists():
+        with open(STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return {'files': {}, 'stages': {}}
+
+
+def save_state(state):
+    """실행 상태 저장 (원자적 교체)"""
+    tmp_path = STATE_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def expand_patterns(patterns):
+    """glob 패턴을 실제 파일 목록으로 확장 (정렬)"""
+    paths = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.update(glob.glob(pattern))
+        elif os.path.exists(pattern):
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def file_fingerprint(path, file_cache):
+    """
+    파일 지문 계산. mtime과 크기가 이전과 같으면 저장된 해시를 재사용하고,
+    달라졌을 때만 내용 해시를 다시 계산.
+
+    Args:
+        path: 파일 경로
+        file_cache: state['files'] (경로 -> {mtime_ns, size, sha256})
+
+    Returns:
+        str: 파일 내용의 sha256
+    """
+    stat = os.stat(path)
+    cached = file_cache.get(path)
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+
+    file_cache[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha}
+    return sha
+
+
+def stage_signature(stage_id, file_cache):
+    """단계의 입력 파일 + 스크립트 지문을 하나의 서명으로 결합"""
+    stage = STAGES[stage_id]
+    paths = expand_patterns(stage['inputs'] + [stage['script']])
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        digest.update(file_fingerprint(path, file_cache).encode('ascii'))
+    return digest.hexdigest()
+
+
+def outputs_exist(stage_id):
+    """선언된 출력이 모두 존재하는지"""
+    for pattern in STAGES[stage_id]['outputs']:
+        if glob.has_magic(pattern):
+            if not glob.glob(pattern):
+                return False
+        elif not os.path.exists(pattern):
+            return False
+    return True
+
+
+# ============================================================================
+# 의존성 그래프
+# ============================================================================
+
+def _patterns_overlap(a, b):
+    """두 경로 패턴이 같은 파일을 가리킬 수 있는지"""
+    return a == b or fnmatch.fnmatch(a, b) or fnmatch.fnmatch(b, a)
+
+
+def build_dependencies(stage_ids):
+    """
+    출력 -> 입력 관계로 단계 의존성 계산.
+
+    Returns:
+        dict: 단계 -> 선행 단계 집합
+    """
+    deps = {sid: set() for sid in stage_ids}
+    for sid in stage_ids:
+        for other in stage_ids:
+            if other == sid:
+                continue
+            if any(_patterns_overlap(out, inp)
+                   for out in STAGES[other]['outputs']
+                   for inp in STAGES[sid]['inputs']):
+                deps[sid].add(other)
+    return deps
+
+
+def downstream_of(stage_ids, deps):
+    """지정 단계와 그 하위 단계 전체"""
+    result = set(stage_ids)
+    changed = True
+    while changed:
+        changed = False
+        for sid, parents in deps.items():
+            if sid not in result and parents & result:
+                result.add(sid)
+                changed = True
+    return result
+
+
+# ============================================================================
+# 실행
+# ============================================================================
+
+def run_stage(stage_id):
+    """
+    단계 스크립트를 별도 프로세스에서 실행 (헤드리스 Agg 백엔드).
+
+    Returns:
+        tuple: (단계 ID, 종료 코드, 로그 파일 경로)
+    """
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = LOG_DIR / f"stage_{stage_id}.log"
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONIOENCODING='utf-8')
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        proc = subprocess.run(
+            [sys.executable, STAGES[stage_id]['script']],
+            stdout=log_file, stderr=subprocess.STDOUT, env=env
+        )
+    return stage_id, proc.returncode, log_path
+
+
+def run_pipeline(only=None, force=None, workers=None, dry_run=False):
+    """
+    변경된 단계만 의존성 순서대로 실행하고, 준비된 단계는 병렬로 실행.
+
+    Args:
+        only: 대상 단계 ID 목록 (None이면 전체)
+        force: 강제 재실행할 단계 ID 목록 (하위 단계 포함)
+        workers: 동시에 실행할 최대 워커 수
+        dry_run: True면 실행하지 않고 계획만 출력
+
+    Returns:
+        dict: 단계 ID -> 'skipped' / 'ok' / 'failed' / 'blocked'
+              (dry_run이면 실행될 단계는 'planned')
+    """
+    stage_ids = sorted(only) if only else sorted(STAGES)
+    unknown = set(stage_ids) - set(STAGES)
+    if unknown:
+        raise KeyError(f"알 수 없는 단계: {sorted(unknown)}")
+
+    deps = build_dependencies(stage_ids)
+    forced = downstream_of(force or [], deps) & set(stage_ids)
+
+    state = load_state()
+    file_cache = state['files']
+    status = {}
+    pending = set(stage_ids)
+    running = {}
+    workers = workers or max(1, min(len(stage_ids), os.cpu_count() or 1))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # 선행 단계가 모두 끝난 단계를 확인
+            for sid in sorted(pending):
+                parents = deps[sid]
+                if any(p not in status for p in parents):
+                    continue
+                pending.discard(sid)
+
+                if any(status[p] in ('failed', 'blocked') for p in parents):
+                    status[sid] = 'blocked'
+                    logger.warning(f"[{sid}] 선행 단계 실패로 건너뜀")
+                    continue
+
+                # dry-run에서는 선행 단계가 실행 예정이면 출력이 바뀔 수 있으므로 함께 실행 예정
+                if dry_run and any(status[p] == 'planned' for p in parents):
+                    status[sid] = 'planned'
+                    logger.info(f"[{sid}] 실행 예정 (선행 단계 재실행): {STAGES[sid]['script']}")
+                    continue
+
+                signature = stage_signature(sid, file_cache)
+                unchanged = (state['stages'].get(sid) == signature
+                             and outputs_exist(sid) and sid not in forced)
+                if unchanged:
+                    status[sid] = 'skipped'
+                    logger.info(f"[{sid}] 입력 변경 없음 - 건너뜀")
+                elif dry_run:
+                    status[sid] = 'planned'
+                    logger.info(f"[{sid}] 실행 예정: {STAGES[sid]['script']}")
+                else:
+                    logger.info(f"[{sid}] 실행 시작: {STAGES[sid]['script']}")
+                    running[pool.submit(run_stage, sid)] = signature
+
+            if not running:
+                if pending and not any(deps[s] <= set(status) for s in pending):
+                    raise RuntimeError(f"순환 의존성: {sorted(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                signature = running.pop(future)
+                sid, returncode, log_path = future.result()
+                if returncode == 0:
+                    status[sid] = 'ok'
+                    # 실행 시점 입력 기준으로 서명 기록
+                    state['stages'][sid] = signature
+                    logger.info(f"[{sid}] 완료 (로그: {log_path})")
+                else:
+                    status[sid] = 'failed'
+                    state['stages'].pop(sid, None)
+                    logger.error(f"[{sid}] 실패 (exit {returncode}, 로그: {log_path})")
+                # 중단되더라도 완료된 단계는 다음 실행에서 건너뛸 수 있도록 매번 저장
+                save_state(state)
+
+    return status
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(
+        description='Run pipeline stages 01-14 incrementally'
+    )
+    parser.add_argument('--only', nargs='+', help='Stage IDs to consider (default: all)')
+    parser.add_argument('--force', nargs='+', default=[],
+                        help='Stage IDs to rerun regardless of fingerprints (downstream included)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum number of stages running in parallel')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the plan without running anything')
+    args = parser.parse_args()
+
+    status = run_pipeline(only=args.only, force=args.force,
+                          workers=args.workers, dry_run=args.dry_run)
+
+    summary = {s: sorted(k for k, v in status.items() if v == s)
+               for s in ('ok', 'planned', 'skipped', 'failed', 'blocked')}
+    if args.dry_run:
+        logger.info(f"실행 예정: {summary['planned']}, 건너뜀: {summary['skipped']}")
+    else:
+        logger.info(f"실행: {summary['ok']}, 건너뜀: {summary['skipped']}, "
+                    f"실패: {summary['failed']}, 차단: {summary['blocked']}")
+
+    if summary['failed'] or summary['blocked']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
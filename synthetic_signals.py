@@ -0,0 +1,192 @@
+"""
+합성 비정형 신호 생성 모듈
+crash_data_collector의 소셜/뉴스/청산 추정값을 날짜 반복 없이 NumPy 배열 연산으로 생성
+
+- 모든 함수가 (시나리오 수, 일수) 배열을 한 번에 생성: 수천 개의 합성 급락 구간도 한 번의 호출
+- 급락일 위치(시나리오별로 다르게 가능)와 급락 전후 배수 프로파일을 인자로 받음
+- seed(또는 np.random.Generator)를 주면 같은 결과를 재현 (Monte-Carlo 선행성 검증용)
+
+사용 예:
+  scenarios = generate_scenarios(5000, 30, crash_index=None, seed=42)   # 급락일 무작위
+  scenarios['Twitter_Mentions'].shape   # (5000, 30)
+"""
+
+import numpy as np
+
+# 급락일 기준 일수 -> 소셜 지표 배수 (그 외 날은 1 ± NORMAL_JITTER)
+CRASH_PROFILE = {-2: 1.3, -1: 1.8, 0: 3.5, 1: 2.2, 2: 1.5}
+NORMAL_JITTER = 0.2
+
+# 소셜 지표 기본값 (평상시 일별 수준)과 절대 노이즈 폭
+SOCIAL_BASES = {
+    '2025_Oct': {'Reddit_Posts': 150, 'Twitter_Mentions': 5000, 'YouTube_Videos': 20, 'Google_Trends': 40},
+    '2026_Feb': {'Reddit_Posts': 180, 'Twitter_Mentions': 6000, 'YouTube_Videos': 25, 'Google_Trends': 45},
+}
+SOCIAL_NOISE = {'Reddit_Posts': 10, 'Twitter_Mentions': 500, 'YouTube_Videos': 2, 'Google_Trends': 5}
+
+# 뉴스 건수 범위 [low, high): 급락일 / 급락 전날 / 평상시
+NEWS_RANGES = {
+    'crash': {'News_Negative': (30, 50), 'News_Positive': (2, 8)},
+    'pre': {'News_Negative': (15, 25), 'News_Positive': (5, 12)},
+    'normal': {'News_Negative': (5, 15), 'News_Positive': (8, 20)},
+}
+NEWS_NEUTRAL = (20, 40)
+
+# 청산 추정: 가격 변화 1%당 청산액 (하락 = 롱 청산, 상승 = 숏 청산)
+LIQUIDATION_PER_PCT_DOWN = 50_000_000
+LIQUIDATION_PER_PCT_UP = 20_000_000
+LIQUIDATION_NOISE = 0.3
+
+
+def _rng(seed):
+    """seed(int/None) 또는 Generator를 Generator로 변환"""
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _as_2d(days_from_crash, n_scenarios):
+    """급락일 기준 일수를 (시나리오, 일수) 배열로 (1차원이면 모든 시나리오에 같은 날짜)"""
+    days = np.asarray(days_from_crash, dtype=np.int64)
+    if days.ndim == 1:
+        days = np.broadcast_to(days, (n_scenarios, len(days)))
+    return days
+
+
+def crash_multiplier(days_from_crash, profile=CRASH_PROFILE, jitter=NORMAL_JITTER, seed=None):
+    """
+    급락 프로파일 배수 (프로파일에 없는 날은 1 ± jitter 균등 난수).
+
+    Args:
+        days_from_crash: 급락일 기준 일수 배열
+        profile: 일수 -> 배수
+        jitter: 평상시 배수 변동 폭
+        seed: 난수 seed 또는 Generator
+
+    Returns:
+        np.ndarray: days_from_crash와 같은 shape의 배수
+    """
+    rng = _rng(seed)
+    days = np.asarray(days_from_crash, dtype=np.int64)
+    offsets = np.array(sorted(profile), dtype=np.int64)
+    values = np.array([profile[d] for d in offsets], dtype=float)
+    pos = np.clip(np.searchsorted(offsets, days), 0, len(offsets) - 1)
+    in_profile = offsets[pos] == days
+    normal = 1.0 + rng.uniform(-jitter, jitter, size=days.shape)
+    return np.where(in_profile, values[pos], normal)
+
+
+def social_signals(days_from_crash, n_scenarios=1, bases=SOCIAL_BASES['2025_Oct'],
+                   profile=CRASH_PROFILE, seed=None):
+    """
+    소셜 미디어 지표 추정값 (급락 전후 급증 패턴 + 노이즈).
+
+    Args:
+        days_from_crash: 급락일 기준 일수, (일수,) 또는 (시나리오, 일수)
+        n_scenarios: 시나리오 수 (days_from_crash가 1차원일 때)
+        bases: 지표명 -> 평상시 수준
+        profile: 급락 배수 프로파일
+        seed: 난수 seed 또는 Generator
+
+    Returns:
+        dict: 지표명 -> (시나리오, 일수) 배열 (+ Sentiment_Score 0~100)
+    """
+    rng = _rng(seed)
+    days = _as_2d(days_from_crash, n_scenarios)
+    multiplier = crash_multiplier(days, profile, seed=rng)
+
+    signals = {}
+    for name, base in bases.items():
+        noise = SOCIAL_NOISE.get(name, 0.05 * base)
+        signals[name] = np.trunc(base * multiplier + rng.uniform(-noise, noise, size=days.shape)).astype(np.int64)
+
+    # 감정 점수 (부정적일수록 낮음): 급락 전후 하루는 배수에 비례해 하락
+    near_crash = (days >= -1) & (days <= 1)
+    crash_sentiment = np.maximum(10, 50 - (multiplier - 1) * 30 + rng.uniform(-5, 5, size=days.shape))
+    normal_sentiment = 50 + rng.uniform(-10, 10, size=days.shape)
+    signals['Sentiment_Score'] = np.clip(np.where(near_crash, crash_sentiment, normal_sentiment), 0, 100)
+    return signals
+
+
+def news_signals(days_from_crash, n_scenarios=1, crash_offsets=(0,), pre_offsets=(-1,), seed=None):
+    """
+    뉴스 감정 건수 추정값.
+
+    Args:
+        days_from_crash: 급락일 기준 일수, (일수,) 또는 (시나리오, 일수)
+        n_scenarios: 시나리오 수 (days_from_crash가 1차원일 때)
+        crash_offsets: 부정 뉴스가 폭증하는 날 (급락일 기준)
+        pre_offsets: 부정 뉴스가 늘기 시작하는 날
+        seed: 난수 seed 또는 Generator
+
+    Returns:
+        dict: News_Total, News_Negative, News_Positive, News_Neutral, News_Sentiment_Score
+    """
+    rng = _rng(seed)
+    days = _as_2d(days_from_crash, n_scenarios)
+    is_crash = np.isin(days, crash_offsets)
+    is_pre = np.isin(days, pre_offsets) & ~is_crash
+
+    counts = {}
+    for name in ('News_Negative', 'News_Positive'):
+        draws = {kind: rng.integers(*NEWS_RANGES[kind][name], size=days.shape) for kind in NEWS_RANGES}
+        counts[name] = np.where(is_crash, draws['crash'], np.where(is_pre, draws['pre'], draws['normal']))
+    neutral = rng.integers(*NEWS_NEUTRAL, size=days.shape)
+
+    total = counts['News_Negative'] + counts['News_Positive'] + neutral
+    return {
+        'News_Total': total,
+        'News_Negative': counts['News_Negative'],
+        'News_Positive': counts['News_Positive'],
+        'News_Neutral': neutral,
+        'News_Sentiment_Score': (counts['News_Positive'] - counts['News_Negative']) / total * 100,  # -100 to 100
+    }
+
+
+def liquidation_signals(btc_change_pct, seed=None):
+    """
+    가격 변화율로 청산 추정값 계산 (하락폭이 클수록 청산 급증).
+
+    Args:
+        btc_change_pct: BTC 일일 변화율(%) 배열, 임의 shape (NaN이면 청산 0)
+        seed: 난수 seed 또는 Generator
+
+    Returns:
+        dict: Liquidation_USD, Liquidation_Long_Pct (하락 시 롱 청산 60%)
+    """
+    rng = _rng(seed)
+    change = np.asarray(btc_change_pct, dtype=float)
+    amount = np.where(change < 0, -change * LIQUIDATION_PER_PCT_DOWN, change * LIQUIDATION_PER_PCT_UP)
+    amount = amount * (1 + rng.uniform(-LIQUIDATION_NOISE, LIQUIDATION_NOISE, size=change.shape))
+    return {
+        'Liquidation_USD': np.fmax(0.0, amount),
+        'Liquidation_Long_Pct': np.where(change < 0, 60, 40),
+    }
+
+
+def generate_scenarios(n_scenarios, n_days, crash_index=None, bases=SOCIAL_BASES['2025_Oct'],
+                       profile=CRASH_PROFILE, news_crash_offsets=(0,), news_pre_offsets=(-1,), seed=None):
+    """
+    합성 급락 구간 시나리오를 한 번에 생성.
+
+    Args:
+        n_scenarios: 시나리오 수
+        n_days: 구간 길이(일)
+        crash_index: 급락일 위치 (int: 모든 시나리오 동일, 배열: 시나리오별, None: 무작위)
+        bases: 소셜 지표 평상시 수준
+        profile: 급락 배수 프로파일
+        news_crash_offsets: 부정 뉴스 폭증일 (급락일 기준)
+        news_pre_offsets: 부정 뉴스 증가 시작일
+        seed: 난수 seed 또는 Generator
+
+    Returns:
+        dict: crash_index (시나리오,), days_from_crash와 모든 신호 (시나리오, 일수)
+    """
+    rng = _rng(seed)
+    if crash_index is None:
+        crash_index = rng.integers(0, n_days, size=n_scenarios)
+    crash_index = np.broadcast_to(np.asarray(crash_index, dtype=np.int64), (n_scenarios,))
+    days = np.arange(n_days)[None, :] - crash_index[:, None]
+
+    scenarios = {'crash_index': crash_index, 'days_from_crash': days}
+    scenarios.update(social_signals(days, bases=bases, profile=profile, seed=rng))
+    scenarios.update(news_signals(days, crash_offsets=news_crash_offsets, pre_offsets=news_pre_offsets, seed=rng))
+    return scenarios
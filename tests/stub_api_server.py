@@ -0,0 +1,138 @@
+"""
+api_collector 검증용 로컬 스텁 JSON API 서버
+경로별로 미리 지정한 실패 응답(429/503 등)을 먼저 돌려준 뒤 200 JSON을 응답하고, 경로별 요청 수를 기록
+
+- GET /<경로>?<쿼리> -> {"path": 경로, "params": 쿼리} (200)
+- fail(path, [429, 503]): 해당 경로의 다음 요청들에 순서대로 실패 응답
+  (429는 Retry-After 헤더 포함, retry_after=None이면 헤더 없음)
+- always_fail(path, 503): 해당 경로는 항상 실패 (heal(path)로 해제)
+
+실행 방법 (수동 백필 테스트용):
+  python tests/stub_api_server.py --port 8765 --fail-every 5
+"""
+
+import argparse
+import json
+import threading
+from collections import Counter, defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+class StubApiServer:
+    """
+    별도 스레드에서 동작하는 스텁 서버 (with 문으로 시작/종료).
+
+    Args:
+        host: 바인딩 주소
+        port: 포트 (0이면 빈 포트 자동 선택)
+        retry_after: 429 응답의 Retry-After 헤더 값(초, None이면 헤더 없음)
+        fail_every: 0보다 크면 실패가 지정되지 않은 경로도 n번째 요청마다 503 응답
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, retry_after='0', fail_every=0):
+        self.retry_after = retry_after
+        self.fail_every = fail_every
+        self.hits = Counter()
+        self._failures = defaultdict(deque)
+        self._always = {}
+        self._lock = threading.Lock()
+        self._total = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail(self, path, statuses):
+        """path의 다음 요청들에 statuses를 순서대로 응답"""
+        with self._lock:
+            self._failures[path].extend(statuses)
+
+    def always_fail(self, path, status=503):
+        """path는 heal() 전까지 항상 status로 응답"""
+        with self._lock:
+            self._always[path] = status
+
+    def heal(self, path):
+        """always_fail 해제"""
+        with self._lock:
+            self._always.pop(path, None)
+
+    def _next_status(self, path):
+        with self._lock:
+            self.hits[path] += 1
+            self._total += 1
+            if path in self._always:
+                return self._always[path]
+            if self._failures[path]:
+                return self._failures[path].popleft()
+            if self.fail_every and self._total % self.fail_every == 0:
+                return 503
+            return 200
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status = stub._next_status(parsed.path)
+                if status == 200:
+                    body = json.dumps({'path': parsed.path,
+                                       'params': dict(parse_qsl(parsed.query))}).encode('utf-8')
+                else:
+                    body = json.dumps({'error': status}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if status == 429 and stub.retry_after is not None:
+                    self.send_header('Retry-After', stub.retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="api_collector 검증용 스텁 JSON API 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-every', type=int, default=0, help="n번째 요청마다 503 응답")
+    args = parser.parse_args()
+
+    server = StubApiServer(args.host, args.port, fail_every=args.fail_every)
+    print(f"스텁 서버 실행 중: {server.url} (Ctrl+C로 종료)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
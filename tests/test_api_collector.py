@@ -0,0 +1,81 @@
+"""
+api_collector 재시도/체크포인트 재개 테스트 (로컬 스텁 서버 사용, 외부 네트워크 불필요)
+
+실행 방법:
+  python -m pytest -q tests
+"""
+
+import pytest
+import requests
+
+from api_collector import ApiCollector, Checkpoint
+from stub_api_server import StubApiServer
+
+
+@pytest.fixture
+def server():
+    with StubApiServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def collector():
+    # 스텁 호스트는 속도 제한을 사실상 두지 않고, 백오프도 짧게
+    return ApiCollector(rate_limits={'127.0.0.1': (1000.0, 100)}, max_retries=3, backoff=0.01,
+                        timeout=5)
+
+
+def test_retries_429_and_503_then_succeeds(server, collector):
+    server.fail('/klines', [429, 503, 429])
+
+    data = collector.get_json(f"{server.url}/klines", params={'symbol': 'BTCUSDT'})
+
+    assert data == {'path': '/klines', 'params': {'symbol': 'BTCUSDT'}}
+    assert server.hits['/klines'] == 4
+
+
+def test_gives_up_after_max_retries(server, collector):
+    server.always_fail('/down', 503)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        collector.get_json(f"{server.url}/down")
+    assert server.hits['/down'] == collector.max_retries + 1
+
+
+def test_client_error_is_not_retried(server, collector):
+    server.fail('/missing', [404])
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        collector.get_json(f"{server.url}/missing")
+    assert server.hits['/missing'] == 1
+
+
+def test_fetch_all_resumes_from_checkpoint(server, collector, tmp_path):
+    jobs = {f"page_{i}": (f"{server.url}/page/{i}", {'i': str(i)}) for i in range(10)}
+    checkpoint = Checkpoint(tmp_path / "backfill.jsonl")
+    server.fail('/page/2', [429, 503])
+    server.always_fail('/page/7', 503)
+
+    # 1차 실행: 재시도로 page_2는 성공, page_7은 실패로 제외
+    first = collector.fetch_all(jobs, workers=4, checkpoint=checkpoint)
+    assert sorted(first) == sorted(key for key in jobs if key != 'page_7')
+    assert set(checkpoint.load()) == set(first)
+
+    # 중단 시 잘린 마지막 줄은 무시
+    with open(checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "page_7", "da')
+
+    # 2차 실행: 남은 page_7만 다시 요청
+    server.heal('/page/7')
+    hits_before = sum(server.hits.values())
+    second = collector.fetch_all(jobs, workers=4, checkpoint=checkpoint)
+
+    assert sum(server.hits.values()) - hits_before == 1
+    assert sorted(second) == sorted(jobs)
+    assert second['page_7'] == {'path': '/page/7', 'params': {'i': '7'}}
+    assert second['page_2'] == {'path': '/page/2', 'params': {'i': '2'}}
+
+    # 3차 실행: 모두 체크포인트에 있으므로 요청 없음
+    hits_before = sum(server.hits.values())
+    assert collector.fetch_all(jobs, workers=4, checkpoint=checkpoint) == second
+    assert sum(server.hits.values()) == hits_before
@@ -0,0 +1,228 @@
+"""
+GDELT v2_themes 희소 행렬 모듈
+일별 뉴스 파일에서 기사 x 테마 CSR 행렬과 테마 어휘(vocabulary) 인덱스를 한 번 만들어 두고,
+임의의 테마나 접두어 그룹(EPU_*, TAX_FNCACT_* 등)의 일별 건수를 희소 연산 한 번으로 계산
+
+- 행렬 값은 0/1 (기사가 해당 테마를 포함하는지) -> 일별 합계는 features_daily의 theme_cnt__와 동일
+- 메모리는 0이 아닌 원소 수에 비례
+- data/processed/theme_index.npz에 캐시, 뉴스 파일이 더 최신이면 재생성
+"""
+
+import fnmatch
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from features_daily_builder import NEWS_DIR, list_day_files
+
+INDEX_PATH = Path("data/processed/theme_index.npz")
+
+
+class ThemeIndex:
+    """
+    기사 x 테마 희소 행렬과 테마/날짜 인덱스.
+
+    Attributes:
+        matrix: (기사 수, 테마 수) CSR 행렬, 값은 0/1
+        themes: 정렬된 테마 이름 배열 (열 순서)
+        article_days: 기사별 날짜 (YYYYMMDD int) 배열 (행 순서)
+    """
+
+    def __init__(self, matrix, themes, article_days):
+        self.matrix = sparse.csr_matrix(matrix)
+        self.themes = np.asarray(themes, dtype=object)
+        self.article_days = np.asarray(article_days, dtype=np.int64)
+        self.days, day_codes = np.unique(self.article_days, return_inverse=True)
+        # 날짜 x 기사 지시 행렬: 일별 합계를 곱셈 한 번으로 계산
+        self._day_indicator = sparse.csr_matrix(
+            (np.ones(len(day_codes), dtype=np.int32),
+             (day_codes, np.arange(len(day_codes)))),
+            shape=(len(self.days), len(day_codes))
+        )
+        self._daily = None
+
+    def __repr__(self):
+        return (f"ThemeIndex(articles={self.matrix.shape[0]:,}, themes={len(self.themes):,}, "
+                f"days={len(self.days)}, nnz={self.matrix.nnz:,})")
+
+    @property
+    def daily_matrix(self):
+        """날짜 x 테마 CSR 행렬 (테마별 일별 기사 수), 최초 사용 시 한 번 계산"""
+        if self._daily is None:
+            self._daily = (self._day_indicator @ self.matrix).tocsc()
+        return self._daily
+
+    def resolve(self, patterns):
+        """
+        테마 이름/패턴을 열 번호로 변환.
+
+        Args:
+            patterns: 테마 이름 또는 glob 패턴 (예: 'EPU_*', 'TAX_FNCACT_*') 또는 그 목록
+
+        Returns:
+            np.ndarray: 어휘 순서로 정렬된 열 번호 (중복 제거)
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        cols = set()
+        for pattern in patterns:
+            if any(ch in pattern for ch in '*?['):
+                prefix = pattern.split('*')[0].split('?')[0].split('[')[0]
+                # 정렬된 어휘에서 접두어 구간만 잘라 패턴 비교
+                lo = np.searchsorted(self.themes, prefix, side='left')
+                hi = np.searchsorted(self.themes, prefix + '\uffff', side='left')
+                cols.update(i for i in range(lo, hi)
+                            if fnmatch.fnmatchcase(self.themes[i], pattern))
+            else:
+                i = np.searchsorted(self.themes, pattern)
+                if i < len(self.themes) and self.themes[i] == pattern:
+                    cols.add(int(i))
+        return np.array(sorted(cols), dtype=np.int64)
+
+    def daily_counts(self, patterns, total=None):
+        """
+        테마(또는 패턴 그룹)의 일별 기사 수.
+
+        Args:
+            patterns: 테마 이름/glob 패턴 또는 그 목록
+            total: None이면 테마별 컬럼,
+                   'sum'이면 테마별 건수의 합 (theme_cnt__ 합계와 동일),
+                   'any'이면 그룹 테마를 하나라도 포함한 기사 수
+
+        Returns:
+            pd.DataFrame 또는 pd.Series: 날짜(datetime) 인덱스의 일별 건수
+        """
+        cols = self.resolve(patterns)
+        index = pd.to_datetime(self.days.astype(str), format='%Y%m%d')
+        index.name = 'date'
+
+        if total == 'any':
+            hit = np.asarray(self.matrix[:, cols].sum(axis=1)).ravel() > 0
+            counts = self._day_indicator @ hit.astype(np.int64)
+            return pd.Series(counts, index=index, name='any')
+
+        block = self.daily_matrix[:, cols]
+        if total == 'sum':
+            return pd.Series(np.asarray(block.sum(axis=1)).ravel(), index=index, name='sum')
+        return pd.DataFrame(block.toarray(), index=index, columns=list(self.themes[cols]))
+
+    def top_themes(self, n=20, pattern=None):
+        """
+        전체 기간 기사 수 기준 상위 테마.
+
+        Args:
+            n: 반환할 테마 수
+            pattern: glob 패턴으로 후보 제한 (None이면 전체)
+
+        Returns:
+            pd.Series: 테마 -> 기사 수 (내림차순)
+        """
+        cols = self.resolve(pattern) if pattern else np.arange(len(self.themes))
+        totals = np.asarray(self.matrix[:, cols].sum(axis=0)).ravel()
+        order = np.argsort(-totals, kind='stable')[:n]
+        return pd.Series(totals[order], index=self.themes[cols][order], name='n_articles')
+
+    def save(self, path=INDEX_PATH):
+        """행렬과 인덱스를 압축 npz 하나로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape), themes=self.themes.astype(str),
+            article_days=self.article_days,
+        )
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """save()로 저장한 인덱스 로드"""
+        with np.load(path, allow_pickle=False) as f:
+            matrix = sparse.csr_matrix((f['data'], f['indices'], f['indptr']),
+                                       shape=tuple(f['shape']))
+            return cls(matrix, f['themes'].astype(object), f['article_days'])
+
+
+def build_theme_index(news_dir=NEWS_DIR, start=None, end=None):
+    """
+    일별 뉴스 파일을 하루씩 읽어 ThemeIndex 생성.
+
+    Args:
+        news_dir: bitcoin_news_YYYYMMDD.csv 파일이 있는 디렉토리
+        start: 시작 날짜 (None이면 전체)
+        end: 종료 날짜 (None이면 전체)
+
+    Returns:
+        ThemeIndex: 생성된 인덱스
+    """
+    vocab = {}
+    rows, cols, article_days = [], [], []
+    n_articles = 0
+
+    for day, path in list_day_files(news_dir, start, end):
+        themes = pd.read_csv(path, usecols=['v2_themes'], encoding='utf-8-sig')['v2_themes']
+        # features_daily와 동일하게 테마가 없는 기사는 제외
+        themes = themes.dropna().reset_index(drop=True)
+
+        exploded = themes.str.split(';').explode()
+        exploded = exploded[exploded != '']
+        pairs = exploded.reset_index().drop_duplicates()
+
+        # 새 테마를 어휘에 추가한 뒤 (임시) 열 번호로 변환
+        for theme in pairs['v2_themes'].unique():
+            vocab.setdefault(theme, len(vocab))
+        rows.append(pairs['index'].to_numpy() + n_articles)
+        cols.append(pairs['v2_themes'].map(vocab).to_numpy())
+
+        article_days.append(np.full(len(themes), day, dtype=np.int64))
+        n_articles += len(themes)
+
+    if not vocab:
+        raise FileNotFoundError(f"뉴스 파일이 없습니다: {news_dir}")
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+
+    # 열을 테마 이름순으로 재배열 (접두어 검색을 이진 탐색으로)
+    names = np.array(list(vocab), dtype=object)
+    order = np.argsort(names)
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, remap[cols])),
+        shape=(n_articles, len(vocab))
+    )
+    return ThemeIndex(matrix, names[order], np.concatenate(article_days))
+
+
+def load_theme_index(news_dir=NEWS_DIR, path=INDEX_PATH, rebuild=False):
+    """
+    캐시된 ThemeIndex를 로드하고, 없거나 뉴스 파일보다 오래됐으면 재생성해 저장.
+
+    Args:
+        news_dir: 일별 뉴스 파일 디렉토리
+        path: 캐시 npz 경로
+        rebuild: True면 캐시를 무시하고 재생성
+
+    Returns:
+        ThemeIndex: 테마 인덱스
+    """
+    path = Path(path)
+    files = list_day_files(news_dir)
+    newest = max((p.stat().st_mtime for _, p in files), default=0)
+
+    if not rebuild and path.exists() and path.stat().st_mtime >= newest:
+        return ThemeIndex.load(path)
+
+    index = build_theme_index(news_dir)
+    index.save(path)
+    print(f"  ✅ 테마 인덱스 생성: {index} -> {path}")
+    return index
+
+
+if __name__ == "__main__":
+    index = load_theme_index(rebuild=True)
+    print(index)
+    print(index.top_themes(20))
@@ -0,0 +1,182 @@
+"""
+시계열 다운샘플링 모듈
+대시보드 Plotly 차트가 매 rerun마다 모든 점을 브라우저로 보내지 않도록
+선택한 날짜 구간의 점 수를 화면 해상도(픽셀 버킷)에 맞게 줄임
+
+- LTTB(Largest-Triangle-Three-Buckets): 선 모양 보존, 버킷당 1점
+- min-max: 버킷마다 최소/최대 2점, 급락 같은 극값을 반드시 보존
+- 구간 점 수가 목표 이하면 원본 그대로 사용 (일별 데이터는 변화 없음)
+- SeriesCache: (데이터셋, 컬럼, 행 구간, 해상도) 키로 결과를 공유해
+  위젯 조작 시 구간이 바뀐 트레이스만 다시 계산
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 차트 폭(px) x 픽셀당 점 수 = 기본 목표 점 수
+DEFAULT_WIDTH_PX = 1200
+POINTS_PER_PIXEL = 2
+
+
+def target_points(width_px=DEFAULT_WIDTH_PX, points_per_pixel=POINTS_PER_PIXEL):
+    """화면 폭에 맞는 최대 점 수"""
+    return int(width_px * points_per_pixel)
+
+
+def _as_float(x):
+    """datetime64 등 x 좌표를 면적 계산용 float 배열로 변환"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    LTTB로 남길 점의 인덱스.
+
+    Args:
+        x: 정렬된 x 좌표 (숫자 또는 datetime64)
+        y: y 값 (NaN 없음)
+        n_out: 목표 점 수 (3 이상)
+
+    Returns:
+        np.ndarray: 오름차순 인덱스 (처음/마지막 점 포함)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+    # 처음/마지막 점을 제외한 n_out - 2개 버킷의 경계, 마지막 경계는 n - 1
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # 버킷별 평균점은 선택 결과와 무관하므로 한 번에 계산 (버킷 i의 "다음 버킷" = i + 1)
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # 이전 선택점 a, 다음 버킷 평균점과 만드는 삼각형 넓이가 최대인 점
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_buckets):
+    """
+    버킷마다 최소/최대 점의 인덱스 (벡터화).
+
+    Args:
+        y: y 값 (NaN 없음)
+        n_buckets: 버킷 수 (결과는 최대 2 * n_buckets + 2점)
+
+    Returns:
+        np.ndarray: 오름차순 인덱스 (처음/마지막 점 포함)
+    """
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    bucket = (np.arange(n) * n_buckets) // n
+    # 버킷 안에서 y 오름차순 정렬 -> 각 버킷의 첫 원소 = 최소, 마지막 원소 = 최대
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets), 'left')
+    ends = np.searchsorted(bucket[order], np.arange(n_buckets), 'right') - 1
+    keep = np.concatenate([[0, n - 1], order[starts], order[ends]])
+    return np.unique(keep)
+
+
+def downsample(x, y, max_points=None, method='lttb'):
+    """
+    시계열을 최대 max_points 점으로 줄임 (줄일 때는 NaN 제외).
+
+    Args:
+        x: 정렬된 x 좌표 배열 (날짜 등)
+        y: y 값 배열
+        max_points: 최대 점 수 (None이면 target_points())
+        method: 'lttb' 또는 'minmax'
+
+    Returns:
+        tuple: (x, y) 다운샘플된 배열
+    """
+    if method not in ('lttb', 'minmax'):
+        raise ValueError(f"지원하지 않는 method: {method}")
+    max_points = target_points() if max_points is None else max_points
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return x, y  # 원본 그대로 (NaN 구간은 차트에서 끊긴 선으로 유지)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+        if len(y) <= max_points:
+            return x, y
+
+    if method == 'lttb':
+        idx = lttb_indices(x, y, max_points)
+    else:
+        idx = minmax_indices(y, max(1, (max_points - 2) // 2))
+    return x[idx], y[idx]
+
+
+class SeriesCache:
+    """
+    다운샘플 결과 LRU 캐시 (프로세스 공유, 스레드 안전).
+    키는 (데이터셋 토큰, 컬럼, 행 구간, 점 수, 방법)이므로 읽기 전용 데이터에서는 항상 유효
+
+    Args:
+        max_entries: 캐시할 최대 트레이스 수
+    """
+
+    def __init__(self, max_entries=256):
+        self._cache = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"SeriesCache(entries={len(self._cache)}, hits={self.hits}, misses={self.misses})"
+
+    def xy(self, frame, column, x_column='date', max_points=None, method='lttb', token=None):
+        """
+        DataFrame 구간의 (x, y) 다운샘플 결과.
+
+        Args:
+            frame: 구간 DataFrame (인덱스는 전체 데이터 기준 행 번호, 예: Dataset.frame())
+            column: y 컬럼명
+            x_column: x 컬럼명
+            max_points: 최대 점 수 (None이면 target_points())
+            method: 'lttb' 또는 'minmax'
+            token: 데이터셋 구분자 (여러 데이터셋이 같은 캐시를 쓸 때)
+
+        Returns:
+            tuple: (x, y) 배열
+        """
+        span = (frame.index[0], frame.index[-1]) if len(frame) else (None, None)
+        key = (token, column, x_column, span, len(frame), max_points, method)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        result = downsample(frame[x_column].to_numpy(), frame[column].to_numpy(dtype=float),
+                            max_points, method)
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return result
@@ -0,0 +1,221 @@
+"""
+Walk-forward 백테스트 모듈
+회귀 스크립트의 표본 내 R² 대신, 각 시점(origin)까지의 데이터로만 모델을 다시 적합해
+1..N일 뒤 가격을 예측하고 표본 외(out-of-sample) 오차를 집계
+
+- 예측 방식 (direct): horizon h마다 (x_s, y_{s+h}) 쌍으로 학습 -> origin t의 x_t로 y_{t+h} 예측
+  (학습 쌍은 s + h <= t 인 것만 사용 -> origin 시점에 이미 알려진 값만으로 적합)
+- 학습 구간: 확장(window=None, 처음부터) 또는 이동(최근 window개 학습 쌍)
+- 지표: horizon별 MAE, RMSE, 방향 정확도(origin 대비 상승/하락을 맞힌 비율),
+  naive(random walk: y_{t+h} = y_t) 대비 MAE
+- sklearn 호환 추정기(fit/predict, clone 가능)는 모두 사용 가능 (기본: 표준화 + LinearRegression)
+- fold(origin)는 프로세스 풀에 분산하고, 적합된 모델은 (추정기 설정, 학습 데이터 해시, horizon)을 key로
+  output/.analysis_cache에 캐시 -> 데이터가 하루 늘어나도 이전 fold는 다시 적합하지 않음
+
+horizon과 window는 기본적으로 행 단위. 결측 행을 제거해 날짜가 비는 데이터는 freq='D'로 달력에 재색인하면
+빠진 날짜가 결측 행이 되어(해당 origin/학습 쌍/평가 대상은 제외) horizon이 실제 일수가 됨
+
+사용 예:
+  result = walk_forward(df, ['M2SL', 'Yield_10Y', 'USD_Index'], 'BTC_Price', horizons=5)
+  result['metrics']       # horizon별 MAE, RMSE, 방향 정확도
+  result['predictions']   # origin별 예측값
+  print_forecast_metrics(result['metrics'])
+"""
+
+import hashlib
+import math
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from response_cache import ANALYSIS_CACHE_DIR, ResponseCache, process_pool
+
+PREDICTION_COLUMNS = ['origin', 'target_date', 'horizon', 'n_train', 'y_origin', 'y_true', 'y_pred']
+METRIC_COLUMNS = ['horizon', 'n_forecasts', 'mae', 'rmse', 'directional_accuracy',
+                  'naive_mae', 'mae_vs_naive']
+
+
+def default_estimator():
+    """회귀 스크립트와 같은 모델 (표준화 + LinearRegression)"""
+    return make_pipeline(StandardScaler(), LinearRegression())
+
+
+def _estimator_key(estimator):
+    """추정기 캐시 key (클래스 경로 + 파라미터)"""
+    return {'class': f"{type(estimator).__module__}.{type(estimator).__name__}",
+            'params': estimator.get_params(deep=True)}
+
+
+def _fit_fold(origin, x, y, estimator, horizons, window, min_train, store):
+    """
+    origin 하나의 모든 horizon 적합/예측.
+
+    Returns:
+        list: (origin, horizon, 학습 쌍 수, 예측값) 튜플
+    """
+    rows = []
+    for h in horizons:
+        if origin + h >= len(y):
+            continue
+        # 학습 쌍 (x_s, y_{s+h}), s + h <= origin, 이동 구간이면 최근 window개
+        end = origin - h + 1
+        start = 0 if window is None else max(0, end - window)
+        x_train = x[start:end]
+        y_train = y[start + h:end + h]
+        valid = np.isfinite(x_train).all(axis=1) & np.isfinite(y_train)
+        x_train, y_train = x_train[valid], y_train[valid]
+        if len(y_train) < min_train:
+            continue
+
+        model = None
+        if store is not None:
+            digest = hashlib.sha256(x_train.tobytes() + y_train.tobytes()).hexdigest()
+            params = {'estimator': _estimator_key(estimator), 'train': digest, 'shape': x_train.shape}
+            model = store.get('walk_forward_state', params)
+        if model is None:
+            model = clone(estimator).fit(x_train, y_train)
+            if store is not None:
+                store.put('walk_forward_state', params, model)
+        rows.append((origin, h, len(y_train), float(model.predict(x[origin:origin + 1])[0])))
+    return rows
+
+
+def _fit_folds(origins, cache_root, **kwargs):
+    """프로세스 풀 작업 단위: origin 묶음 (적합 모델 캐시는 output/.analysis_cache 공유)"""
+    store = ResponseCache(cache_root) if cache_root else None
+    return [row for origin in origins for row in _fit_fold(origin, store=store, **kwargs)]
+
+
+def forecast_metrics(predictions):
+    """
+    horizon별 표본 외 오차 집계.
+
+    Args:
+        predictions: walk_forward의 predictions (y_origin, y_true, y_pred, horizon)
+
+    Returns:
+        pd.DataFrame: horizon, n_forecasts, mae, rmse, directional_accuracy, naive_mae,
+                      mae_vs_naive (< 1이면 random walk보다 나음)
+    """
+    error = predictions['y_pred'] - predictions['y_true']
+    naive_error = predictions['y_origin'] - predictions['y_true']
+    # 실제 변화가 0인 경우는 방향 판단에서 제외
+    actual = np.sign(predictions['y_true'] - predictions['y_origin'])
+    predicted = np.sign(predictions['y_pred'] - predictions['y_origin'])
+    frame = pd.DataFrame({
+        'horizon': predictions['horizon'],
+        'abs_error': error.abs(),
+        'sq_error': error ** 2,
+        'hit': (actual == predicted).where(actual != 0),
+        'naive_abs_error': naive_error.abs(),
+    })
+    grouped = frame.groupby('horizon')
+    metrics = pd.DataFrame({
+        'n_forecasts': grouped.size(),
+        'mae': grouped['abs_error'].mean(),
+        'rmse': np.sqrt(grouped['sq_error'].mean()),
+        'directional_accuracy': grouped['hit'].mean(),
+        'naive_mae': grouped['naive_abs_error'].mean(),
+    }).reset_index()
+    metrics['mae_vs_naive'] = metrics['mae'] / metrics['naive_mae']
+    return metrics[METRIC_COLUMNS]
+
+
+def print_forecast_metrics(metrics, unit='일'):
+    """
+    horizon별 표본 외 오차 출력 (08/09 회귀 스크립트 공통).
+
+    Args:
+        metrics: forecast_metrics / walk_forward의 metrics
+        unit: horizon 단위 표시 (freq='D'면 '일', 행 단위면 '관측')
+    """
+    if metrics.empty:
+        print("\n⚠️  데이터가 부족하여 walk-forward 백테스트를 수행할 수 없습니다.")
+        return
+
+    print("\n📈 표본 외 예측 오차 (naive = 오늘 가격을 그대로 예측):")
+    for _, row in metrics.iterrows():
+        verdict = "✅ naive보다 나음" if row['mae_vs_naive'] < 1 else "⚠️  naive보다 못함"
+        print(f"   {int(row['horizon'])}{unit} 뒤: MAE ${row['mae']:,.0f}, RMSE ${row['rmse']:,.0f}, "
+              f"방향 정확도 {row['directional_accuracy']*100:.1f}% "
+              f"(예측 {int(row['n_forecasts'])}회, naive MAE ${row['naive_mae']:,.0f}) {verdict}")
+
+
+def walk_forward(df, features, target, estimator=None, horizons=1, window=None, min_train=20,
+                 step=1, workers=None, cache=True, date_col='date', freq=None):
+    """
+    확장/이동 구간 walk-forward 백테스트.
+
+    Args:
+        df: 시계열 DataFrame (행 순서 = 시간 순서)
+        features: 독립변수 목록 (스크립트의 feature 목록 그대로)
+        target: 예측 대상 컬럼명 (예: 'BTC_Price')
+        estimator: sklearn 호환 추정기 (None이면 표준화 + LinearRegression)
+        horizons: 예측 시차 목록 (int면 1..horizons)
+        window: 학습 구간 길이 (학습 쌍 수, None이면 확장 구간)
+        min_train: fold를 적합할 최소 학습 쌍 수
+        step: origin 간격 (행)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        cache: True면 적합된 모델을 output/.analysis_cache에 캐시 (ResponseCache 객체도 가능)
+        date_col: 결과에 origin/target 날짜로 표시할 컬럼 (없으면 행 index)
+        freq: 주어지면 date_col 기준으로 이 간격(예: 'D')의 달력에 재색인해
+              horizon/window/step을 달력 단위로 해석 (빠진 날짜는 결측 행으로 건너뜀)
+
+    Returns:
+        dict: predictions (origin, target_date, horizon, n_train, y_origin, y_true, y_pred),
+              metrics (forecast_metrics 결과)
+    """
+    estimator = default_estimator() if estimator is None else estimator
+    horizons = list(range(1, horizons + 1)) if isinstance(horizons, int) else sorted(horizons)
+    features = list(features)
+    if freq is not None:
+        dates = pd.to_datetime(df[date_col])
+        calendar = pd.date_range(dates.min(), dates.max(), freq=freq, name=date_col)
+        df = (df[features + [target]].set_index(dates.rename(date_col))
+              .reindex(calendar).reset_index())
+    x = df[features].to_numpy(dtype=float)
+    y = df[target].to_numpy(dtype=float)
+    labels = df[date_col].to_numpy() if date_col in df.columns else df.index.to_numpy()
+    n = len(y)
+
+    # 예측에 쓸 x_origin, 방향 판단용 y_origin이 있어야 하고 최소 한 horizon은 평가 가능해야 함
+    first = min_train + min(horizons) - 1 if horizons else n
+    origins = [t for t in range(first, n - min(horizons, default=n), step)
+               if np.isfinite(x[t]).all() and np.isfinite(y[t])]
+
+    cache_root = None
+    if cache:
+        cache_root = cache.root if isinstance(cache, ResponseCache) else ANALYSIS_CACHE_DIR
+    fit = partial(_fit_folds, x=x, y=y, estimator=estimator, horizons=horizons,
+                  window=window, min_train=min_train, cache_root=cache_root)
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(origins)))
+    size = max(1, math.ceil(len(origins) / workers))
+    chunks = [origins[i:i + size] for i in range(0, len(origins), size)]
+    if workers <= 1:
+        rows = [row for chunk in chunks for row in fit(chunk)]
+    else:
+        with process_pool(workers) as pool:
+            rows = [row for part in pool.map(fit, chunks) for row in part]
+
+    # 평가 대상 값이 결측인 예측은 제외
+    rows = [row for row in rows if np.isfinite(y[row[0] + row[1]])]
+    origin_idx = np.array([row[0] for row in rows], dtype=int)
+    horizon = np.array([row[1] for row in rows], dtype=int)
+    predictions = pd.DataFrame({
+        'origin': labels[origin_idx],
+        'target_date': labels[origin_idx + horizon],
+        'horizon': horizon,
+        'n_train': np.array([row[2] for row in rows], dtype=int),
+        'y_origin': y[origin_idx],
+        'y_true': y[origin_idx + horizon],
+        'y_pred': np.array([row[3] for row in rows], dtype=float),
+    })[PREDICTION_COLUMNS]
+    predictions = predictions.sort_values(['horizon', 'origin'], ignore_index=True)
+    return {'predictions': predictions, 'metrics': forecast_metrics(predictions)}